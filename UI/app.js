@@ -39,7 +39,13 @@ const state = {
   active: false,
   recording: false,
   sessionId: null,
+  turnSeq: 0,
   stage: null,
+  channel: null,
+  audio: new Map(),
+  playing: null,
+  streaming: null,
+  browserPartials: false,
   selectedScenario: null,
   selectedApi: null,
   settings: {
@@ -122,10 +128,11 @@ const saveSettings = () => {
 };
 
 const applyConfigDefaults = async () => {
-  if (localStorage.getItem("uiRecordSeconds")) return;
   try {
     const response = await fetch("/api/config");
     const payload = await response.json();
+    state.browserPartials = Boolean(payload.browser_partials);
+    if (localStorage.getItem("uiRecordSeconds")) return;
     const recordDefault = Number(payload.record_seconds_default);
     if (recordDefault) {
       state.settings.recordSeconds = recordDefault;
@@ -155,20 +162,33 @@ const startSession = async () => {
       return;
     }
     state.sessionId = payload.session_id;
+    state.turnSeq = 0;
     state.stage = payload.stage;
     updateStageView();
+    prefetchAudio(payload.prefetch_audio);
     setStatus("Active");
     addBubble(`Coach: ${payload.stage.prompt}`, "coach");
+    openChannel(payload.session_id);
   } catch (error) {
     addBubble("Failed to start session.", "agent");
     setStatus("Idle");
   }
 };
 
+const closeChannel = () => {
+  if (state.channel) {
+    state.channel.onclose = null;
+    state.channel.close();
+  }
+  state.channel = null;
+};
+
 const resetSession = () => {
+  closeChannel();
   chatBody.innerHTML = "";
   state.active = false;
   state.sessionId = null;
+  state.turnSeq = 0;
   state.stage = null;
   updateStageView();
   setStatus("Idle");
@@ -181,13 +201,169 @@ const resetSession = () => {
   voiceBtn.textContent = "Record 5s";
 };
 
-const speakText = (text) => {
-  if (!state.settings.ttsEnabled || !window.speechSynthesis) return;
+const switchToChatMode = (reason) => {
+  if (state.mode === "chat") return;
+  state.mode = "chat";
+  updateModeView();
+  addBubble(reason, "coach");
+};
+
+const busyMessage = (payload) => {
+  const wait = payload.retry_after ? ` Try again in ${payload.retry_after}s.` : "";
+  return `${payload.error || "The server is busy."}${wait}`;
+};
+
+// 서버에 미리 합성된 대사 오디오(/api/tts/<hash>)를 받아 둡니다.
+const prefetchAudio = (hashes) => {
+  if (!state.settings.ttsEnabled || !hashes) return;
+  hashes.forEach((hash) => {
+    if (state.audio.has(hash)) return;
+    const audio = new Audio(`/api/tts/${hash}`);
+    audio.preload = "auto";
+    state.audio.set(hash, audio);
+  });
+};
+
+const playAudio = (hashes) => {
+  if (state.playing) state.playing.pause();
+  const queue = [...hashes];
+  const next = () => {
+    const hash = queue.shift();
+    if (!hash) {
+      state.playing = null;
+      return;
+    }
+    prefetchAudio([hash]);
+    const audio = state.audio.get(hash);
+    audio.currentTime = 0;
+    audio.onended = next;
+    state.playing = audio;
+    audio.play().catch(next);
+  };
+  next();
+};
+
+const speakText = (text, hashes) => {
+  if (!state.settings.ttsEnabled) return;
+  if (hashes && hashes.length) {
+    playAudio(hashes);
+    return;
+  }
+  if (!window.speechSynthesis) return;
   const utterance = new SpeechSynthesisUtterance(text);
   utterance.lang = "en-US";
   window.speechSynthesis.speak(utterance);
 };
 
+const renderEvaluation = (payload) => {
+  // 사이드바 업데이트
+  if (payload.score) scoreValue.textContent = payload.score;
+  if (payload.final_rank) scoreNote.textContent = `Final rank: ${payload.final_rank}`;
+
+  // 2. AI 평가 결과 (coach 말풍선)
+  if (payload.evaluation_provisional) {
+    const why = {
+      shed: "is busy",
+      deadline: "did not answer in time",
+    }[payload.fallback_reason] || "is unavailable";
+    addBubble(`The AI evaluator ${why}, so this is a provisional local score.`, "coach");
+  }
+  if (payload.evaluation) {
+    addBubble(payload.evaluation, "coach");
+  } else {
+    addBubble(`The conversation has ended. Your final score is ${payload.score || "--"}.`, "coach");
+  }
+};
+
+const renderTurn = (payload) => {
+  // NPC_LLM 모드에서 토큰으로 먼저 보여준 말풍선은 최종 대사로 바꿈
+  const streamed = state.streaming;
+  state.streaming = null;
+  if (payload.error) {
+    addBubble(payload.overloaded ? busyMessage(payload) : payload.error, "agent");
+    return;
+  }
+  if (payload.sarah && !payload.completed) {
+    if (streamed) {
+      streamed.textContent = payload.sarah;
+    } else {
+      addBubble(payload.sarah, "agent");
+    }
+    speakText(payload.sarah, payload.sarah_audio);
+  }
+  if (payload.system && !payload.completed) addBubble(payload.system, "coach");
+  if (payload.coach_prompt && !payload.completed) addBubble(payload.coach_prompt, "coach");
+
+  prefetchAudio(payload.prefetch_audio);
+  if (payload.stage) {
+    state.stage = payload.stage;
+    updateStageView();
+    if (!payload.completed && !payload.coach_prompt) {
+      addBubble(`Coach: ${payload.stage.prompt}`, "coach");
+    }
+  }
+  if (payload.completed) {
+    setStatus("Complete");
+    chatInput.disabled = true;
+    sendBtn.disabled = true;
+    voiceBtn.disabled = true;
+    voiceBtn.textContent = "Session Ended";
+
+    if (payload.score) scoreValue.textContent = payload.score;
+    if (payload.final_rank) scoreNote.textContent = `Final rank: ${payload.final_rank}`;
+
+    // 1. 사라의 마지막 대사 (coach 말풍선)
+    if (streamed) streamed.remove();
+    if (payload.sarah) {
+      addBubble(payload.sarah, "coach");
+      speakText(payload.sarah, payload.sarah_audio);
+    }
+    if (payload.evaluation_pending) {
+      scoreNote.textContent = "Evaluating...";
+    } else {
+      renderEvaluation(payload);
+    }
+  }
+};
+
+const handleChannelMessage = (event) => {
+  let payload;
+  try {
+    payload = JSON.parse(event.data);
+  } catch (error) {
+    return;
+  }
+  if (payload.type === "token") {
+    if (!state.streaming) state.streaming = addBubble("", "agent");
+    state.streaming.textContent += payload.text;
+    chatBody.scrollTop = chatBody.scrollHeight;
+  } else if (payload.type === "turn" || payload.type === "timeout" || payload.type === "error") {
+    renderTurn(payload);
+  } else if (payload.type === "evaluation") {
+    renderEvaluation(payload);
+  } else if (payload.type === "prefetch") {
+    prefetchAudio(payload.audio);
+  }
+};
+
+// 세션마다 WebSocket 하나로 턴을 주고받고 서버 푸시(시간 초과, 평가 결과)를 받습니다.
+// 연결할 수 없으면 기존 REST 엔드포인트를 그대로 사용합니다.
+const openChannel = (sessionId) => {
+  closeChannel();
+  if (!window.WebSocket) return;
+  const scheme = window.location.protocol === "https:" ? "wss" : "ws";
+  const channel = new WebSocket(
+    `${scheme}://${window.location.host}/api/ws?session_id=${encodeURIComponent(sessionId)}`
+  );
+  channel.onmessage = handleChannelMessage;
+  channel.onclose = () => {
+    if (state.channel === channel) state.channel = null;
+  };
+  state.channel = channel;
+};
+
+const channelReady = () => state.channel && state.channel.readyState === WebSocket.OPEN;
+
 const handleSend = async (text) => {
   if (!text || !state.sessionId) return;
   if (!state.active) {
@@ -196,61 +372,28 @@ const handleSend = async (text) => {
   }
   addBubble(text, "user");
   chatInput.value = "";
-  try {
-    const response = await fetch("/api/message", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({
-        session_id: state.sessionId,
-        text,
-      }),
-    });
-    const payload = await response.json();
-    if (payload.error) {
-      addBubble(payload.error, "agent");
+  // 턴마다 번호를 붙여, 재전송된 요청은 서버가 다시 계산하지 않고 저장한 응답을 돌려줌
+  state.turnSeq += 1;
+  const turnSeq = state.turnSeq;
+  if (channelReady()) {
+    state.channel.send(JSON.stringify({ type: "turn", text, turn_seq: turnSeq }));
+    return;
+  }
+  const body = JSON.stringify({ session_id: state.sessionId, text, turn_seq: turnSeq });
+  for (let attempt = 0; attempt < 2; attempt++) {
+    try {
+      const response = await fetch("/api/message", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body,
+      });
+      renderTurn(await response.json());
       return;
+    } catch (error) {
+      // 네트워크 오류면 같은 번호로 한 번 더 보냄
     }
-    if (payload.sarah && !payload.completed) {
-      addBubble(payload.sarah, "agent");
-      speakText(payload.sarah);
-    }
-    if (payload.system && !payload.completed) addBubble(payload.system, "coach");
-    if (payload.coach_prompt && !payload.completed) addBubble(payload.coach_prompt, "coach");
-
-    if (payload.stage) {
-      state.stage = payload.stage;
-      updateStageView();
-      if (!payload.completed && !payload.coach_prompt) {
-        addBubble(`Coach: ${payload.stage.prompt}`, "coach");
-      }
-    }
-    if (payload.completed) {
-      setStatus("Complete");
-      chatInput.disabled = true;
-      sendBtn.disabled = true;
-      voiceBtn.disabled = true;
-      voiceBtn.textContent = "Session Ended";
-
-      // 사이드바 업데이트
-      if (payload.score) scoreValue.textContent = payload.score;
-      if (payload.final_rank) scoreNote.textContent = `Final rank: ${payload.final_rank}`;
-
-      // 1. 사라의 마지막 대사 (coach 말풍선)
-      if (payload.sarah) {
-        addBubble(payload.sarah, "coach");
-        speakText(payload.sarah);
-      }
-
-      // 2. AI 평가 결과 (coach 말풍선)
-      if (payload.evaluation) {
-        addBubble(payload.evaluation, "coach");
-      } else {
-        addBubble(`The conversation has ended. Your final score is ${payload.score || "--"}.`, "coach");
-      }
-    }
-  } catch (error) {
-    addBubble("Failed to reach server.", "agent");
   }
+  addBubble("Failed to reach server.", "agent");
 };
 
 const mergeBuffers = (buffers, length) => {
@@ -315,15 +458,6 @@ const encodeWav = (samples, sampleRate) => {
   return buffer;
 };
 
-const arrayBufferToBase64 = (buffer) => {
-  const bytes = new Uint8Array(buffer);
-  let binary = "";
-  for (let i = 0; i < bytes.byteLength; i++) {
-    binary += String.fromCharCode(bytes[i]);
-  }
-  return btoa(binary);
-};
-
 const recordAudio = async (durationMs = 5000, targetRate = 16000) => {
   const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
   const audioContext = new (window.AudioContext || window.webkitAudioContext)();
@@ -348,20 +482,34 @@ const recordAudio = async (durationMs = 5000, targetRate = 16000) => {
   return encodeWav(downsampled, targetRate);
 };
 
-const requestServerStt = async (wavBuffer) => {
-  const audioBase64 = arrayBufferToBase64(wavBuffer);
-  const response = await fetch("/api/voice", {
+// 녹음한 WAV를 그대로 보내 음성 인식과 턴 진행을 한 번의 요청으로 처리
+const sendVoiceTurn = async (wavBuffer) => {
+  if (!state.sessionId) return;
+  state.turnSeq += 1;
+  const params = new URLSearchParams({
+    session_id: state.sessionId,
+    turn_seq: String(state.turnSeq),
+    sample_rate: "16000",
+    language_code: "en-US",
+  });
+  const response = await fetch(`/api/voice_turn?${params}`, {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({
-      audio_base64: audioBase64,
-      sample_rate: 16000,
-      language_code: "en-US",
-    }),
+    headers: { "Content-Type": "audio/wav" },
+    body: wavBuffer,
   });
   const payload = await response.json();
-  if (payload.error) throw new Error(payload.error);
-  return payload.transcript || "";
+  if (payload.degraded === "chat") {
+    switchToChatMode(`${busyMessage(payload)} Switched to chat input for now.`);
+    return;
+  }
+  if (payload.error && !payload.transcript) throw new Error(payload.error);
+  if (!payload.transcript && !payload.completed) return;
+  if (!state.active) {
+    setStatus("Active");
+    state.active = true;
+  }
+  if (payload.transcript) addBubble(payload.transcript, "user");
+  renderTurn(payload);
 };
 
 sendBtn.addEventListener("click", () => {
@@ -411,19 +559,49 @@ window.addEventListener("click", (e) => {
 
 resetBtn.addEventListener("click", resetSession);
 
+// 녹음하는 동안 브라우저 음성 인식의 중간 결과를 보내 서버가 사라의 대답을 미리 준비하게 함
+const startPartials = () => {
+  const Recognition = window.SpeechRecognition || window.webkitSpeechRecognition;
+  if (!state.browserPartials || !Recognition || !channelReady()) return () => {};
+  const recognition = new Recognition();
+  recognition.lang = "en-US";
+  recognition.interimResults = true;
+  recognition.continuous = true;
+  recognition.onresult = (event) => {
+    const text = Array.from(event.results)
+      .map((result) => result[0].transcript)
+      .join(" ")
+      .trim();
+    if (text && channelReady()) state.channel.send(JSON.stringify({ type: "partial", text }));
+  };
+  recognition.onerror = () => {};
+  try {
+    recognition.start();
+  } catch (error) {
+    return () => {};
+  }
+  return () => {
+    try {
+      recognition.stop();
+    } catch (error) { }
+  };
+};
+
 voiceBtn.addEventListener("click", () => {
   if (state.recording) return;
   if (!navigator.mediaDevices?.getUserMedia) return;
   const recordSeconds = Math.max(2, state.settings.recordSeconds);
   state.recording = true;
   voiceBtn.textContent = "Recording...";
+  const stopPartials = startPartials();
   recordAudio(recordSeconds * 1000, 16000)
-    .then((wav) => requestServerStt(wav))
-    .then((t) => {
-      if (!t) return;
-      handleSend(t);
+    .then((wav) => {
+      stopPartials();
+      return sendVoiceTurn(wav);
     })
+    .catch(() => addBubble("Voice input failed. Please try again or type instead.", "agent"))
     .finally(() => {
+      stopPartials();
       state.recording = false;
       voiceBtn.textContent = "Record 5s";
     });
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 from dataclasses import dataclass
 from typing import Callable
 
@@ -14,9 +13,11 @@ class Action:
 
 
 def _run_social_standup() -> int:
-    from curator_agent.main import main as curator_main
+    import asyncio
     import sys
 
+    from curator_agent.main import main as curator_main
+
     original_args = sys.argv[:]
     sys.argv = [original_args[0], "standup"]
     try:
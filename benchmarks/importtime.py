@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+ENTRY_POINTS = ("ui_server", "main", "curator_agent.main", "evaluator_agent.main")
+# 시작 시 import되면 안 되는 무거운 SDK (첫 사용 시 또는 prewarm 스레드에서 import)
+HEAVY_MODULES = ("google.adk", "google.genai", "litellm", "whisper", "torch", "pyttsx3")
+BUDGET_MS = {
+    "ui_server": 300.0,
+    "main": 50.0,
+    "curator_agent.main": 150.0,
+    "evaluator_agent.main": 150.0,
+    "ttfb": 600.0,
+}
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.partition(":")[2].split("|", 2)
+        # 이름 앞의 공백이 import 깊이를 나타냄 (구분자 뒤 한 칸은 제외)
+        rows.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _direct_imports(rows: list[tuple[str, int, int]], module: str) -> list[tuple[str, int, int]]:
+    """Rows imported directly by the entry module, slowest first (rows are in post-order)."""
+    end = max(index for index, row in enumerate(rows) if row[0] == module)
+    direct = []
+    for name, self_us, cumulative_us in reversed(rows[:end]):
+        if not name.startswith(" "):
+            break
+        if not name.startswith("   "):
+            direct.append((name, self_us, cumulative_us))
+    return sorted(direct, key=lambda row: row[2], reverse=True)
+
+
+def measure_import(module: str, repeat: int) -> dict:
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "UI_PREWARM": "false"},
+        )
+        if result.returncode != 0:
+            return {"module": module, "error": result.stderr.strip().splitlines()[-1]}
+        rows = _parse_importtime(result.stderr)
+        total = sum(self_us for _, self_us, _ in rows)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+    names = {name.strip() for name, _, _ in rows}
+    direct = _direct_imports(rows, module)
+    return {
+        "module": module,
+        "total_ms": round(total / 1000, 1),
+        "modules": len(rows),
+        "heavy": [
+            heavy
+            for heavy in HEAVY_MODULES
+            if any(name == heavy or name.startswith(heavy + ".") for name in names)
+        ],
+        "top": [
+            {"module": name.strip(), "cumulative_ms": round(cumulative / 1000, 1)}
+            for name, _, cumulative in direct[:8]
+        ],
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_ttfb(repeat: int, timeout: float = 30.0) -> dict:
+    """Process start until the first /api/config response, like a container restart."""
+    samples = []
+    for _ in range(repeat):
+        port = _free_port()
+        env = {**os.environ, "UI_PORT": str(port), "UI_PREWARM": "false"}
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "ui_server.py"],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            while time.perf_counter() - started < timeout:
+                try:
+                    url = f"http://127.0.0.1:{port}/api/config"
+                    with urllib.request.urlopen(url, timeout=1) as response:
+                        response.read()
+                    break
+                except OSError:
+                    time.sleep(0.005)
+            samples.append((time.perf_counter() - started) * 1000)
+        finally:
+            process.terminate()
+            process.wait()
+    samples.sort()
+    return {"min_ms": round(samples[0], 1), "median_ms": round(samples[len(samples) // 2], 1)}
+
+
+def render(imports: list[dict], ttfb: dict) -> str:
+    lines = [
+        "# Startup import-time report",
+        "",
+        f"Generated by `python -m benchmarks.importtime` on Python {platform.python_version()} "
+        f"({platform.system()} {platform.machine()}). Best of several `-X importtime` runs.",
+        "",
+        "| entry point | import ms | budget ms | modules | heavy SDKs imported |",
+        "| --- | ---: | ---: | ---: | --- |",
+    ]
+    for item in imports:
+        if "error" in item:
+            lines.append(f"| `{item['module']}` | error | | | {item['error']} |")
+            continue
+        heavy = ", ".join(item["heavy"]) or "none"
+        lines.append(
+            f"| `{item['module']}` | {item['total_ms']} | {BUDGET_MS.get(item['module'], '-')} "
+            f"| {item['modules']} | {heavy} |"
+        )
+    lines += [
+        "",
+        f"Time to first byte (`python ui_server.py` to first `/api/config` response): "
+        f"median {ttfb['median_ms']} ms, min {ttfb['min_ms']} ms (budget {BUDGET_MS['ttfb']} ms).",
+        "",
+        "## Slowest direct imports",
+    ]
+    for item in imports:
+        if "error" in item:
+            continue
+        lines += ["", f"`{item['module']}`", ""]
+        lines += [f"- {row['module']}: {row['cumulative_ms']} ms" for row in item["top"]]
+    return "\n".join(lines) + "\n"
+
+
+def over_budget(imports: list[dict], ttfb: dict) -> list[str]:
+    problems = []
+    for item in imports:
+        if "error" in item:
+            problems.append(f"{item['module']}: {item['error']}")
+            continue
+        budget = BUDGET_MS.get(item["module"])
+        if budget is not None and item["total_ms"] > budget:
+            problems.append(f"{item['module']}: {item['total_ms']} ms > {budget} ms")
+        if item["heavy"]:
+            problems.append(f"{item['module']}: imports {', '.join(item['heavy'])} at startup")
+    if ttfb["median_ms"] > BUDGET_MS["ttfb"]:
+        problems.append(f"ttfb: {ttfb['median_ms']} ms > {BUDGET_MS['ttfb']} ms")
+    return problems
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure entry-point import time and TTFB.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write the markdown report to this path.")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON instead of markdown.")
+    parser.add_argument("--check", action="store_true", help="Exit 1 when over budget.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    imports = [measure_import(module, args.repeat) for module in ENTRY_POINTS]
+    ttfb = measure_ttfb(args.repeat)
+    if args.json:
+        print(json.dumps({"imports": imports, "ttfb": ttfb}, indent=2))
+    else:
+        report = render(imports, ttfb)
+        if args.output:
+            Path(args.output).write_text(report, encoding="utf-8")
+        print(report)
+    problems = over_budget(imports, ttfb)
+    for problem in problems:
+        print(f"over budget: {problem}", file=sys.stderr)
+    return 1 if args.check and problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import platform
+import random
+import threading
+import time
+import wave
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+
+from curator_agent.scenarios import get_scenario
+
+
+FILLERS = (
+    "{keyword}",
+    "Honestly, {keyword}.",
+    "I was thinking about {keyword} on the way here.",
+    "So, {keyword}?",
+)
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_counts: dict[str, int] = field(default_factory=dict)
+
+    def record(self, elapsed: float, status: int) -> None:
+        self.latencies.append(elapsed)
+        key = str(status)
+        self.status_counts[key] = self.status_counts.get(key, 0) + 1
+        if status == 0 or status >= 400:
+            self.errors += 1
+
+
+@dataclass
+class LoadConfig:
+    players: int
+    message_turns: int
+    voice_turns: int
+    think_time: float
+    ramp_up: float
+    clip_seconds: float
+    request_timeout: float
+    seed: int
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _build_clip(seconds: float, sample_rate: int = 16000) -> bytes:
+    frames = int(seconds * sample_rate)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\x00\x00" * frames)
+    return buffer.getvalue()
+
+
+def _stage_keywords() -> dict[str, list[str]]:
+    keywords: dict[str, list[str]] = {}
+    for stage in get_scenario().stages:
+        words = [keyword for branch in stage.branches for keyword in branch.keywords]
+        if stage.recovery:
+            words.extend(stage.recovery.recovery.keywords)
+        keywords[stage.key] = words
+    return keywords
+
+
+async def _request(
+    host: str,
+    port: int,
+    method: str,
+    path: str,
+    payload: dict[str, Any] | bytes | None,
+    timeout: float,
+) -> tuple[int, dict[str, Any]]:
+    # bytes는 녹음한 WAV를 그대로 보내는 음성 요청 본문
+    if isinstance(payload, bytes):
+        body, content_type = payload, "audio/wav"
+    else:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        content_type = "application/json"
+    head = (
+        f"{method} {path} HTTP/1.1\r\n"
+        f"Host: {host}:{port}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode("ascii")
+
+    async def exchange() -> tuple[int, dict[str, Any]]:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(head + body)
+            await writer.drain()
+            status_line = await reader.readline()
+            status = int(status_line.split()[1])
+            length = None
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value.strip())
+            raw = await (reader.readexactly(length) if length is not None else reader.read())
+        finally:
+            writer.close()
+        try:
+            return status, json.loads(raw.decode("utf-8")) if raw else {}
+        except json.JSONDecodeError:
+            return status, {}
+
+    return await asyncio.wait_for(exchange(), timeout)
+
+
+class LoadRunner:
+    def __init__(self, host: str, port: int, config: LoadConfig) -> None:
+        self.host = host
+        self.port = port
+        self.config = config
+        self.stats: dict[str, EndpointStats] = {}
+        self.keywords = _stage_keywords()
+        self.clip = _build_clip(config.clip_seconds)
+        self.sessions_started = 0
+        self.sessions_completed = 0
+
+    async def _call(
+        self, rng: random.Random, path: str, payload: dict[str, Any] | bytes
+    ) -> dict[str, Any] | None:
+        stats = self.stats.setdefault(urlsplit(path).path, EndpointStats())
+        started = time.perf_counter()
+        try:
+            status, body = await _request(
+                self.host, self.port, "POST", path, payload, self.config.request_timeout
+            )
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+            stats.record(time.perf_counter() - started, 0)
+            return None
+        stats.record(time.perf_counter() - started, status)
+        return body if status < 400 else None
+
+    async def _think(self, rng: random.Random) -> None:
+        if self.config.think_time > 0:
+            await asyncio.sleep(rng.expovariate(1 / self.config.think_time))
+
+    def _utterance(self, rng: random.Random, stage_key: str | None) -> str:
+        words = self.keywords.get(stage_key or "", []) or [
+            word for group in self.keywords.values() for word in group
+        ]
+        return rng.choice(FILLERS).format(keyword=rng.choice(words))
+
+    async def player(self, index: int) -> None:
+        rng = random.Random(self.config.seed + index)
+        if self.config.ramp_up > 0:
+            await asyncio.sleep(self.config.ramp_up * index / max(1, self.config.players))
+        start = await self._call(
+            rng, "/api/start", {"api_choice": "gemini", "timeout_seconds": 600}
+        )
+        if not start:
+            return
+        self.sessions_started += 1
+        session_id = start["session_id"]
+        stage_key = start.get("stage", {}).get("key")
+        turn_seq = 0
+        completed = False
+        for _ in range(self.config.message_turns):
+            await self._think(rng)
+            turn_seq += 1
+            reply = await self._call(
+                rng,
+                "/api/message",
+                {
+                    "session_id": session_id,
+                    "text": self._utterance(rng, stage_key),
+                    "turn_seq": turn_seq,
+                },
+            )
+            if not reply:
+                continue
+            if reply.get("completed"):
+                self.sessions_completed += 1
+                completed = True
+                break
+            if reply.get("stage"):
+                stage_key = reply["stage"].get("key")
+        for _ in range(self.config.voice_turns):
+            await self._think(rng)
+            turn_seq += 1
+            # UI와 같이 인식과 턴 진행을 /api/voice_turn 한 번으로 처리
+            query = urlencode(
+                {
+                    "session_id": session_id,
+                    "sample_rate": 16000,
+                    "language_code": "en-US",
+                    "turn_seq": turn_seq,
+                }
+            )
+            reply = await self._call(rng, f"/api/voice_turn?{query}", self.clip)
+            if reply and reply.get("completed") and not completed:
+                self.sessions_completed += 1
+                completed = True
+
+    async def run(self) -> dict[str, Any]:
+        started = time.perf_counter()
+        await asyncio.gather(*(self.player(i) for i in range(self.config.players)))
+        elapsed = time.perf_counter() - started
+        return self.report(elapsed)
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        endpoints: dict[str, Any] = {}
+        total = 0
+        errors = 0
+        for path, stats in sorted(self.stats.items()):
+            count = len(stats.latencies)
+            total += count
+            errors += stats.errors
+            endpoints[path] = {
+                "requests": count,
+                "errors": stats.errors,
+                "error_rate": round(stats.errors / count, 4) if count else 0.0,
+                "status_counts": stats.status_counts,
+                "throughput_rps": round(count / elapsed, 3) if elapsed else 0.0,
+                "latency_ms": {
+                    name: round(value * 1000, 3) if value is not None else None
+                    for name, value in (
+                        ("p50", _percentile(stats.latencies, 50)),
+                        ("p95", _percentile(stats.latencies, 95)),
+                        ("p99", _percentile(stats.latencies, 99)),
+                        ("max", max(stats.latencies) if stats.latencies else None),
+                    )
+                },
+            }
+        return {
+            "config": vars(self.config),
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "evaluator_backend": os.getenv("EVALUATOR_BACKEND", "live"),
+                "llm_synth_latency": os.getenv("LLM_SYNTH_LATENCY"),
+                "llm_synth_error_rate": os.getenv("LLM_SYNTH_ERROR_RATE"),
+                "llm_cassette": os.getenv("LLM_CASSETTE"),
+                "stt_backend": os.getenv("STT_BACKEND", "whisper"),
+            },
+            "duration_seconds": round(elapsed, 3),
+            "sessions_started": self.sessions_started,
+            "sessions_completed": self.sessions_completed,
+            "requests": total,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "throughput_rps": round(total / elapsed, 3) if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def _start_local_server(args: argparse.Namespace):
+    os.environ["EVALUATOR_BACKEND"] = args.evaluator
+    os.environ["STT_BACKEND"] = "stub"
+    os.environ["EVALUATOR_STUB_LATENCY_MS"] = str(args.eval_latency_ms)
+    os.environ["STT_STUB_RTF"] = str(args.stt_rtf)
+    if args.evaluator == "synthetic":
+        os.environ["LLM_SYNTH_LATENCY"] = args.llm_latency or f"fixed:{args.eval_latency_ms}"
+        os.environ["LLM_SYNTH_ERROR_RATE"] = str(args.llm_error_rate)
+        os.environ["LLM_SYNTH_SEED"] = str(args.seed)
+
+    import ui_server
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ui_server.UIRequestHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="loadtest-server", daemon=True)
+    thread.start()
+    return server
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Virtual-player load test for ui_server.")
+    parser.add_argument("--url", help="Target server (default: in-process server with stubs).")
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=4, help="/api/message turns per player.")
+    parser.add_argument("--voice-turns", type=int, default=1)
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean seconds between turns.")
+    parser.add_argument("--ramp-up", type=float, default=2.0, help="Seconds to start all players.")
+    parser.add_argument("--clip-seconds", type=float, default=3.0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout.")
+    parser.add_argument("--eval-latency-ms", type=float, default=200.0)
+    parser.add_argument(
+        "--evaluator",
+        choices=("stub", "synthetic", "replay"),
+        default="stub",
+        help="Evaluator for the in-process server (replay reads LLM_CASSETTE).",
+    )
+    parser.add_argument(
+        "--llm-latency",
+        help="Synthetic latency distribution, e.g. lognormal:800:0.8 (default fixed:eval-latency).",
+    )
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--stt-rtf", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON report to this path.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    else:
+        server = _start_local_server(args)
+        host, port = server.server_address[:2]
+
+    config = LoadConfig(
+        players=args.players,
+        message_turns=args.turns,
+        voice_turns=args.voice_turns,
+        think_time=args.think_time,
+        ramp_up=args.ramp_up,
+        clip_seconds=args.clip_seconds,
+        request_timeout=args.timeout,
+        seed=args.seed,
+    )
+    try:
+        report = asyncio.run(LoadRunner(host, port, config).run())
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    print(output)
+    return 1 if report["requests"] == 0 else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import sys
+
+from curator_agent.scenarios import get_scenario
+
+# 키워드가 들어 있지 않은 평범한 문장. 근사 일치가 이런 문장을 점수 있는 분기로 보내면 안 되므로
+# 모든 단계에서 기본 분기, 회복 규칙에서는 불일치가 나와야 함
+ORDINARY_UTTERANCES = (
+    "I just started working at a new company",
+    "Our data stack is a mess",
+    "Can I share something with you",
+    "That is a neat trick",
+    "I made a spreadsheet for it",
+    "I have it right in my pocket",
+    "A million people use it",
+    "We shipped a new version last month",
+    "I received a letter from the organizers",
+    "I listed it online",
+    "It is raining outside",
+    "My name is Alex",
+    "I am not sure what to say",
+    "Nice to meet you",
+    "I work in marketing",
+    "What time is it",
+    "My phone is almost dead",
+    "We raised a seed round",
+    "I am from Seoul",
+    "Can you hear me",
+    "That sounds interesting",
+    "I have a question",
+    "We do logistics software",
+    "My team is small",
+    "I like your shirt",
+    "I will be quick",
+    "The wifi is slow",
+    "Lunch was great",
+    "We are hiring engineers",
+    "The contract is signed",
+    "For instance, our pricing",
+    "I gave it a try",
+    "Sure",
+    "Okay",
+    "Hello",
+)
+
+
+def check(scenario_key: str = "standup") -> list[str]:
+    """Utterances from ORDINARY_UTTERANCES that some stage or recovery rule matched."""
+    failures: list[str] = []
+    for stage in get_scenario(scenario_key).stages:
+        rules = [(stage.key, stage.matcher)]
+        if stage.recovery is not None:
+            rules.append((f"{stage.key} recovery", stage.recovery.matcher))
+        for text in ORDINARY_UTTERANCES:
+            for name, matcher in rules:
+                detail = matcher.search(text)
+                if detail is not None:
+                    failures.append(
+                        f"{name}: {text!r} matched {detail.keyword!r} "
+                        f"({detail.method}, {detail.distance})"
+                    )
+    return failures
+
+
+def main() -> int:
+    failures = check()
+    for failure in failures:
+        print(f"regression: {failure}", file=sys.stderr)
+    print(f"{len(ORDINARY_UTTERANCES)} utterances, {len(failures)} matched", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
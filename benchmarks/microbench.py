@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import argparse
+import atexit
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import uuid
+import wave
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "microbench_baseline.json"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 25
+MIN_SAMPLE_SECONDS = 0.05
+
+# 벤치마크 중 디스크 기록, 백그라운드 요약, 네트워크 호출이 끼어들지 않도록 고정
+BENCH_ENV = {
+    "SESSION_LOG_DIR": "",
+    "ANALYTICS_DB": "",
+    "EVAL_INCREMENTAL": "false",
+    "EVALUATOR_BACKEND": "stub",
+    "NPC_LLM": "false",
+    "UI_PREWARM": "false",
+    "TRACE_MODE": "off",
+}
+
+# 실제 플레이 로그에서 흔한 형태: 정확한 키워드, 음성 인식 오류, 키워드 없는 문장
+MATCH_CORPUS = (
+    "Excuse me, is this seat taken?",
+    "It's a war zone in here, mind if I sit?",
+    "Could you move your bag so I can sit down",
+    "I brought you some candy, want one?",
+    "an expresso for you, you look tired",
+    "I'd like to practise my pitch on the simulater",
+    "Our startup uses LLM latency tricks to coach founders",
+    "Let me show you the Q are code for a demo",
+    "Can I email you later?",
+    "Thanks, see you around",
+    "hmm well I am not sure what to say",
+    "uh",
+    "I'm sorry, my bad, I did not mean to interrupt",
+    "apologys for bothering you",
+)
+TURN_SCRIPT = (
+    "Is this seat taken? Could I sit here?",
+    "I got you a coffee, an espresso",
+    "We built a simulator for pitch practice",
+    "Here is my card, scan the QR for an instant demo",
+)
+EVALUATION_TEXT = (
+    "Tone: warm and respectful. Clarity: clear ask in stage two. Intent: stayed on topic. "
+    "Affinity and trust both improved after the coffee. Next time, ask a question before "
+    "pitching.\n\nScore: 19/25"
+)
+
+
+def _wav_bytes(seconds: float = 5.0, sample_rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\x01\x00" * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+
+def build_benchmarks() -> dict[str, Callable[[], object]]:
+    os.environ.update(BENCH_ENV)
+    sys.path.insert(0, str(ROOT))
+
+    import ui_server
+    from curator_agent.engine import SessionState, build_stage_payload
+    from curator_agent.scenarios import get_scenario
+    from curator_agent.voice_input import _read_wav_bytes, audio_duration_seconds
+    from ui_backend.tracing import NOOP_TRACE
+
+    scenario = get_scenario()
+    stages = scenario.stages
+    recovery = stages[0].recovery
+    handler = ui_server.UIRequestHandler.__new__(ui_server.UIRequestHandler)
+    handler._trace = NOOP_TRACE
+    wav = _wav_bytes()
+    wav_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+    wav_file.write(wav)
+    wav_file.close()
+    atexit.register(os.remove, wav_file.name)
+    turn_response = {
+        "sarah": stages[1].branches[0].response,
+        "coach_prompt": None,
+        "success_message": None,
+        "completed": False,
+        "final_rank": None,
+        "score": "--",
+        "evaluation": None,
+        "degraded": None,
+        "stage": build_stage_payload(stages[2], 2, len(stages)),
+        "sarah_audio": ["a" * 20, "b" * 20],
+        "prefetch_audio": ["c" * 20] * 6,
+    }
+
+    def stage_match() -> None:
+        for stage in stages:
+            for text in MATCH_CORPUS:
+                stage.match(text)
+
+    def recovery_match() -> None:
+        for text in MATCH_CORPUS:
+            recovery.match(text)
+
+    def new_session() -> SessionState:
+        return SessionState(
+            session_id=uuid.uuid4().hex,
+            scenario_key=scenario.key,
+            time_limit_seconds=240,
+            api_choice="gemini",
+        )
+
+    def play_turns() -> None:
+        session = new_session()
+        for text in TURN_SCRIPT:
+            handler._play_turn(session, text, defer_evaluation=True)
+
+    def session_create() -> None:
+        new_session()
+        build_stage_payload(stages[0], 0, len(stages))
+
+    return {
+        "match.stage": stage_match,
+        "match.recovery": recovery_match,
+        "turn.play_session": play_turns,
+        "json.turn_response": lambda: json.dumps(turn_response).encode("utf-8"),
+        "score.extract": lambda: ui_server._extract_score(EVALUATION_TEXT),
+        "wav.duration": lambda: audio_duration_seconds(wav, 16000),
+        "wav.read_file": lambda: _read_wav_bytes(wav_file.name),
+        "session.create": session_create,
+    }
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict:
+    """
+    timeit으로 한 샘플이 MIN_SAMPLE_SECONDS 이상 걸리도록 반복 횟수를 정하고,
+    repeat개의 샘플에서 호출당 시간의 중앙값과 사분위 범위를 구합니다.
+    """
+    timer = timeit.Timer(func)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= MIN_SAMPLE_SECONDS:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(MIN_SAMPLE_SECONDS / elapsed) + 1))
+    samples = sorted(value / loops * 1e6 for value in timer.repeat(repeat, loops))
+    quartiles = statistics.quantiles(samples, n=4)
+    return {
+        "median_us": round(statistics.median(samples), 3),
+        "p25_us": round(quartiles[0], 3),
+        "p75_us": round(quartiles[2], 3),
+        "min_us": round(samples[0], 3),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def run(names: list[str] | None, repeat: int) -> dict:
+    benchmarks = build_benchmarks()
+    selected = names or list(benchmarks)
+    results = {}
+    for name in selected:
+        results[name] = measure(benchmarks[name], repeat)
+        row = results[name]
+        print(
+            f"{name:<22}{row['median_us']:>12.2f} us  "
+            f"(IQR {row['p25_us']:.2f}-{row['p75_us']:.2f}, {row['loops']} loops x {repeat})",
+            file=sys.stderr,
+        )
+    return {
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "generated": time.strftime("%Y-%m-%d"),
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    중앙값과 최솟값이 모두 threshold보다 느려지고 사분위 범위도 겹치지 않을 때만
+    회귀로 봅니다. 최솟값은 다른 프로세스의 간섭을 가장 덜 받는 추정치입니다.
+    """
+    regressions = []
+    lines = [f"{'benchmark':<22}{'baseline us':>14}{'current us':>14}{'change':>10}"]
+    for name, row in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            lines.append(f"{name:<22}{'-':>14}{row['median_us']:>14.2f}{'new':>10}")
+            continue
+        change = row["median_us"] / base["median_us"] - 1
+        flag = ""
+        min_change = row["min_us"] / base["min_us"] - 1
+        if change > threshold and min_change > threshold and row["p25_us"] > base["p75_us"]:
+            flag = "  REGRESSION"
+            regressions.append(
+                f"{name}: {change:+.0%} ({base['median_us']} -> {row['median_us']} us)"
+            )
+        lines.append(
+            f"{name:<22}{base['median_us']:>14.2f}{row['median_us']:>14.2f}{change:>+10.0%}{flag}"
+        )
+    print("\n".join(lines))
+    return regressions
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for per-turn hot paths.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for command in ("run", "compare"):
+        command_parser = sub.add_parser(command)
+        command_parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all).")
+        command_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+        command_parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    sub.choices["run"].add_argument(
+        "--save", action="store_true", help="Write the results as the new baseline."
+    )
+    sub.choices["compare"].add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown of the median before flagging (default 0.25 = 25%%).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    current = run(args.names, args.repeat)
+    baseline_path = Path(args.baseline)
+    if args.command == "run":
+        if args.save:
+            baseline_path.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+            print(f"saved baseline to {baseline_path}", file=sys.stderr)
+        else:
+            print(json.dumps(current, indent=2))
+        return 0
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with `run --save` first", file=sys.stderr)
+        return 2
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = compare(baseline, current, args.threshold)
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
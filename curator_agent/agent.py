@@ -2,7 +2,8 @@ import os
 
 from google.adk.agents import Agent
 from google.adk.models import Gemini
-from dotenv import load_dotenv
+
+from curator_agent.env import load_env
 
 
 SYSTEM_PROMPT = (
@@ -38,8 +39,8 @@ def _env_value(name: str, default: str) -> str:
     return raw.strip()
 
 
-def build_agent() -> Agent:
-    load_dotenv()
+def build_agent(instruction: str = SYSTEM_PROMPT, name: str = "curator_daily_chat") -> Agent:
+    load_env()
     api_key = _require_api_key()
     if not _env_flag("USE_GEMINI", True):
         raise RuntimeError("USE_GEMINI is disabled in .env; no ADK model configured.")
@@ -52,8 +53,8 @@ def build_agent() -> Agent:
         use_vertexai=use_vertex,
     )
     return Agent(
-        name="curator_daily_chat",
+        name=name,
         description="Daily conversation helper.",
         model=model,
-        instruction=SYSTEM_PROMPT,
+        instruction=instruction,
     )
@@ -2,11 +2,13 @@ from google.adk.runners import Runner
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.genai import types
 
-from curator_agent.agent import build_agent
+from curator_agent.agent import SYSTEM_PROMPT, build_agent
 
 
-async def build_runtime() -> tuple[Runner, object]:
-    agent = build_agent()
+async def build_runtime(
+    instruction: str = SYSTEM_PROMPT, name: str = "curator_daily_chat"
+) -> tuple[Runner, object]:
+    agent = build_agent(instruction=instruction, name=name)
     session_service = InMemorySessionService()
     runner = Runner(
         app_name=agent.name,
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable
+
+from curator_agent.fuzzy import KeywordMatch
+from curator_agent.scenarios import Branch, Stage, StandupScenario, get_scenario
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from curator_agent.speculation import Speculation
+    from evaluator_agent.incremental import IncrementalEvaluation
+
+
+DEFAULT_TIME_LIMIT_SECONDS = 240
+RECOVERY_PROMPT = "Sarah looks cold. How do you respond?"
+CONVERSATION_ENDED = "The conversation has ended."
+RECOVERY_SKIPPED = "Understood."
+
+# 턴 기록의 응답 코드: 분기 번호(0부터) 또는 아래 값
+NO_REPLY = 0xFF
+RECOVERY_REPLY = 0xFE
+_OFFSET_BITS = 32
+_REPLY_BITS = 8
+_OFFSET_MASK = (1 << _OFFSET_BITS) - 1
+_REPLY_MASK = (1 << _REPLY_BITS) - 1
+
+
+@dataclass(slots=True)
+class SessionState:
+    """
+    세션 상태. 대화 기록은 문자열 목록 대신 턴마다 (단계 번호, 분기 코드, 텍스트 끝 위치)를
+    정수 하나로 묶어 배열에 쌓고, 플레이어 발화는 하나의 UTF-8 버퍼에 이어 붙입니다.
+    사라의 대사는 시나리오 상수이므로 transcript를 읽을 때만 다시 만듭니다.
+    """
+
+    session_id: str
+    scenario_key: str
+    stage_index: int = 0
+    affinity: int = 0
+    trust: int = 0
+    final_rank: str | None = None
+    completed: bool = False
+    recovery_pending: bool = False
+    last_branch: Branch | None = None
+    start_time: float = field(default_factory=time.monotonic)
+    last_activity: float = field(default_factory=time.monotonic)
+    time_limit_seconds: int = DEFAULT_TIME_LIMIT_SECONDS
+    api_choice: str = "gemini"
+    incremental: IncrementalEvaluation | None = None
+    # 서버가 마감 시각에 미리 마무리한 타임아웃 결과 (응답 payload)
+    outcome: Future[dict[str, Any]] | None = field(default=None, repr=False)
+    # 같은 세션의 턴을 하나씩 적용하기 위한 잠금과, 마지막으로 처리한 턴 번호와 그 응답
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    turn_seq: int = 0
+    last_turn: tuple[int, int, dict[str, Any]] | None = field(default=None, repr=False)
+    # 부분 인식 결과로 미리 준비 중인 이번 턴의 분기와 대사
+    speculation: Speculation | None = field(default=None, repr=False)
+    _turns: array = field(default_factory=lambda: array("Q"), init=False, repr=False)
+    _text: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    _replies: dict[int, str] | None = field(default=None, init=False, repr=False)
+
+    def record_user(self, stage_index: int, text: str) -> None:
+        self._text += text.encode("utf-8")
+        self._turns.append(
+            (stage_index << (_OFFSET_BITS + _REPLY_BITS))
+            | (NO_REPLY << _OFFSET_BITS)
+            | len(self._text)
+        )
+
+    def record_reply(self, reply: int, text: str | None = None) -> None:
+        """
+        Sets Sarah's reply (branch index or RECOVERY_REPLY) for the latest player line.
+        text is only kept when Sarah said something other than the scripted line.
+        """
+        turn = self._turns[-1] & ~(_REPLY_MASK << _OFFSET_BITS)
+        self._turns[-1] = turn | (reply << _OFFSET_BITS)
+        if text is not None:
+            if self._replies is None:
+                self._replies = {}
+            self._replies[len(self._turns) - 1] = text
+
+    @property
+    def turn_count(self) -> int:
+        return len(self._turns)
+
+    @property
+    def transcript(self) -> list[str]:
+        """Human-readable transcript ("You: ..." / "Sarah: ..."), rebuilt on every access."""
+        stages = get_scenario(self.scenario_key).stages
+        lines: list[str] = []
+        start = 0
+        replies = self._replies or {}
+        for index, turn in enumerate(self._turns):
+            end = turn & _OFFSET_MASK
+            reply = (turn >> _OFFSET_BITS) & _REPLY_MASK
+            lines.append(f"You: {self._text[start:end].decode('utf-8')}")
+            start = end
+            if reply == NO_REPLY:
+                continue
+            if index in replies:
+                lines.append(f"Sarah: {replies[index]}")
+                continue
+            stage = stages[turn >> (_OFFSET_BITS + _REPLY_BITS)]
+            if reply == RECOVERY_REPLY:
+                lines.append(f"Sarah: {stage.recovery.recovery.response}")
+            else:
+                lines.append(f"Sarah: {stage.branches[reply].response}")
+        return lines
+
+
+@dataclass
+class TurnResult:
+    sarah: str | None = None
+    coach_prompt: str | None = None
+    success_message: str | None = None
+    stage_key: str | None = None
+    branch_key: str | None = None
+    recovered: bool | None = None
+    match: KeywordMatch | None = None
+
+
+def build_stage_payload(stage: Stage, index: int, total: int) -> dict[str, Any]:
+    return {
+        "key": stage.key,
+        "title": stage.title,
+        "prompt": stage.prompt,
+        "index": index + 1,
+        "total": total,
+    }
+
+
+def next_stage_payload(
+    session: SessionState, scenario: StandupScenario
+) -> dict[str, Any] | None:
+    if session.completed or session.stage_index >= len(scenario.stages):
+        return None
+    return build_stage_payload(
+        scenario.stages[session.stage_index], session.stage_index, len(scenario.stages)
+    )
+
+
+def remaining_seconds(session: SessionState) -> float:
+    return session.time_limit_seconds - (time.monotonic() - session.start_time)
+
+
+def session_timed_out(session: SessionState) -> bool:
+    return remaining_seconds(session) <= 0
+
+
+def current_stage(session: SessionState, scenario: StandupScenario) -> Stage:
+    return scenario.stages[min(session.stage_index, len(scenario.stages) - 1)]
+
+
+def expire_session(session: SessionState, scenario: StandupScenario) -> Stage:
+    """Marks a session as timed out and returns the stage it stopped at."""
+    session.completed = True
+    session.final_rank = session.final_rank or "F"
+    return current_stage(session, scenario)
+
+
+def apply_turn(
+    session: SessionState,
+    scenario: StandupScenario,
+    text: str,
+    reply: Callable[[Stage, Branch, str], str] | None = None,
+) -> TurnResult:
+    """
+    Applies one player utterance to the session and returns Sarah's reply.
+    reply, if given, produces Sarah's line for the matched branch instead of the scripted one.
+    """
+    result = TurnResult()
+    session.record_user(session.stage_index, text)
+    ended_with_stage4_response = False
+
+    if session.recovery_pending and session.stage_index < len(scenario.stages):
+        stage = scenario.stages[session.stage_index]
+        result.stage_key = stage.key
+        result.match = stage.recovery.match_detail(text) if stage.recovery else None
+        recovery = stage.recovery.recovery if result.match else None
+        result.recovered = recovery is not None
+        if recovery:
+            session.affinity += recovery.affinity_delta
+            session.trust += recovery.trust_delta
+            result.sarah = recovery.response
+            session.record_reply(RECOVERY_REPLY)
+            session.recovery_pending = False
+            session.stage_index += 1
+        elif session.last_branch and session.last_branch.ends_conversation:
+            session.completed = True
+            session.final_rank = "F"
+            result.sarah = CONVERSATION_ENDED
+        else:
+            result.sarah = RECOVERY_SKIPPED
+            session.recovery_pending = False
+            session.stage_index += 1
+    elif session.stage_index >= len(scenario.stages):
+        session.completed = True
+    else:
+        stage = scenario.stages[session.stage_index]
+        branch, result.match = stage.match_detail(text)
+        result.stage_key = stage.key
+        result.branch_key = branch.key
+        session.last_branch = branch
+        session.affinity += branch.affinity_delta
+        session.trust += branch.trust_delta
+        result.sarah = reply(stage, branch, text) if reply else branch.response
+        session.record_reply(
+            stage.branches.index(branch),
+            None if result.sarah == branch.response else result.sarah,
+        )
+
+        if stage.recovery and stage.recovery.should_offer(branch):
+            session.recovery_pending = True
+            result.coach_prompt = RECOVERY_PROMPT
+        elif branch.ends_conversation:
+            session.completed = True
+            session.final_rank = "F"
+        else:
+            session.stage_index += 1
+
+        if stage.key == "STAGE_4" and not session.recovery_pending:
+            session.final_rank = branch.final_rank or "B"
+            session.completed = True
+            ended_with_stage4_response = True
+
+    if session.completed and not session.recovery_pending and not ended_with_stage4_response:
+        if scenario.success_message and scenario.success_message != result.sarah:
+            result.success_message = scenario.success_message
+            # 사라의 대사가 비어있을 경우 성공 메시지로 채움
+            if not result.sarah:
+                result.sarah = result.success_message
+            else:
+                result.sarah = f"{result.sarah}\n\n{result.success_message}"
+
+    return result
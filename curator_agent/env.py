@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import threading
+
+
+_LOADED = False
+_LOCK = threading.Lock()
+
+
+def load_env() -> None:
+    """
+    .env 파일을 프로세스당 한 번만 읽습니다.
+    환경 변수를 읽는 모든 진입점과 설정 팩토리가 이 함수를 먼저 호출합니다.
+    """
+    global _LOADED
+    if _LOADED:
+        return
+    with _LOCK:
+        if _LOADED:
+            return
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _LOADED = True
@@ -2,7 +2,8 @@ import os
 
 from google.adk.agents import Agent
 from google.adk.models import Gemini
-from dotenv import load_dotenv
+
+from curator_agent.env import load_env
 
 
 EVALUATOR_PROMPT = (
@@ -39,7 +40,7 @@ def _env_value(name: str, default: str) -> str:
 
 
 def build_evaluator_agent() -> Agent:
-    load_dotenv()
+    load_env()
     api_key = _require_api_key()
     use_vertex = _env_flag("GOOGLE_GENAI_USE_VERTEXAI", False)
     model_name = _env_value("GEMINI_MODEL", DEFAULT_MODEL)
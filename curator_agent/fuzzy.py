@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Sequence
+
+
+# 음성 인식이 알파벳을 단어로 받아 적는 경우 ("QR" -> "Q are")
+LETTER_NAMES = {
+    "a": "a", "ay": "a", "bee": "b", "be": "b", "see": "c", "sea": "c", "cee": "c",
+    "dee": "d", "ee": "e", "ef": "f", "eff": "f", "gee": "g", "aitch": "h", "eye": "i",
+    "jay": "j", "kay": "k", "el": "l", "ell": "l", "em": "m", "en": "n", "oh": "o",
+    "pee": "p", "cue": "q", "queue": "q", "are": "r", "ar": "r", "ess": "s", "tea": "t",
+    "tee": "t", "you": "u", "vee": "v", "ex": "x", "why": "y", "zee": "z", "zed": "z",
+}
+MAX_ERRORS = 2
+# 이 길이 이하 키워드는 한 글자만 바뀌어도 흔한 단어가 됨 ("quiet" -> "quit", "tired" -> "hired")
+SHORT_KEYWORD = 5
+_TOKEN = re.compile(r"[a-z0-9']+")
+# 키워드와 편집 한두 번 차이지만 플레이어가 실제로 자주 말하는 단어. 근사 일치에서는 인식 오류가
+# 아니라 그 단어를 말한 것으로 보고 비교 대상에서 뺌 ("a million users"는 "billion"이 아님)
+COMMON_WORDS = {
+    "bitter", "butter", "cynical", "contract", "express", "feather", "gave", "have",
+    "instance", "leather", "letter", "listed", "million", "raining", "trillion", "version",
+}
+
+
+def error_budget(keyword: str) -> int:
+    """Edits allowed for a keyword: none up to SHORT_KEYWORD chars, one up to 7, two beyond."""
+    length = len(keyword)
+    if length <= SHORT_KEYWORD:
+        return 0
+    if length <= 7:
+        return 1
+    return MAX_ERRORS
+
+
+def without_common_words(text: str) -> str:
+    """Blanks out COMMON_WORDS so the approximate tier cannot read them as keyword typos."""
+    return _TOKEN.sub(lambda token: " " if token.group() in COMMON_WORDS else token.group(), text)
+
+
+def phonetic_key(text: str) -> str:
+    """Spells out letter names and joins runs of single letters ("q are code" -> "qr code")."""
+    words: list[str] = []
+    letters = ""
+    for token in _TOKEN.findall(text.lower()):
+        letter = LETTER_NAMES.get(token, token if len(token) == 1 else None)
+        if letter is not None:
+            letters += letter
+            continue
+        if letters:
+            words.append(letters)
+            letters = ""
+        words.append(token)
+    if letters:
+        words.append(letters)
+    return " ".join(words)
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    group: int
+    keyword: str
+    distance: int
+    method: str
+
+
+class KeywordMatcher:
+    """
+    Matches text against groups of keywords (one group per branch) in three tiers:
+    exact substring, phonetic substring, then bit-parallel approximate matching.
+
+    The approximate tier packs every keyword of every group into one integer and
+    runs the Wu-Manber shift-and recurrence over it, so one pass over the text
+    scores all keywords. Each keyword owns a run of bits; S marks the first bit of
+    each run and is OR-ed in after every shift, which both starts a new match at
+    every text position and absorbs the bit that carries over from the previous
+    keyword's run.
+    """
+
+    def __init__(self, groups: Sequence[Sequence[str]]) -> None:
+        self.groups = [tuple(keyword.lower() for keyword in group) for group in groups]
+        self.phonetic = [tuple(phonetic_key(keyword) for keyword in group) for group in self.groups]
+
+        self._masks: dict[str, int] = {}
+        self._start = 0
+        self._ends: dict[int, tuple[int, str, int]] = {}
+        self._budget_masks: list[int] = []
+        offset = 0
+        for group_index, group in enumerate(self.groups):
+            for keyword in group:
+                budget = error_budget(keyword)
+                if budget == 0:
+                    continue
+                self._start |= 1 << offset
+                for position, char in enumerate(keyword):
+                    self._masks[char] = self._masks.get(char, 0) | (1 << (offset + position))
+                end_bit = 1 << (offset + len(keyword) - 1)
+                self._ends[end_bit] = (group_index, keyword, budget)
+                offset += len(keyword)
+        for errors in range(MAX_ERRORS + 1):
+            allowed = 0
+            for end_bit, (_, _, budget) in self._ends.items():
+                if budget >= errors:
+                    allowed |= end_bit
+            self._budget_masks.append(allowed)
+
+    def exact(self, normalized: str) -> KeywordMatch | None:
+        for group_index, group in enumerate(self.groups):
+            for keyword in group:
+                if keyword in normalized:
+                    return KeywordMatch(group_index, keyword, 0, "exact")
+        return None
+
+    def phonetic_match(self, normalized: str) -> KeywordMatch | None:
+        # 글자 이어 붙이기로 생긴 일치만 의미가 있으므로 단어 경계에서만 비교 ("cu" != "cup")
+        key = f" {phonetic_key(normalized)} "
+        for group_index, group in enumerate(self.phonetic):
+            for index, keyword_key in enumerate(group):
+                if keyword_key and f" {keyword_key} " in key:
+                    return KeywordMatch(group_index, self.groups[group_index][index], 0, "phonetic")
+        return None
+
+    def approximate(self, normalized: str) -> KeywordMatch | None:
+        """Best keyword within its edit budget anywhere in the text (fewest edits first)."""
+        if not self._ends:
+            return None
+        start = self._start
+        masks = self._masks
+        _, within_one, within_two = self._budget_masks
+        # r0..r2: 접두사가 0/1/2번 이하의 편집으로 현재 위치에서 끝나는 키워드 비트
+        r0, r1, r2 = 0, self._initial(1), self._initial(2)
+        best: tuple[int, int, str] | None = None
+        for char in without_common_words(normalized):
+            char_mask = masks.get(char, 0)
+            n0 = ((r0 << 1) | start) & char_mask
+            n1 = (((r1 << 1) | start) & char_mask) | r0 | ((r0 | n0) << 1) | start
+            r2 = (((r2 << 1) | start) & char_mask) | r1 | ((r1 | n1) << 1) | start
+            r0, r1 = n0, n1
+            # r0 ⊆ r1 이므로 예산 안에서 끝난 키워드가 있을 때만 어떤 키워드인지 확인
+            if (r1 & within_one) | (r2 & within_two):
+                best = self._best(best, (r0, r1, r2))
+                if best is not None and best[0] == 0:
+                    break
+        if best is None:
+            return None
+        errors, group_index, keyword = best
+        return KeywordMatch(group_index, keyword, errors, "fuzzy")
+
+    def _best(
+        self, best: tuple[int, int, str] | None, rows: tuple[int, int, int]
+    ) -> tuple[int, int, str] | None:
+        hits = 0
+        for errors, row in enumerate(rows):
+            found = row & self._budget_masks[errors] & ~hits
+            while found:
+                end_bit = found & -found
+                found ^= end_bit
+                hits |= end_bit
+                group_index, keyword, _ = self._ends[end_bit]
+                if best is None or (errors, group_index) < best[:2]:
+                    best = (errors, group_index, keyword)
+        return best
+
+    def _initial(self, errors: int) -> int:
+        # 키워드 앞부분 최대 errors 글자는 삭제로 건너뛸 수 있음
+        initial = 0
+        for end_bit, (_, keyword, _) in self._ends.items():
+            first = end_bit.bit_length() - len(keyword)
+            initial |= ((1 << min(errors, len(keyword))) - 1) << first
+        return initial
+
+    def search(self, text: str) -> KeywordMatch | None:
+        normalized = text.strip().lower()
+        return (
+            self.exact(normalized)
+            or self.phonetic_match(normalized)
+            or self.approximate(normalized)
+        )
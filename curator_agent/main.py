@@ -1,16 +1,23 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
 import os
 import re
 import select
 import sys
+import threading
 import time
 
+from curator_agent.env import load_env
+from curator_agent.npc import NpcReplies, npc_llm_enabled
 from curator_agent.scenarios import get_scenario
+from curator_agent.tts import cancel_speech, flush_speech, speak
 from curator_agent.voice_input import VoiceInputError, capture_and_transcribe
-from evaluator_agent.agent_executor import build_message as build_eval_message
-from evaluator_agent.agent_executor import build_runtime as build_eval_runtime
+from curator_agent.voice_input import prewarm as prewarm_stt
+from evaluator_agent.incremental import IncrementalEvaluation, incremental_enabled
+from evaluator_agent.runner import prewarm as prewarm_evaluator
+from evaluator_agent.runner import run_evaluation
 from evaluator_agent.scenarios import build_eval_prompt
 
 
@@ -22,16 +29,71 @@ def _sanitize_text(value: str) -> str:
     return value.encode("utf-8", "ignore").decode("utf-8")
 
 
+def _read_line_cbreak(timeout_seconds: int) -> str:
+    """
+    터미널을 비정규(cbreak) 모드로 두고 한 줄을 읽습니다. 첫 키를 누르는 순간 사라의 음성을
+    끊기 위한 것으로, 에코와 백스페이스는 직접 처리합니다. 첫 키가 없으면 TimeoutError입니다.
+    """
+    import termios
+
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    mode = termios.tcgetattr(fd)
+    mode[3] &= ~(termios.ICANON | termios.ECHO)
+    mode[6][termios.VMIN] = 1
+    mode[6][termios.VTIME] = 0
+    termios.tcsetattr(fd, termios.TCSANOW, mode)
+    try:
+        ready, _, _ = select.select([fd], [], [], timeout_seconds)
+        if not ready:
+            raise TimeoutError
+        cancel_speech()
+        decoder = codecs.getincrementaldecoder("utf-8")("ignore")
+        chars: list[str] = []
+        while True:
+            data = os.read(fd, 1)
+            if data in (b"", b"\n", b"\r") or (data == b"\x04" and not chars):
+                break
+            if data in (b"\x7f", b"\b"):
+                if chars:
+                    chars.pop()
+                    sys.stdout.write("\b \b")
+                    sys.stdout.flush()
+                continue
+            char = decoder.decode(data)
+            if char and char.isprintable():
+                chars.append(char)
+                sys.stdout.write(char)
+                sys.stdout.flush()
+        sys.stdout.write("\n")
+        return "".join(chars)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+
+def _cbreak_supported() -> bool:
+    try:
+        import termios  # noqa: F401
+    except ImportError:
+        return False
+    return sys.stdin.isatty()
+
+
 def _prompt_input(label: str, timeout_seconds: int) -> str:
     while True:
         if timeout_seconds <= 0:
             raise TimeoutError
         sys.stdout.write(label)
         sys.stdout.flush()
-        ready, _, _ = select.select([sys.stdin], [], [], timeout_seconds)
-        if not ready:
-            raise TimeoutError
-        value = sys.stdin.readline().strip()
+        if _cbreak_supported():
+            value = _read_line_cbreak(timeout_seconds).strip()
+        else:
+            # 파이프 입력이나 termios가 없는 환경은 줄 단위로 읽으므로 Enter에서 음성을 끊음
+            ready, _, _ = select.select([sys.stdin], [], [], timeout_seconds)
+            if not ready:
+                raise TimeoutError
+            cancel_speech()
+            value = sys.stdin.readline().strip()
         if value.lower() in EXIT_TOKENS:
             raise KeyboardInterrupt
         if value:
@@ -59,15 +121,8 @@ def _choose_input_mode() -> str:
 
 
 def _speak(text: str) -> None:
-    if os.getenv("TTS_ENABLED", "").lower() != "true":
-        return
-    try:
-        import pyttsx3
-        engine = pyttsx3.init()
-        engine.say(text)
-        engine.runAndWait()
-    except Exception:
-        pass
+    # 음성은 백그라운드에서 재생되므로 다음 프롬프트가 바로 입력을 받음
+    speak(text)
 
 
 def _handle_timeout(scenario) -> None:
@@ -84,6 +139,7 @@ def _prompt_voice_input(timeout_seconds: int) -> str:
     max_seconds = max(1, timeout_seconds - 1)
     record_seconds = max(1, min(record_seconds, max_seconds))
 
+    cancel_speech()
     if audio_path:
         print(f"Transcribing audio file: {audio_path}")
     else:
@@ -102,27 +158,15 @@ def _prompt_voice_input(timeout_seconds: int) -> str:
     return transcript
 
 
-async def _run_evaluator(transcript: list[str]) -> str:
-    eval_runner, eval_session = await build_eval_runtime()
+async def _run_evaluator(
+    transcript: list[str], incremental: IncrementalEvaluation | None = None
+) -> str:
     safe_transcript = [_sanitize_text(line) for line in transcript]
-    eval_prompt = build_eval_prompt("standup", safe_transcript)
-    events = eval_runner.run_async(
-        user_id=eval_session.user_id,
-        session_id=eval_session.id,
-        new_message=build_eval_message(eval_prompt),
-    )
-    chunks: list[str] = []
-    async for event in events:
-        content = getattr(event, "content", None)
-        if not content or not getattr(content, "parts", None):
-            continue
-        if getattr(event, "author", "") == "user":
-            continue
-        text = "".join(part.text or "" for part in content.parts)
-        if text:
-            chunks.append(text)
-    await eval_runner.close()
-    return "".join(chunks)
+    if incremental is not None:
+        eval_prompt = incremental.final_prompt(safe_transcript)
+    else:
+        eval_prompt = build_eval_prompt("standup", safe_transcript)
+    return await run_evaluation(eval_prompt)
 
 
 def _score_to_rank(score_25: int) -> str | None:
@@ -146,7 +190,32 @@ def _extract_score(text: str) -> tuple[int, int] | None:
     return int(match.group(1)), int(match.group(2))
 
 
+def _npc_line(npc: NpcReplies | None, scenario, stage, branch, user_input: str) -> str:
+    """
+    사라의 대사를 출력합니다. NPC_LLM 모드에서는 토큰이 도착하는 대로 출력하고,
+    첫 토큰이 늦으면 대본 대사를 출력합니다.
+    """
+    if npc is None:
+        print(f"Sarah: {branch.response}")
+        return branch.response
+    print("Sarah: ", end="", flush=True)
+    reply = npc.reply(
+        scenario,
+        stage,
+        branch,
+        user_input,
+        on_token=lambda token: print(token, end="", flush=True),
+    )
+    if reply.source == "script":
+        print(reply.text, end="")
+    print()
+    return reply.text
+
+
 async def main() -> int:
+    load_env()
+    # 플레이하는 동안 평가 SDK를 미리 import해 두면 마지막 평가가 바로 시작됨
+    threading.Thread(target=prewarm_evaluator, name="prewarm", daemon=True).start()
     scenario = get_scenario()
     print(scenario.title)
     print(scenario.background)
@@ -158,6 +227,7 @@ async def main() -> int:
     input_label = "Type: "
     if input_mode == "1":
         print("Voice mode selected.")
+        threading.Thread(target=prewarm_stt, name="prewarm-stt", daemon=True).start()
 
     affinity = 0
     trust = 0
@@ -166,6 +236,8 @@ async def main() -> int:
     timed_out = False
     exited_early = False
     transcript: list[str] = []
+    incremental = IncrementalEvaluation() if incremental_enabled() else None
+    npc = NpcReplies.from_env() if npc_llm_enabled() else None
     time_limit = int(os.getenv("SCENARIO_TIME_LIMIT_SECONDS", DEFAULT_TIME_LIMIT_SECONDS))
     start_time = time.monotonic()
 
@@ -194,9 +266,9 @@ async def main() -> int:
             affinity += branch.affinity_delta
             trust += branch.trust_delta
 
-            print(f"Sarah: {branch.response}")
-            _speak(branch.response)
-            transcript.append(f"Sarah: {branch.response}")
+            sarah_line = _npc_line(npc, scenario, stage, branch, user_input)
+            _speak(sarah_line)
+            transcript.append(f"Sarah: {sarah_line}")
 
             if stage.recovery and stage.recovery.should_offer(branch):
                 print("Sarah looks cold. How do you respond?")
@@ -239,6 +311,9 @@ async def main() -> int:
             if stage.key == "STAGE_4":
                 final_rank = branch.final_rank or "B"
                 completed = True
+            elif incremental is not None:
+                # 플레이어가 다음 단계를 진행하는 동안 지금까지의 대화를 요약해 둠
+                incremental.stage_completed(stage.key, transcript)
     except KeyboardInterrupt:
         exited_early = True
 
@@ -249,7 +324,7 @@ async def main() -> int:
     if exited_early:
         print("Exiting.")
     print("=== Evaluation ===")
-    eval_reply = await _run_evaluator(transcript)
+    eval_reply = await _run_evaluator(transcript, incremental)
     print(eval_reply)
     score_data = _extract_score(eval_reply)
     score_25 = None
@@ -266,6 +341,7 @@ async def main() -> int:
         final_rank = "B" if completed else "F"
     print(f"Final rank: {final_rank}")
     print("Conversation ended.")
+    flush_speech(float(os.getenv("TTS_FLUSH_TIMEOUT_SECONDS", "10")))
     return 0
 
 
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
+
+from curator_agent.env import load_env
+from curator_agent.scenarios import Branch, Stage, StandupScenario
+
+
+SARAH_PROMPT = (
+    "You are Sarah, a busy investor at a startup networking lounge. "
+    "You are role-playing one line of a practice conversation. "
+    "Answer in character, in English, in at most two short sentences. "
+    "Keep the meaning, tone and outcome of the scripted line you are given; "
+    "only adapt the wording to what the player actually said. "
+    "Never mention scripts, scores or that you are an AI."
+)
+DEFAULT_FIRST_TOKEN_SECONDS = 1.5
+DEFAULT_REPLY_SECONDS = 8.0
+DEFAULT_CACHE_SIZE = 256
+_DONE = object()
+_WORDS = re.compile(r"[a-z0-9']+")
+
+
+def npc_llm_enabled() -> bool:
+    return os.getenv("NPC_LLM", "false").strip().lower() in {"1", "true", "yes", "y"}
+
+
+def npc_backend() -> str:
+    return os.getenv("NPC_BACKEND", "live").strip().lower()
+
+
+def normalize_input(text: str) -> str:
+    return " ".join(_WORDS.findall(text.lower()))
+
+
+def build_reply_prompt(
+    scenario: StandupScenario, stage: Stage, branch: Branch, player_text: str
+) -> str:
+    return (
+        f"Scene: {scenario.background}\n"
+        f"Your state: {scenario.npc_state}\n"
+        f"Situation: {stage.prompt}\n"
+        f"The player said: \"{player_text}\"\n"
+        f"How you read it: {branch.intent} ({branch.effect})\n"
+        f"Scripted line: \"{branch.response}\"\n\n"
+        "Reply as Sarah."
+    )
+
+
+@dataclass(frozen=True)
+class NpcReply:
+    text: str
+    source: str
+    first_token_seconds: float | None = None
+    fallback_reason: str | None = None
+
+
+async def _stream_gemini(prompt: str) -> AsyncIterator[str]:
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+
+    from curator_agent.agent_executor import build_message, build_runtime
+
+    runner, session = await build_runtime(instruction=SARAH_PROMPT, name="sarah_npc")
+    try:
+        events = runner.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=build_message(prompt),
+            run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+        )
+        streamed = False
+        async for event in events:
+            content = getattr(event, "content", None)
+            if not content or not getattr(content, "parts", None):
+                continue
+            if getattr(event, "author", "") == "user":
+                continue
+            text = "".join(part.text or "" for part in content.parts)
+            if not text:
+                continue
+            # 스트리밍 중에는 부분 이벤트만 내보내고, 마지막 합본 이벤트는 건너뜀
+            if getattr(event, "partial", False):
+                streamed = True
+                yield text
+            elif not streamed:
+                yield text
+    finally:
+        await runner.close()
+
+
+async def _stream_openai(prompt: str) -> AsyncIterator[str]:
+    import litellm
+
+    load_env()
+    openai_key = os.getenv("OPENAI_API_KEY")
+    if not openai_key:
+        raise RuntimeError("Missing OPENAI_API_KEY environment variable.")
+    response = await litellm.acompletion(
+        model=os.getenv("NPC_OPENAI_MODEL", "gpt-4"),
+        messages=[
+            {"role": "system", "content": SARAH_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        api_key=openai_key,
+        stream=True,
+    )
+    async for chunk in response:
+        delta = chunk["choices"][0]["delta"].get("content")
+        if delta:
+            yield delta
+
+
+def _scripted_line(prompt: str) -> str:
+    return prompt.split('Scripted line: "', 1)[-1].split('"\n', 1)[0]
+
+
+async def _stream_stub(prompt: str) -> AsyncIterator[str]:
+    import asyncio
+
+    first_ms = float(os.getenv("NPC_STUB_FIRST_TOKEN_MS", "200") or 0)
+    await asyncio.sleep(first_ms / 1000)
+    for index, word in enumerate(_scripted_line(prompt).split(" ")):
+        if index:
+            await asyncio.sleep(0.01)
+        yield word if index == 0 else f" {word}"
+
+
+def _stream_live(prompt: str, provider: str) -> AsyncIterator[str]:
+    if provider == "openai":
+        return _stream_openai(prompt)
+    return _stream_gemini(prompt)
+
+
+def stream_reply(prompt: str, provider: str = "gemini") -> AsyncIterator[str]:
+    backend = npc_backend()
+    if backend == "stub":
+        return _stream_stub(prompt)
+    if backend in {"record", "replay", "synthetic"}:
+        from evaluator_agent.cassette import provider_stream
+
+        return provider_stream(
+            "npc",
+            provider,
+            prompt,
+            backend,
+            live=lambda: _stream_live(prompt, provider),
+            synthetic_text=_scripted_line(prompt),
+        )
+    return _stream_live(prompt, provider)
+
+
+class NpcReplies:
+    """
+    분기에 맞춘 사라의 대사를 LLM으로 스트리밍합니다. 첫 토큰이 예산 안에 오지 않으면
+    바로 대본 대사로 대체하고, 완성된 답변은 (단계, 분기, 정규화한 입력)별로 캐시합니다.
+    """
+
+    def __init__(
+        self, first_token_seconds: float, reply_seconds: float, cache_size: int
+    ) -> None:
+        self.first_token_seconds = first_token_seconds
+        self.reply_seconds = reply_seconds
+        self.cache_size = max(0, cache_size)
+        self._cache: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "NpcReplies":
+        load_env()
+        return cls(
+            float(os.getenv("NPC_FIRST_TOKEN_SECONDS", DEFAULT_FIRST_TOKEN_SECONDS)),
+            float(os.getenv("NPC_REPLY_SECONDS", DEFAULT_REPLY_SECONDS)),
+            int(os.getenv("NPC_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+        )
+
+    def _cached(self, key: tuple[str, str, str]) -> str | None:
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+            return text
+
+    def _store(self, key: tuple[str, str, str], text: str) -> None:
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[key] = text
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def reply(
+        self,
+        scenario: StandupScenario,
+        stage: Stage,
+        branch: Branch,
+        player_text: str,
+        provider: str = "gemini",
+        on_token: Callable[[str], None] | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> NpcReply:
+        """cancelled가 설정되면 제공자 스트림을 다음 조각에서 멈춥니다 (버려진 예측 등)."""
+        key = (stage.key, branch.key, normalize_input(player_text))
+        cached = self._cached(key)
+        if cached is not None:
+            if on_token is not None:
+                on_token(cached)
+            return NpcReply(cached, "cache")
+
+        prompt = build_reply_prompt(scenario, stage, branch, player_text)
+        tokens: queue.Queue = queue.Queue()
+        cancelled = cancelled or threading.Event()
+        started = time.monotonic()
+        threading.Thread(
+            target=self._produce, args=(prompt, provider, tokens, cancelled), daemon=True
+        ).start()
+
+        try:
+            first = tokens.get(timeout=self.first_token_seconds)
+        except queue.Empty:
+            cancelled.set()
+            return NpcReply(branch.response, "script", fallback_reason="first_token_timeout")
+        if first is _DONE:
+            return NpcReply(branch.response, "script", fallback_reason="empty")
+        if isinstance(first, Exception):
+            return NpcReply(branch.response, "script", fallback_reason="error")
+        first_token_seconds = time.monotonic() - started
+
+        chunks = [first]
+        if on_token is not None:
+            on_token(first)
+        complete = False
+        deadline = started + self.reply_seconds
+        while True:
+            try:
+                item = tokens.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                cancelled.set()
+                break
+            if item is _DONE:
+                complete = True
+                break
+            if isinstance(item, Exception):
+                break
+            chunks.append(item)
+            if on_token is not None:
+                on_token(item)
+        text = "".join(chunks).strip()
+        if complete and text:
+            self._store(key, text)
+        # 이미 보여준 토큰을 되돌릴 수 없으므로 중간에 끊겨도 받은 만큼을 답변으로 씀
+        return NpcReply(text or branch.response, "llm", first_token_seconds)
+
+    @staticmethod
+    def _produce(
+        prompt: str, provider: str, tokens: queue.Queue, cancelled: threading.Event
+    ) -> None:
+        import asyncio
+
+        async def pump() -> None:
+            async for chunk in stream_reply(prompt, provider):
+                if cancelled.is_set():
+                    break
+                tokens.put(chunk)
+
+        try:
+            asyncio.run(pump())
+        except Exception as exc:
+            tokens.put(exc)
+        tokens.put(_DONE)
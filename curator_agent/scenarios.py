@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
+
+from curator_agent.fuzzy import KeywordMatch, KeywordMatcher
 
 
 @dataclass(frozen=True)
@@ -32,11 +35,15 @@ class RecoveryRule:
     def should_offer(self, branch: Branch) -> bool:
         return branch.key in self.trigger_keys
 
+    @cached_property
+    def matcher(self) -> KeywordMatcher:
+        return KeywordMatcher([self.recovery.keywords])
+
+    def match_detail(self, text: str) -> KeywordMatch | None:
+        return self.matcher.search(text)
+
     def match(self, text: str) -> Recovery | None:
-        normalized = text.strip().lower()
-        if any(keyword.lower() in normalized for keyword in self.recovery.keywords):
-            return self.recovery
-        return None
+        return self.recovery if self.match_detail(text) else None
 
 
 @dataclass(frozen=True)
@@ -48,11 +55,22 @@ class Stage:
     default_branch: str
     recovery: RecoveryRule | None = None
 
+    @cached_property
+    def matcher(self) -> KeywordMatcher:
+        # 단계의 모든 키워드를 한 번만 컴파일해 두고 매 턴 재사용
+        return KeywordMatcher([branch.keywords for branch in self.branches])
+
+    def match_detail(self, text: str) -> tuple[Branch, KeywordMatch | None]:
+        """Matched branch plus how it matched (exact, phonetic or fuzzy); None means default."""
+        detail = self.matcher.search(text)
+        if detail is not None:
+            return self.branches[detail.group], detail
+        return self.default(), None
+
     def match(self, text: str) -> Branch:
-        normalized = text.strip().lower()
-        for branch in self.branches:
-            if any(keyword.lower() in normalized for keyword in branch.keywords):
-                return branch
+        return self.match_detail(text)[0]
+
+    def default(self) -> Branch:
         for branch in self.branches:
             if branch.key == self.default_branch:
                 return branch
@@ -329,5 +347,8 @@ STANDUP = StandupScenario(
 )
 
 
-def get_scenario() -> StandupScenario:
-    return STANDUP
+SCENARIOS = {STANDUP.key: STANDUP}
+
+
+def get_scenario(key: str | None = None) -> StandupScenario:
+    return SCENARIOS[key] if key is not None else STANDUP
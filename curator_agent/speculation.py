@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable
+
+from curator_agent.scenarios import Branch, Stage, StandupScenario
+
+if TYPE_CHECKING:
+    from curator_agent.engine import SessionState
+
+
+# 부분 인식 결과에서 이 방식으로 맞은 키워드만 확정으로 봄. 근사(fuzzy) 매칭은 말하는 도중
+# 잘린 단어에서도 생기므로 최종 인식 결과를 기다림
+CONFIDENT_METHODS = {"exact", "phonetic"}
+
+
+class PreparedReply:
+    """
+    미리 만드는 사라의 대사. 도착한 조각을 쌓아 두므로, 턴이 예측을 쓰기로 하면 이미 받은
+    조각부터 이어서 그대로 스트리밍할 수 있습니다. finish(None)은 쓸 수 없는 결과(실패, 대본 대체)입니다.
+    """
+
+    def __init__(self) -> None:
+        self.cancelled = threading.Event()
+        self._chunks: list[str] = []
+        self._text: str | None = None
+        self._done = False
+        self._changed = threading.Condition()
+
+    def push(self, chunk: str) -> None:
+        with self._changed:
+            self._chunks.append(chunk)
+            self._changed.notify_all()
+
+    def finish(self, text: str | None) -> None:
+        with self._changed:
+            self._text = text
+            self._done = True
+            self._changed.notify_all()
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def follow(
+        self,
+        on_token: Callable[[str], None] | None,
+        first_wait: float,
+        reply_wait: float,
+    ) -> str | None:
+        """
+        첫 조각을 first_wait초까지 기다리고, 받은 조각과 이후 조각을 on_token으로 흘려보내며
+        reply_wait초 안에 끝난 대사를 반환합니다. 첫 조각이 늦거나 쓸 수 없는 결과면 None입니다.
+        """
+        started = time.monotonic()
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._chunks or self._done, timeout=max(0.0, first_wait)
+            )
+            if not self._chunks:
+                # 조각 없이 끝난 결과는 대본 대사(NPC_LLM 꺼짐)이거나 쓸 수 없는 결과
+                if not self._done:
+                    self.cancel()
+                return self._text if self._done else None
+        sent = 0
+        deadline = started + reply_wait
+        while True:
+            with self._changed:
+                self._changed.wait_for(
+                    lambda: len(self._chunks) > sent or self._done,
+                    timeout=max(0.0, deadline - time.monotonic()),
+                )
+                chunks = self._chunks[sent:]
+                done = self._done
+            sent += len(chunks)
+            if on_token is not None:
+                for chunk in chunks:
+                    on_token(chunk)
+            if done:
+                with self._changed:
+                    text = self._text
+                return text or "".join(self._chunks).strip()
+            if not chunks and time.monotonic() >= deadline:
+                # 이미 보여준 조각은 되돌릴 수 없으므로 받은 만큼을 대사로 씀
+                self.cancel()
+                return "".join(self._chunks[:sent]).strip()
+
+
+@dataclass
+class Speculation:
+    stage_key: str
+    stage_index: int
+    turn_count: int
+    branch: Branch
+    method: str
+    reply: PreparedReply
+    started: float = field(default_factory=time.monotonic)
+    committed: bool = False
+
+    def valid_for(self, session: SessionState) -> bool:
+        """예측한 뒤 세션이 다른 턴으로 넘어가지 않았는지 확인합니다."""
+        return (
+            self.stage_index == session.stage_index
+            and self.turn_count == session.turn_count
+            and not session.recovery_pending
+            and not session.completed
+        )
+
+    def resolve(
+        self,
+        stage: Stage,
+        branch: Branch,
+        on_token: Callable[[str], None] | None,
+        first_wait: float,
+        reply_wait: float,
+    ) -> str | None:
+        """
+        최종 인식 결과로 고른 분기가 예측과 같으면 미리 준비 중인 대사를 이어서 스트리밍해
+        반환합니다. 다르거나, first_wait초 안에 첫 조각이 없거나, 준비에 실패했으면 None입니다.
+        """
+        if stage.key != self.stage_key or branch is not self.branch:
+            return None
+        text = self.reply.follow(on_token, first_wait, reply_wait)
+        if text is None:
+            return None
+        self.committed = True
+        return text
+
+
+def speculate(
+    session: SessionState,
+    scenario: StandupScenario,
+    partial_text: str,
+    prepare: Callable[[Stage, Branch, str], PreparedReply | None],
+) -> Speculation | None:
+    """
+    플레이어가 말하는 도중의 부분 인식 결과로 이번 턴의 분기를 예측합니다.
+    분기가 확정되고 지금 준비 중인 예측과 다르면 이전 예측을 취소하고, prepare로 사라의 대사를
+    미리 만들기 시작해 session.speculation에 둡니다. prepare가 None을 반환하면(슬롯 부족) 예측하지
+    않습니다. 새로 시작한 예측을 반환하며, 그 외에는 None입니다.
+    """
+    if session.completed or session.recovery_pending:
+        return None
+    if session.stage_index >= len(scenario.stages):
+        return None
+    stage = scenario.stages[session.stage_index]
+    branch, detail = stage.match_detail(partial_text)
+    if detail is None or detail.method not in CONFIDENT_METHODS:
+        return None
+    current = session.speculation
+    if current is not None and current.valid_for(session) and current.branch is branch:
+        return None
+    if current is not None:
+        # 예측이 바뀌었으면 이전 대사는 쓸 일이 없으므로 LLM 호출을 멈춤
+        current.reply.cancel()
+        session.speculation = None
+    reply = prepare(stage, branch, partial_text)
+    if reply is None:
+        return None
+    speculation = Speculation(
+        stage_key=stage.key,
+        stage_index=session.stage_index,
+        turn_count=session.turn_count,
+        branch=branch,
+        method=detail.method,
+        reply=reply,
+    )
+    session.speculation = speculation
+    return speculation
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+
+from curator_agent.env import load_env
+
+
+# 모델별 실시간 계수(디코드 시간 / 음성 길이)의 초기 추정치. 측정값이 쌓이면 EWMA로 대체됨
+DEFAULT_RTF = {
+    "tiny": 0.08,
+    "tiny.en": 0.08,
+    "base": 0.15,
+    "base.en": 0.15,
+    "small": 0.4,
+    "small.en": 0.4,
+    "medium": 1.0,
+    "large": 2.0,
+}
+DEFAULT_TIERS = "tiny,base,small"
+DEFAULT_BUDGET_SHARE = 0.25
+DEFAULT_MAX_DECODE_SECONDS = 6.0
+EWMA_WEIGHT = 0.3
+
+
+@dataclass(frozen=True)
+class TierChoice:
+    tier: str
+    estimate_seconds: float
+    budget_seconds: float
+    reason: str
+
+
+class TierSelector:
+    """
+    요청마다 Whisper 모델 단계를 고릅니다. 최근 측정한 실시간 계수, STT 대기열 길이,
+    플레이어의 남은 시간으로 예상 응답 시간을 계산해 예산 안에 드는 가장 큰 모델을 씁니다.
+    """
+
+    def __init__(
+        self,
+        tiers: list[str],
+        preferred: str,
+        budget_share: float,
+        max_decode_seconds: float,
+    ) -> None:
+        self.tiers = tiers or [preferred]
+        if preferred not in self.tiers:
+            self.tiers.append(preferred)
+        self.preferred = preferred
+        self.budget_share = budget_share
+        self.max_decode_seconds = max_decode_seconds
+        self._rtf = {tier: DEFAULT_RTF.get(tier, 1.0) for tier in self.tiers}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "TierSelector":
+        load_env()
+        tiers = [
+            tier.strip()
+            for tier in os.getenv("STT_TIERS", DEFAULT_TIERS).split(",")
+            if tier.strip()
+        ]
+        return cls(
+            tiers,
+            os.getenv("WHISPER_MODEL", "base"),
+            float(os.getenv("STT_BUDGET_SHARE", DEFAULT_BUDGET_SHARE)),
+            float(os.getenv("STT_MAX_DECODE_SECONDS", DEFAULT_MAX_DECODE_SECONDS)),
+        )
+
+    def rtf(self, tier: str) -> float:
+        with self._lock:
+            return self._rtf.get(tier, DEFAULT_RTF.get(tier, 1.0))
+
+    def observe(self, tier: str, clip_seconds: float, decode_seconds: float) -> None:
+        if clip_seconds <= 0:
+            return
+        with self._lock:
+            previous = self._rtf.get(tier, DEFAULT_RTF.get(tier, 1.0))
+            measured = decode_seconds / clip_seconds
+            self._rtf[tier] = (1 - EWMA_WEIGHT) * previous + EWMA_WEIGHT * measured
+
+    def choose(
+        self,
+        clip_seconds: float,
+        waiting: int = 0,
+        limit: int = 1,
+        remaining_seconds: float | None = None,
+    ) -> TierChoice:
+        budget = self.max_decode_seconds
+        reason = "load"
+        if remaining_seconds is not None:
+            deadline_budget = max(0.0, remaining_seconds) * self.budget_share
+            if deadline_budget < budget:
+                budget, reason = deadline_budget, "deadline"
+        # 앞에 기다리는 요청은 각각 한 번의 디코드만큼 슬롯을 차지한다고 봄
+        queue_factor = 1 + waiting / max(1, limit)
+        candidates = self.tiers[: self.tiers.index(self.preferred) + 1]
+        for tier in reversed(candidates):
+            estimate = clip_seconds * self.rtf(tier) * queue_factor
+            if estimate <= budget:
+                return TierChoice(
+                    tier, estimate, budget, "preferred" if tier == self.preferred else reason
+                )
+        fastest = self.tiers[0]
+        return TierChoice(
+            fastest, clip_seconds * self.rtf(fastest) * queue_factor, budget, "fastest"
+        )
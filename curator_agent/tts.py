@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+
+
+def tts_enabled() -> bool:
+    return os.getenv("TTS_ENABLED", "").lower() == "true"
+
+
+class SpeechWorker:
+    """Speaks queued lines on one long-lived pyttsx3 engine in a background thread."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[tuple[int, str] | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._pending = 0
+        self._idle = threading.Event()
+        self._idle.set()
+        self._engine = None
+        self.available = True
+
+    def say(self, text: str) -> None:
+        if not self.available or not text:
+            return
+        self._start()
+        with self._lock:
+            self._pending += 1
+            self._idle.clear()
+            self._queue.put((self._generation, text))
+
+    def cancel(self) -> None:
+        """Drops queued lines and cuts off the one being spoken."""
+        with self._lock:
+            self._generation += 1
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    self._pending -= 1
+            if self._pending <= 0:
+                self._idle.set()
+
+    def speaking(self) -> bool:
+        return not self._idle.is_set()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Blocks until every queued line has been spoken, or the timeout passes."""
+        return self._idle.wait(timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        self.flush(timeout)
+        if self._thread is not None:
+            self._queue.put(None)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+            self._thread.start()
+
+    def _init_engine(self):
+        try:
+            import pyttsx3
+
+            engine = pyttsx3.init()
+        except Exception:
+            self.available = False
+            return None
+        # 엔진 스레드 안에서 단어마다 취소 여부를 확인 (stop은 같은 스레드에서만 안전)
+        engine.connect("started-word", self._on_word)
+        return engine
+
+    def _on_word(self, name: int | None, location: int, length: int) -> None:
+        if name != self._generation and self._engine is not None:
+            self._engine.stop()
+
+    def _run(self) -> None:
+        self._engine = self._init_engine()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            generation, text = item
+            if self._engine is not None and generation == self._generation:
+                try:
+                    self._engine.say(text, generation)
+                    self._engine.runAndWait()
+                except Exception:
+                    pass
+            with self._lock:
+                self._pending -= 1
+                if self._pending <= 0:
+                    self._idle.set()
+
+
+_WORKER: SpeechWorker | None = None
+_WORKER_LOCK = threading.Lock()
+
+
+def speech_worker() -> SpeechWorker:
+    global _WORKER
+    if _WORKER is None:
+        with _WORKER_LOCK:
+            if _WORKER is None:
+                _WORKER = SpeechWorker()
+    return _WORKER
+
+
+def speak(text: str) -> None:
+    if tts_enabled():
+        speech_worker().say(text)
+
+
+def cancel_speech() -> None:
+    if _WORKER is not None:
+        _WORKER.cancel()
+
+
+def flush_speech(timeout: float | None = None) -> None:
+    if _WORKER is not None:
+        _WORKER.close(timeout)
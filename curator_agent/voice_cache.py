@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from curator_agent.engine import CONVERSATION_ENDED, RECOVERY_SKIPPED
+from curator_agent.scenarios import StandupScenario, get_scenario
+
+
+DEFAULT_CACHE_DIR = "tts_cache"
+DEFAULT_VOICE = "en-us"
+MANIFEST_NAME = "manifest.json"
+LINE_SEPARATOR = "\n\n"
+
+
+def voice_cache_dir() -> Path:
+    return Path(os.getenv("UI_TTS_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def line_hash(text: str, voice: str = DEFAULT_VOICE) -> str:
+    return hashlib.sha256(f"{voice}\0{text.strip()}".encode("utf-8")).hexdigest()[:20]
+
+
+def split_lines(text: str | None) -> list[str]:
+    """Splits a reply that joins several NPC lines (e.g. a response plus the success message)."""
+    if not text:
+        return []
+    return [part.strip() for part in text.split(LINE_SEPARATOR) if part.strip()]
+
+
+def stage_lines(scenario: StandupScenario) -> dict[str, list[str]]:
+    """NPC lines the player can hear while each stage is active."""
+    lines: dict[str, list[str]] = {}
+    for stage in scenario.stages:
+        stage_texts = [branch.response for branch in stage.branches]
+        if stage.recovery:
+            stage_texts.append(stage.recovery.recovery.response)
+        lines[stage.key] = stage_texts
+    return lines
+
+
+def scenario_lines(scenario: StandupScenario) -> list[str]:
+    texts: list[str] = []
+    for stage_texts in stage_lines(scenario).values():
+        texts.extend(stage_texts)
+    texts.extend(
+        [scenario.success_message, scenario.fail_message, CONVERSATION_ENDED, RECOVERY_SKIPPED]
+    )
+    unique: dict[str, None] = {}
+    for text in texts:
+        for line in split_lines(text):
+            unique.setdefault(line, None)
+    return list(unique)
+
+
+def _synthesize_espeak(text: str, voice: str, target: Path) -> bool:
+    binary = shutil.which("espeak-ng") or shutil.which("espeak")
+    if not binary:
+        return False
+    subprocess.run([binary, "-v", voice, "-w", str(target), text], check=True)
+    return True
+
+
+def _synthesize_pyttsx3(text: str, voice: str, target: Path) -> bool:
+    try:
+        import pyttsx3
+    except ImportError:
+        return False
+    engine = pyttsx3.init()
+    engine.save_to_file(text, str(target))
+    engine.runAndWait()
+    return target.exists()
+
+
+def _compress(source: Path, target_stem: Path) -> tuple[Path, str]:
+    """Transcodes to Ogg/Opus when ffmpeg is available; otherwise keeps the WAV."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg:
+        target = target_stem.with_suffix(".ogg")
+        subprocess.run(
+            [ffmpeg, "-loglevel", "error", "-y", "-i", str(source),
+             "-ac", "1", "-c:a", "libopus", "-b:a", "24k", str(target)],
+            check=True,
+        )
+        return target, "audio/ogg"
+    target = target_stem.with_suffix(".wav")
+    shutil.copyfile(source, target)
+    return target, "audio/wav"
+
+
+def build_cache(
+    scenario: StandupScenario, out_dir: Path, voice: str = DEFAULT_VOICE, engine: str = "auto"
+) -> dict:
+    """Synthesizes every NPC line that is not cached yet and rewrites the manifest."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    previous: dict = {}
+    if manifest_path.exists():
+        previous = json.loads(manifest_path.read_text(encoding="utf-8")).get("lines", {})
+
+    synthesizers = []
+    if engine in {"auto", "espeak"}:
+        synthesizers.append(_synthesize_espeak)
+    if engine in {"auto", "pyttsx3"}:
+        synthesizers.append(_synthesize_pyttsx3)
+
+    lines: dict[str, dict] = {}
+    for text in scenario_lines(scenario):
+        digest = line_hash(text, voice)
+        cached = previous.get(digest)
+        if cached and (out_dir / cached["file"]).exists():
+            lines[digest] = cached
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            raw = Path(tmp) / "line.wav"
+            if not any(synthesize(text, voice, raw) for synthesize in synthesizers):
+                raise RuntimeError("No TTS engine available (install espeak-ng or pyttsx3).")
+            path, content_type = _compress(raw, out_dir / digest)
+        lines[digest] = {
+            "text": text,
+            "file": path.name,
+            "content_type": content_type,
+            "bytes": path.stat().st_size,
+        }
+        print(f"{digest} {text[:60]}")
+
+    for digest, entry in previous.items():
+        if digest not in lines:
+            (out_dir / entry["file"]).unlink(missing_ok=True)
+
+    manifest = {"scenario": scenario.key, "voice": voice, "lines": lines}
+    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    return manifest
+
+
+@dataclass(frozen=True)
+class CachedAudio:
+    body: bytes
+    content_type: str
+    etag: str
+
+
+class VoiceCache:
+    """Pre-synthesized NPC audio held in memory, looked up by line text or hash."""
+
+    def __init__(
+        self, voice: str, audio: dict[str, CachedAudio], stage_audio: dict[str, list[str]]
+    ) -> None:
+        self.voice = voice
+        self.audio = audio
+        self.stage_audio = stage_audio
+
+    @classmethod
+    def load(cls, directory: Path, scenario: StandupScenario) -> "VoiceCache":
+        manifest_path = directory / MANIFEST_NAME
+        if not manifest_path.exists():
+            return cls(DEFAULT_VOICE, {}, {})
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        voice = manifest.get("voice", DEFAULT_VOICE)
+        audio: dict[str, CachedAudio] = {}
+        for digest, entry in manifest.get("lines", {}).items():
+            path = directory / entry["file"]
+            if path.exists():
+                audio[digest] = CachedAudio(path.read_bytes(), entry["content_type"], f'"{digest}"')
+        cache = cls(voice, audio, {})
+        cache.stage_audio = {
+            key: cache.hashes_for(*texts) for key, texts in stage_lines(scenario).items()
+        }
+        return cache
+
+    def get(self, digest: str) -> CachedAudio | None:
+        return self.audio.get(digest)
+
+    def hashes_for(self, *texts: str | None) -> list[str]:
+        hashes: list[str] = []
+        for text in texts:
+            for line in split_lines(text):
+                digest = line_hash(line, self.voice)
+                if digest in self.audio and digest not in hashes:
+                    hashes.append(digest)
+        return hashes
+
+    def prefetch_for(self, stage_key: str | None) -> list[str]:
+        return list(self.stage_audio.get(stage_key, [])) if stage_key else []
+
+    def __len__(self) -> int:
+        return len(self.audio)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-synthesize NPC lines for /api/tts.")
+    parser.add_argument("--out", type=Path, default=voice_cache_dir())
+    parser.add_argument("--voice", default=os.getenv("TTS_VOICE", DEFAULT_VOICE))
+    parser.add_argument("--engine", choices=("auto", "espeak", "pyttsx3"), default="auto")
+    args = parser.parse_args()
+    manifest = build_cache(get_scenario(), args.out, voice=args.voice, engine=args.engine)
+    total = sum(entry["bytes"] for entry in manifest["lines"].values())
+    print(f"{len(manifest['lines'])} lines, {total} bytes -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import io
 import os
 import tempfile
+import threading
+import time
 import wave
 
 
@@ -9,22 +12,89 @@ class VoiceInputError(RuntimeError):
     pass
 
 
-def _transcribe_audio_bytes(
-    audio_bytes: bytes, sample_rate: int, language_code: str
-) -> str:
+_MODELS: dict[str, object] = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def stt_backend() -> str:
+    return os.getenv("STT_BACKEND", "whisper").strip().lower()
+
+
+def audio_duration_seconds(audio_bytes: bytes, sample_rate: int) -> float:
+    try:
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wav_file:
+            return wav_file.getnframes() / float(wav_file.getframerate() or sample_rate)
+    except (wave.Error, EOFError):
+        return len(audio_bytes) / float(2 * max(1, sample_rate))
+
+
+def _transcribe_stub(audio_bytes: bytes, sample_rate: int, model_name: str | None) -> str:
+    rtf = float(os.getenv("STT_STUB_RTF", "0.1") or 0)
+    if model_name:
+        from curator_agent.stt_tier import DEFAULT_RTF
+
+        # 스텁도 모델 단계에 따라 느려지도록 기본 모델 대비 비율을 곱함
+        rtf *= DEFAULT_RTF.get(model_name, 1.0) / DEFAULT_RTF["base"]
+    if rtf > 0:
+        time.sleep(audio_duration_seconds(audio_bytes, sample_rate) * rtf)
+    return os.getenv("STT_STUB_TRANSCRIPT", "Is this seat taken?")
+
+
+def prewarm() -> None:
+    if stt_backend() == "stub":
+        return
+    try:
+        import whisper  # noqa: F401
+    except ImportError:
+        pass
+
+
+def model_loaded(model_name: str) -> bool:
+    """이미 로드된 모델이면 True입니다. 스텁은 로드할 모델이 없으므로 항상 True입니다."""
+    return stt_backend() == "stub" or model_name in _MODELS
+
+
+def load_model(model_name: str):
+    """
+    Whisper 모델을 이름별로 한 번만 로드해 재사용합니다.
+    WHISPER_MODEL_DIR가 설정되어 있으면 그 안의 체크포인트를 변환한 가중치 파일을 mmap해
+    오프라인으로 로드하므로, 여러 워커 프로세스가 물리 메모리의 한 사본을 함께 씁니다.
+    """
+    model = _MODELS.get(model_name)
+    if model is not None:
+        return model
     try:
         import whisper
     except ImportError as exc:
         raise VoiceInputError(
             "Missing whisper package. Install openai-whisper to use STT."
         ) from exc
+    from curator_agent.whisper_weights import load_mapped, whisper_model_dir
+
+    model_dir = whisper_model_dir()
+    with _MODELS_LOCK:
+        model = _MODELS.get(model_name)
+        if model is None:
+            try:
+                if model_dir is not None:
+                    model = load_mapped(model_name, model_dir)
+                else:
+                    model = whisper.load_model(model_name)
+            except Exception as exc:
+                raise VoiceInputError(
+                    f"Failed to load Whisper model '{model_name}'."
+                ) from exc
+            _MODELS[model_name] = model
+    return model
 
-    model_name = os.getenv("WHISPER_MODEL", "base")
+
+def _transcribe_audio_bytes(
+    audio_bytes: bytes, sample_rate: int, language_code: str, model_name: str | None = None
+) -> str:
+    if stt_backend() == "stub":
+        return _transcribe_stub(audio_bytes, sample_rate, model_name)
+    model = load_model(model_name or os.getenv("WHISPER_MODEL", "base"))
     normalized_lang = language_code.split("-")[0] if language_code else None
-    try:
-        model = whisper.load_model(model_name)
-    except Exception as exc:
-        raise VoiceInputError(f"Failed to load Whisper model '{model_name}'.") from exc
 
     # Windows-compatible temp file handling
     wav_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
@@ -45,9 +115,9 @@ def _transcribe_audio_bytes(
 
 
 def transcribe_audio_bytes(
-    audio_bytes: bytes, sample_rate: int, language_code: str
+    audio_bytes: bytes, sample_rate: int, language_code: str, model_name: str | None = None
 ) -> str:
-    return _transcribe_audio_bytes(audio_bytes, sample_rate, language_code)
+    return _transcribe_audio_bytes(audio_bytes, sample_rate, language_code, model_name)
 
 
 def _read_wav_bytes(path: str) -> tuple[bytes, int]:
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+MAPPED_SUFFIX = ".mmap.pt"
+
+
+class WeightsError(RuntimeError):
+    pass
+
+
+def whisper_model_dir() -> Path | None:
+    value = os.getenv("WHISPER_MODEL_DIR", "").strip()
+    return Path(value) if value else None
+
+
+def mapped_dir(model_dir: Path) -> Path:
+    return Path(os.getenv("WHISPER_MMAP_DIR", "").strip() or model_dir)
+
+
+def mapped_path(model_name: str, model_dir: Path) -> Path:
+    return mapped_dir(model_dir) / f"{model_name}{MAPPED_SUFFIX}"
+
+
+def convert(model_name: str, model_dir: Path) -> Path:
+    """
+    미리 받아 둔 Whisper 체크포인트(model_dir/<이름>.pt)를 CPU 추론에 바로 쓸 수 있는 형태
+    (float32, 연속 메모리, zip 형식)로 한 번 변환해 저장합니다. 네트워크는 쓰지 않습니다.
+    여러 프로세스가 동시에 변환해도 임시 파일을 원자적으로 바꿔 넣으므로 결과는 하나입니다.
+    """
+    import torch
+
+    target = mapped_path(model_name, model_dir)
+    if target.exists():
+        return target
+    source = model_dir / f"{model_name}.pt"
+    if not source.exists():
+        raise WeightsError(
+            f"No Whisper checkpoint at {source}. Stage '{model_name}.pt' in WHISPER_MODEL_DIR."
+        )
+    checkpoint = torch.load(source, map_location="cpu", weights_only=True)
+    state = {
+        key: tensor.float().contiguous() if tensor.is_floating_point() else tensor.contiguous()
+        for key, tensor in checkpoint["model_state_dict"].items()
+    }
+    target.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(
+        prefix=f".{model_name}.", suffix=".tmp", dir=target.parent
+    )
+    os.close(handle)
+    try:
+        torch.save({"dims": dict(checkpoint["dims"]), "model_state_dict": state}, temp_path)
+        os.replace(temp_path, target)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return target
+
+
+def load_mapped(model_name: str, model_dir: Path):
+    """
+    변환한 가중치 파일을 읽기 전용으로 mmap해 Whisper 모델을 만듭니다. 모델은 meta 장치에서
+    빈 껍데기로 만들고 load_state_dict(assign=True)로 매핑된 텐서를 그대로 붙이므로, 같은 파일을
+    여는 워커 프로세스들은 페이지 캐시의 한 사본을 공유하고 시작할 때 가중치를 복사하지 않습니다.
+    """
+    import torch
+    import whisper
+    from whisper.model import ModelDimensions, Whisper
+
+    path = convert(model_name, model_dir)
+    checkpoint = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    dims = ModelDimensions(**checkpoint["dims"])
+    try:
+        with torch.device("meta"):
+            model = Whisper(dims)
+    except (NotImplementedError, RuntimeError):
+        # meta 장치에서 만들 수 없는 torch 버전이면 CPU에서 만든 뒤 매핑된 텐서로 교체
+        model = Whisper(dims)
+    model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+    # 체크포인트에 없는(persistent=False) 버퍼는 Whisper 코드와 같은 방식으로 다시 만듦
+    mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(-float("inf")).triu_(1)
+    model.decoder.register_buffer("mask", mask, persistent=False)
+    all_heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+    all_heads[dims.n_text_layer // 2 :] = True
+    model.register_buffer("alignment_heads", all_heads.to_sparse(), persistent=False)
+    alignment_heads = getattr(whisper, "_ALIGNMENT_HEADS", {}).get(model_name)
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+    missing = [
+        name
+        for name, tensor in [*model.named_parameters(), *model.named_buffers()]
+        if tensor.is_meta
+    ]
+    if missing:
+        raise WeightsError(f"{path} is missing weights: {', '.join(missing[:5])}")
+    model.eval()
+    if torch.cuda.is_available():
+        # GPU에서는 어차피 장치 메모리로 복사되므로 공유 이점은 CPU 워커에만 있음
+        model = model.to("cuda")
+    return model
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert staged Whisper checkpoints into memory-mappable weight files."
+    )
+    parser.add_argument("models", nargs="+", help="Model names, e.g. tiny base small.")
+    parser.add_argument("--model-dir", type=Path, default=whisper_model_dir())
+    args = parser.parse_args()
+    if args.model_dir is None:
+        parser.error("set WHISPER_MODEL_DIR or pass --model-dir")
+    for model_name in args.models:
+        path = convert(model_name, args.model_dir)
+        print(f"{model_name}: {path} ({path.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,11 @@
 import os
 
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.models import Gemini
 
+from curator_agent.env import load_env
+from evaluator_agent.scenarios import EVALUATOR_PROMPT
 
-EVALUATOR_PROMPT = (
-    "You are a conversation evaluator. "
-    "Follow the scenario-specific rubric and respond in English. "
-    "Focus your evaluation on the specific stages or moments that most influenced the final score. "
-    "Do not list every stage if it was uneventful; instead, highlight key strengths or weaknesses in areas like icebreakers, clarity, politeness, and intent alignment. "
-    "Provide a concise, insightful feedback paragraph followed by the final score in the format 'Score:X/5'."
-)
 
 DEFAULT_MODEL = "gemini-2.0-flash"
 
@@ -46,7 +40,7 @@ def build_agent(api_choice: str = "gemini") -> Agent:
     api_choice 파라미터는 호환성을 위해 유지하지만, Gemini만 사용합니다.
     OpenAI는 ui_server.py의 _run_evaluator에서 LiteLLM으로 직접 호출됩니다.
     """
-    load_dotenv()
+    load_env()
     api_key = _require_api_key()
     use_vertex = _env_flag("GOOGLE_GENAI_USE_VERTEXAI", False)
     model_name = _env_value("GEMINI_MODEL", DEFAULT_MODEL)
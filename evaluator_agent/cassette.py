@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, Callable
+
+from curator_agent.env import load_env
+
+
+CASSETTE_MODES = {"record", "replay", "synthetic"}
+DEFAULT_CASSETTE = "cassettes/llm.jsonl"
+DEFAULT_SYNTH_LATENCY = "lognormal:800:0.5"
+DEFAULT_SYNTH_TOKENS_PER_SECOND = 40.0
+
+
+class CassetteMiss(RuntimeError):
+    pass
+
+
+class SyntheticError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class Recording:
+    key: str
+    kind: str
+    provider: str
+    chunks: tuple[str, ...]
+    # 호출 시작부터 각 조각이 도착할 때까지 걸린 시간
+    offsets_ms: tuple[float, ...]
+
+
+def recording_key(kind: str, provider: str, prompt: str) -> str:
+    return hashlib.sha256(f"{kind}\0{provider}\0{prompt}".encode("utf-8")).hexdigest()[:24]
+
+
+class Cassette:
+    """
+    제공자 응답을 JSONL 파일에 (종류, 제공자, 프롬프트) 해시별로 기록합니다.
+    프롬프트 원문은 남기지 않으며, 같은 키를 다시 기록하면 마지막 기록을 재생합니다.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._recordings: dict[str, Recording] | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, Recording]:
+        if self._recordings is None:
+            recordings = {}
+            if self.path.exists():
+                for line in self.path.read_text(encoding="utf-8").splitlines():
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    recordings[entry["key"]] = Recording(
+                        entry["key"],
+                        entry["kind"],
+                        entry["provider"],
+                        tuple(entry["chunks"]),
+                        tuple(entry["offsets_ms"]),
+                    )
+            self._recordings = recordings
+        return self._recordings
+
+    def get(self, key: str) -> Recording | None:
+        with self._lock:
+            return self._load().get(key)
+
+    def add(self, recording: Recording) -> None:
+        entry = {
+            "key": recording.key,
+            "kind": recording.kind,
+            "provider": recording.provider,
+            "chunks": list(recording.chunks),
+            "offsets_ms": list(recording.offsets_ms),
+        }
+        with self._lock:
+            self._load()[recording.key] = recording
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+async def record(
+    cassette: Cassette, kind: str, provider: str, prompt: str, stream: AsyncIterator[str]
+) -> AsyncIterator[str]:
+    """실제 응답을 그대로 흘려보내며 조각과 도착 시각을 기록합니다. 끝까지 받은 응답만 남깁니다."""
+    started = time.monotonic()
+    chunks: list[str] = []
+    offsets: list[float] = []
+    async for chunk in stream:
+        chunks.append(chunk)
+        offsets.append(round((time.monotonic() - started) * 1000, 1))
+        yield chunk
+    key = recording_key(kind, provider, prompt)
+    cassette.add(Recording(key, kind, provider, tuple(chunks), tuple(offsets)))
+
+
+async def replay(
+    cassette: Cassette, kind: str, provider: str, prompt: str, timing: bool = True
+) -> AsyncIterator[str]:
+    """기록한 조각을 같은 순서로 돌려줍니다. timing이면 기록된 도착 시각에 맞춰 기다립니다."""
+    key = recording_key(kind, provider, prompt)
+    recording = cassette.get(key)
+    if recording is None:
+        raise CassetteMiss(f"No recorded {kind} response for {provider} ({key}) in {cassette.path}")
+    started = time.monotonic()
+    for chunk, offset_ms in zip(recording.chunks, recording.offsets_ms):
+        if timing:
+            delay = offset_ms / 1000 - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        yield chunk
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    지연 분포(밀리초)를 읽습니다: "fixed:500", "uniform:200:1500",
+    "lognormal:800:0.5"(중앙값, 시그마). 시그마가 클수록 꼬리가 길어집니다.
+    """
+    name, _, rest = spec.strip().partition(":")
+    values = [float(value) for value in rest.split(":") if value]
+    if name == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if name == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if name == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(max(values[0], 1e-3)), values[1])
+    raise ValueError(f"Invalid latency distribution: {spec!r}")
+
+
+class SyntheticProvider:
+    """
+    네트워크 없이 LLM 제공자를 흉내 냅니다. 첫 조각까지의 지연은 분포에서 뽑고,
+    error_rate 비율로 실패하며, 이후 단어를 tokens_per_second 속도로 흘려보냅니다.
+    """
+
+    def __init__(
+        self,
+        latency: Callable[[random.Random], float],
+        error_rate: float,
+        tokens_per_second: float,
+        seed: int | None = None,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = max(0.0, min(error_rate, 1.0))
+        self.tokens_per_second = tokens_per_second
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SyntheticProvider":
+        load_env()
+        seed = os.getenv("LLM_SYNTH_SEED", "").strip()
+        return cls(
+            parse_latency(os.getenv("LLM_SYNTH_LATENCY", DEFAULT_SYNTH_LATENCY)),
+            float(os.getenv("LLM_SYNTH_ERROR_RATE", "0") or 0),
+            float(os.getenv("LLM_SYNTH_TOKENS_PER_SECOND", DEFAULT_SYNTH_TOKENS_PER_SECOND)),
+            int(seed) if seed else None,
+        )
+
+    def _draw(self) -> tuple[float, bool]:
+        with self._lock:
+            return max(0.0, self.latency(self._rng)) / 1000, self._rng.random() < self.error_rate
+
+    async def stream(self, text: str) -> AsyncIterator[str]:
+        delay, fail = self._draw()
+        await asyncio.sleep(delay)
+        if fail:
+            raise SyntheticError("Synthetic provider error.")
+        interval = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        for index, word in enumerate(text.split(" ")):
+            if index and interval:
+                await asyncio.sleep(interval)
+            yield word if index == 0 else f" {word}"
+
+
+@lru_cache(maxsize=None)
+def _cassette(path: str) -> Cassette:
+    return Cassette(Path(path))
+
+
+@lru_cache(maxsize=1)
+def synthetic_provider() -> SyntheticProvider:
+    return SyntheticProvider.from_env()
+
+
+def cassette_from_env() -> Cassette:
+    load_env()
+    return _cassette(os.getenv("LLM_CASSETTE", DEFAULT_CASSETTE))
+
+
+def provider_stream(
+    kind: str,
+    provider: str,
+    prompt: str,
+    mode: str,
+    live: Callable[[], AsyncIterator[str]],
+    synthetic_text: str,
+) -> AsyncIterator[str]:
+    """
+    제공자 경계에서 호출을 가로챕니다. record는 실제 호출을 기록하고, replay는 기록만
+    재생하며(없으면 CassetteMiss), synthetic은 synthetic_text를 합성 제공자로 흘려보냅니다.
+    """
+    if mode == "synthetic":
+        return synthetic_provider().stream(synthetic_text)
+    if mode == "record":
+        return record(cassette_from_env(), kind, provider, prompt, live())
+    if mode == "replay":
+        timing = os.getenv("LLM_REPLAY_TIMING", "recorded").strip().lower() != "none"
+        return replay(cassette_from_env(), kind, provider, prompt, timing)
+    return live()
+
+
+async def collect(stream: AsyncIterator[str]) -> str:
+    return "".join([chunk async for chunk in stream])
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from evaluator_agent.runner import run_evaluation
+from evaluator_agent.scenarios import STANDUP_RUBRIC, build_eval_prompt
+
+if TYPE_CHECKING:
+    from ui_backend.breaker import CircuitBreaker
+
+
+DEFAULT_WORKERS = 4
+DEFAULT_WAIT_SECONDS = 3.0
+DEFAULT_DEADLINE_SECONDS = 20.0
+SUMMARY_WORDS = 80
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def incremental_enabled() -> bool:
+    return os.getenv("EVAL_INCREMENTAL", "false").strip().lower() in {"1", "true", "yes", "y"}
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                workers = int(os.getenv("EVAL_INCREMENTAL_WORKERS", DEFAULT_WORKERS))
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=max(1, workers), thread_name_prefix="eval-stage"
+                )
+    return _EXECUTOR
+
+
+def build_stage_prompt(stage_key: str, summary: str | None, lines: list[str]) -> str:
+    previous = summary or "(nothing yet)"
+    return (
+        f"You are tracking a conversation that is still in progress. {stage_key} just ended.\n"
+        f"Running summary of the earlier stages:\n{previous}\n\n"
+        f"New lines from {stage_key}:\n" + "\n".join(lines) + "\n\n"
+        f"Update the running summary in at most {SUMMARY_WORDS} words. Keep the moments that "
+        "matter for the rubric below (tone, clarity, intent, affinity and trust). "
+        "Do not give a score yet. Respond only in English.\n\n" + STANDUP_RUBRIC
+    )
+
+
+def build_final_prompt(summary: str, lines: list[str]) -> str:
+    return (
+        "Please evaluate the following conversation. Respond only in English.\n\n"
+        f"Summary of the earlier stages:\n{summary}\n\n"
+        "Final lines:\n" + ("\n".join(lines) or "(none)") + "\n\n" + STANDUP_RUBRIC
+    )
+
+
+def _deadline_seconds() -> float:
+    return float(os.getenv("EVAL_DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS))
+
+
+def _run(prompt: str, provider: str, timeout: float) -> str:
+    import asyncio
+
+    return asyncio.run(asyncio.wait_for(run_evaluation(prompt, provider=provider), timeout))
+
+
+class IncrementalEvaluation:
+    """
+    단계가 끝날 때마다 백그라운드에서 요약을 갱신해 두고,
+    마지막 평가는 요약과 마지막 단계만으로 한 번 호출합니다. 요약 호출은 deadline_seconds 안에
+    끝나야 하며, breaker가 주어지면 닫혀 있을 때만 요약을 맡기고 결과를 차단기에 기록합니다.
+    """
+
+    def __init__(
+        self,
+        scenario_key: str = "standup",
+        provider: str = "gemini",
+        breaker: CircuitBreaker | None = None,
+        deadline_seconds: float | None = None,
+    ) -> None:
+        self.scenario_key = scenario_key
+        self.provider = provider
+        self.breaker = breaker
+        self.deadline_seconds = (
+            _deadline_seconds() if deadline_seconds is None else deadline_seconds
+        )
+        self.summary: str | None = None
+        self.summarized_lines = 0
+        self.stages: list[str] = []
+        self._pending: Future | None = None
+        self._lock = threading.Lock()
+
+    def stage_completed(self, stage_key: str, transcript: list[str]) -> None:
+        if self.breaker is not None and self.breaker.state != "closed":
+            # 제공자가 실패 중이면 요약을 건너뜀. 시험 호출은 마지막 평가에 맡김
+            return
+        snapshot = list(transcript)
+        with self._lock:
+            previous = self._pending
+            self._pending = _executor().submit(self._summarize, previous, stage_key, snapshot)
+
+    def _summarize(self, previous: Future | None, stage_key: str, transcript: list[str]) -> None:
+        if previous is not None:
+            # 요약은 단계 순서대로 이어서 만들어야 하므로 앞 단계 작업을 기다림
+            previous.result()
+        lines = transcript[self.summarized_lines:]
+        if not lines:
+            return
+        prompt = build_stage_prompt(stage_key, self.summary, lines)
+        try:
+            summary = _run(prompt, self.provider, self.deadline_seconds)
+        except Exception:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            return
+        if self.breaker is not None:
+            self.breaker.record_success()
+        if summary and summary.strip():
+            with self._lock:
+                self.summary = summary.strip()
+                self.summarized_lines = len(transcript)
+                self.stages.append(stage_key)
+
+    def final_prompt(self, transcript: list[str], wait_seconds: float | None = None) -> str:
+        """Prompt for the end-of-game call, or the full-transcript prompt if no summary is ready."""
+        if wait_seconds is None:
+            wait_seconds = float(os.getenv("EVAL_INCREMENTAL_WAIT_SECONDS", DEFAULT_WAIT_SECONDS))
+        with self._lock:
+            pending = self._pending
+        # 진행 중인 요약은 잠깐만 기다리고, 늦으면 이미 준비된 요약에 남은 줄을 더해 평가
+        if pending is not None:
+            try:
+                pending.result(timeout=wait_seconds)
+            except Exception:
+                pass
+        with self._lock:
+            summary, covered = self.summary, self.summarized_lines
+        if not summary or covered > len(transcript):
+            return build_eval_prompt(self.scenario_key, transcript)
+        return build_final_prompt(summary, transcript[covered:])
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import os
+from typing import AsyncIterator
+
+from curator_agent.env import load_env
+
+
+STUB_EVALUATION = (
+    "The player kept the conversation moving and closed with a clear next step. "
+    "Score: 3/5"
+)
+
+
+def evaluator_backend() -> str:
+    return os.getenv("EVALUATOR_BACKEND", "live").strip().lower()
+
+
+async def _run_gemini(prompt: str) -> str:
+    from evaluator_agent.agent_executor import build_message, build_runtime
+
+    runner, session = await build_runtime(api_choice="gemini")
+    try:
+        events = runner.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=build_message(prompt),
+        )
+        chunks: list[str] = []
+        async for event in events:
+            content = getattr(event, "content", None)
+            if not content or not getattr(content, "parts", None):
+                continue
+            if getattr(event, "author", "") == "user":
+                continue
+            text = "".join(part.text or "" for part in content.parts)
+            if text:
+                chunks.append(text)
+    finally:
+        await runner.close()
+    return "".join(chunks)
+
+
+async def _run_openai(prompt: str) -> str:
+    import litellm
+    from evaluator_agent.scenarios import EVALUATOR_PROMPT
+
+    load_env()
+    openai_key = os.getenv("OPENAI_API_KEY")
+    if not openai_key:
+        raise RuntimeError("Missing OPENAI_API_KEY environment variable.")
+
+    messages = [
+        {"role": "system", "content": EVALUATOR_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+    response = await litellm.acompletion(
+        model="gpt-4",
+        messages=messages,
+        api_key=openai_key,
+    )
+    return response["choices"][0]["message"]["content"]
+
+
+async def _run_stub(prompt: str) -> str:
+    latency_ms = float(os.getenv("EVALUATOR_STUB_LATENCY_MS", "0") or 0)
+    if latency_ms > 0:
+        import asyncio
+
+        await asyncio.sleep(latency_ms / 1000)
+    return STUB_EVALUATION
+
+
+def prewarm() -> None:
+    """
+    첫 평가 요청이 SDK import 비용을 치르지 않도록 백그라운드에서 미리 import합니다.
+    """
+    if evaluator_backend() in {"stub", "replay", "synthetic"}:
+        return
+    try:
+        import evaluator_agent.agent_executor  # noqa: F401
+    except Exception:
+        pass
+    if os.getenv("OPENAI_API_KEY"):
+        try:
+            import litellm  # noqa: F401
+        except Exception:
+            pass
+
+
+async def _run_live(prompt: str, provider: str) -> str:
+    if provider == "openai":
+        return await _run_openai(prompt)
+    return await _run_gemini(prompt)
+
+
+async def _stream_live(prompt: str, provider: str) -> AsyncIterator[str]:
+    yield await _run_live(prompt, provider)
+
+
+async def run_evaluation(prompt: str, provider: str = "gemini") -> str:
+    """
+    평가 프롬프트를 선택된 제공자(gemini/openai)로 실행합니다.
+    EVALUATOR_BACKEND=stub이면 네트워크 없이 고정된 결과를 반환하고,
+    record/replay/synthetic이면 evaluator_agent.cassette를 거칩니다.
+    """
+    backend = evaluator_backend()
+    if backend == "stub":
+        return await _run_stub(prompt)
+    if backend in {"record", "replay", "synthetic"}:
+        from evaluator_agent.cassette import collect, provider_stream
+
+        return await collect(
+            provider_stream(
+                "evaluation",
+                provider,
+                prompt,
+                backend,
+                live=lambda: _stream_live(prompt, provider),
+                synthetic_text=STUB_EVALUATION,
+            )
+        )
+    return await _run_live(prompt, provider)
+
+
+RANK_SCORES = {"S": 5, "A": 4, "B": 3, "C": 2, "F": 1}
+
+
+def local_score(final_rank: str | None, affinity: int, trust: int) -> int:
+    if final_rank in RANK_SCORES:
+        return RANK_SCORES[final_rank]
+    total = affinity + trust
+    if total >= 60:
+        return 5
+    if total >= 35:
+        return 4
+    if total >= 15:
+        return 3
+    if total >= 0:
+        return 2
+    return 1
+
+
+def local_evaluation(final_rank: str | None, affinity: int, trust: int) -> str:
+    score = local_score(final_rank, affinity, trust)
+    return (
+        "Local score (the AI evaluator was not available for this session). "
+        f"Affinity {affinity}, trust {trust}. Score: {score}/5"
+    )
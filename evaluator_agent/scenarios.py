@@ -1,6 +1,14 @@
 from __future__ import annotations
 
 
+EVALUATOR_PROMPT = (
+    "You are a conversation evaluator. "
+    "Follow the scenario-specific rubric and respond in English. "
+    "Focus your evaluation on the specific stages or moments that most influenced the final score. "
+    "Do not list every stage if it was uneventful; instead, highlight key strengths or weaknesses in areas like icebreakers, clarity, politeness, and intent alignment. "
+    "Provide a concise, insightful feedback paragraph followed by the final score in the format 'Score:X/5'."
+)
+
 STANDUP_RUBRIC = (
     "Scenario: Startup Standup 2.0\n"
     "- Intent flow: approach -> ice breaking -> pitch -> closing\n"
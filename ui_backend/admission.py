@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import contextlib
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Iterator
+
+from curator_agent.env import load_env
+from ui_backend.metrics import REGISTRY
+
+
+class Overloaded(RuntimeError):
+    def __init__(self, resource: str, reason: str, retry_after: int) -> None:
+        super().__init__(f"{resource} is overloaded ({reason}).")
+        self.resource = resource
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+ADMISSION_ACTIVE = REGISTRY.callback_gauge(
+    "ui_admission_active", "Admitted work currently holding a slot.", ("resource",)
+)
+ADMISSION_QUEUE_DEPTH = REGISTRY.callback_gauge(
+    "ui_admission_queue_depth", "Work waiting for an admission slot.", ("resource",)
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    "ui_admission_rejected_total", "Work shed by admission control.", ("resource", "reason")
+)
+ADMISSION_WAIT = REGISTRY.histogram(
+    "ui_admission_wait_seconds", "Time spent queued before admission.", ("resource",)
+)
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded FIFO wait and a queue-time deadline."""
+
+    def __init__(
+        self, name: str, limit: int, queue_timeout: float, max_queue: int | None = None
+    ) -> None:
+        self.name = name
+        self.limit = max(1, limit)
+        self.queue_timeout = max(0.0, queue_timeout)
+        self.max_queue = self.limit * 4 if max_queue is None else max(0, max_queue)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: deque[threading.Event] = deque()
+        self._service_seconds = 1.0
+        ADMISSION_ACTIVE.add_callback(lambda: {(self.name,): self._active})
+        ADMISSION_QUEUE_DEPTH.add_callback(lambda: {(self.name,): len(self._waiters)})
+
+    @classmethod
+    def from_env(
+        cls, name: str, prefix: str, limit: int, queue_timeout: float
+    ) -> "AdmissionController":
+        load_env()
+        max_queue = os.getenv(f"{prefix}_MAX_QUEUE")
+        return cls(
+            name,
+            int(os.getenv(f"{prefix}_MAX_CONCURRENCY", limit)),
+            float(os.getenv(f"{prefix}_QUEUE_TIMEOUT_SECONDS", queue_timeout)),
+            int(max_queue) if max_queue else None,
+        )
+
+    def depth(self) -> tuple[int, int]:
+        return self._active, len(self._waiters)
+
+    def retry_after(self) -> int:
+        backlog = (len(self._waiters) + 1) / self.limit
+        return max(1, math.ceil(backlog * self._service_seconds))
+
+    def _reject(self, reason: str) -> Overloaded:
+        ADMISSION_REJECTED.labels(self.name, reason).inc()
+        return Overloaded(self.name, reason, self.retry_after())
+
+    def acquire(self) -> float:
+        started = time.monotonic()
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                ADMISSION_WAIT.labels(self.name).observe(0.0)
+                return started
+            if len(self._waiters) >= self.max_queue:
+                raise self._reject("queue_full")
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+        if not waiter.wait(self.queue_timeout):
+            with self._lock:
+                # release() may have handed us the slot right at the deadline.
+                if not waiter.is_set():
+                    self._waiters.remove(waiter)
+                    raise self._reject("queue_timeout")
+        admitted = time.monotonic()
+        ADMISSION_WAIT.labels(self.name).observe(admitted - started)
+        return admitted
+
+    def release(self, admitted_at: float | None = None) -> None:
+        with self._lock:
+            if admitted_at is not None:
+                held = time.monotonic() - admitted_at
+                self._service_seconds = 0.8 * self._service_seconds + 0.2 * held
+            if self._waiters:
+                # Hand the slot straight to the oldest waiter.
+                self._waiters.popleft().set()
+            else:
+                self._active -= 1
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        admitted_at = self.acquire()
+        try:
+            yield
+        finally:
+            self.release(admitted_at)
@@ -0,0 +1,427 @@
+from __future__ import annotations
+
+import argparse
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from curator_agent.env import load_env
+from evaluator_agent.runner import RANK_SCORES
+from ui_backend.session_log import group_sessions, read_events
+
+
+DEFAULT_DB_PATH = "analytics.sqlite"
+DEFAULT_BATCH_SIZE = 500
+FLUSH_INTERVAL_SECONDS = 2.0
+ABANDON_AFTER_SECONDS = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    started_at REAL,
+    scenario TEXT,
+    api_choice TEXT,
+    time_limit INTEGER,
+    duration REAL,
+    turns INTEGER,
+    last_stage TEXT,
+    completed INTEGER,
+    timed_out INTEGER,
+    timeout_stage TEXT,
+    final_rank TEXT,
+    rank_score INTEGER,
+    affinity INTEGER,
+    trust INTEGER,
+    eval_score REAL,
+    eval_seconds REAL,
+    degraded TEXT,
+    stt_count INTEGER,
+    stt_decode_seconds REAL
+);
+CREATE TABLE IF NOT EXISTS turns (
+    session_id TEXT NOT NULL,
+    turn INTEGER NOT NULL,
+    t REAL,
+    stage TEXT,
+    branch TEXT,
+    recovered INTEGER,
+    affinity_delta INTEGER,
+    trust_delta INTEGER,
+    PRIMARY KEY (session_id, turn)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sessions_rank ON sessions (final_rank);
+CREATE INDEX IF NOT EXISTS sessions_timeout ON sessions (timed_out, timeout_stage);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started_at);
+CREATE INDEX IF NOT EXISTS turns_branch ON turns (stage, branch);
+CREATE INDEX IF NOT EXISTS turns_stage_session ON turns (stage, session_id);
+"""
+
+SESSION_COLUMNS = (
+    "session_id", "started_at", "scenario", "api_choice", "time_limit", "duration", "turns",
+    "last_stage", "completed", "timed_out", "timeout_stage", "final_rank", "rank_score",
+    "affinity", "trust", "eval_score", "eval_seconds", "degraded", "stt_count",
+    "stt_decode_seconds",
+)
+HISTOGRAM_COLUMNS = (
+    "started_at", "time_limit", "duration", "turns", "completed", "timed_out", "rank_score",
+    "affinity", "trust", "eval_score", "eval_seconds", "stt_count", "stt_decode_seconds",
+)
+
+
+Summary = tuple[dict[str, Any], list[tuple]]
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _eval_score(value: str | None) -> float | None:
+    """'4/5' 또는 '18/25' 형식의 평가 점수를 5점 만점으로 환산."""
+    if not value:
+        return None
+    score, _, total = value.partition("/")
+    try:
+        return round(float(score) * 5 / float(total), 2)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def summarize(events: list[dict[str, Any]]) -> Summary:
+    """Folds one session's log events into a sessions row and its turns rows."""
+    row: dict[str, Any] = dict.fromkeys(SESSION_COLUMNS)
+    row.update(
+        session_id=events[0]["session_id"],
+        turns=0,
+        completed=0,
+        timed_out=0,
+        stt_count=0,
+        stt_decode_seconds=0.0,
+        affinity=0,
+        trust=0,
+    )
+    turns: list[tuple] = []
+    affinity = trust = 0
+    for event in events:
+        kind = event.get("event")
+        if row["started_at"] is None:
+            row["started_at"] = event.get("ts", 0) - (event.get("t") or 0)
+        row["duration"] = max(row["duration"] or 0.0, event.get("t") or 0.0)
+        if kind == "start":
+            row.update(
+                scenario=event.get("scenario"),
+                api_choice=event.get("api_choice"),
+                time_limit=event.get("time_limit"),
+            )
+        elif kind == "turn":
+            row["turns"] += 1
+            new_affinity = event.get("affinity", affinity)
+            new_trust = event.get("trust", trust)
+            turns.append(
+                (
+                    row["session_id"],
+                    row["turns"],
+                    event.get("t"),
+                    event.get("stage"),
+                    event.get("branch"),
+                    None if event.get("recovered") is None else int(event["recovered"]),
+                    new_affinity - affinity,
+                    new_trust - trust,
+                )
+            )
+            affinity, trust = new_affinity, new_trust
+            if event.get("stage"):
+                row["last_stage"] = event["stage"]
+            row.update(
+                affinity=affinity,
+                trust=trust,
+                completed=int(bool(event.get("completed"))),
+                final_rank=event.get("final_rank") or row["final_rank"],
+            )
+        elif kind == "timeout":
+            row.update(timed_out=1, completed=1, timeout_stage=event.get("stage"))
+        elif kind == "stt":
+            row["stt_count"] += 1
+            row["stt_decode_seconds"] += event.get("decode_seconds") or 0.0
+        elif kind == "end":
+            row.update(
+                completed=1,
+                final_rank=event.get("final_rank"),
+                affinity=event.get("affinity", affinity),
+                trust=event.get("trust", trust),
+                eval_score=_eval_score(event.get("eval_score")),
+                eval_seconds=event.get("eval_seconds"),
+                degraded=event.get("degraded"),
+            )
+    row["rank_score"] = RANK_SCORES.get(row["final_rank"])
+    return row, turns
+
+
+def write_batch(conn: sqlite3.Connection, summaries: list[Summary]) -> None:
+    """Upserts a batch of sessions in one transaction, so re-ingesting a log is idempotent."""
+    insert_session = (
+        f"INSERT OR REPLACE INTO sessions ({', '.join(SESSION_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in SESSION_COLUMNS)})"
+    )
+    with conn:
+        conn.executemany(
+            insert_session,
+            [tuple(row[name] for name in SESSION_COLUMNS) for row, _ in summaries],
+        )
+        conn.executemany(
+            "DELETE FROM turns WHERE session_id = ?",
+            [(row["session_id"],) for row, _ in summaries],
+        )
+        conn.executemany(
+            "INSERT INTO turns VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [turn for _, turns in summaries for turn in turns],
+        )
+
+
+def ingest(
+    conn: sqlite3.Connection, paths: list[Path], batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    sessions = group_sessions(read_events(paths))
+    batch: list[Summary] = []
+    for events in sessions.values():
+        batch.append(summarize(events))
+        if len(batch) >= batch_size:
+            write_batch(conn, batch)
+            batch = []
+    if batch:
+        write_batch(conn, batch)
+    return len(sessions)
+
+
+class AnalyticsWriter:
+    """Collects live session events and writes each finished session in batches off-thread."""
+
+    def __init__(self, path: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=50000)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "AnalyticsWriter | None":
+        load_env()
+        path = os.getenv("ANALYTICS_DB", "").strip()
+        if not path:
+            return None
+        return cls(Path(path), int(os.getenv("ANALYTICS_BATCH_SIZE", DEFAULT_BATCH_SIZE)))
+
+    def observe(self, record: dict[str, Any]) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="analytics", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        conn = connect(self.path)
+        open_sessions: dict[str, list[dict[str, Any]]] = {}
+        finished: list[Summary] = []
+        last_flush = last_sweep = time.monotonic()
+        while True:
+            try:
+                record = self._queue.get(timeout=FLUSH_INTERVAL_SECONDS)
+            except queue.Empty:
+                record = None
+            if record is not None:
+                events = open_sessions.setdefault(record["session_id"], [])
+                events.append(record)
+                if record["event"] == "end":
+                    finished.append(summarize(open_sessions.pop(record["session_id"])))
+            now = time.monotonic()
+            if len(finished) >= self.batch_size or (
+                finished and now - last_flush >= FLUSH_INTERVAL_SECONDS
+            ):
+                write_batch(conn, finished)
+                finished = []
+                last_flush = now
+            if now - last_sweep >= FLUSH_INTERVAL_SECONDS:
+                # 끝나지 않고 버려진 세션도 이탈 분석을 위해 기록. 이벤트가 계속 들어와
+                # 큐가 비지 않아도 주기적으로 확인함
+                last_sweep = now
+                cutoff = time.time() - ABANDON_AFTER_SECONDS
+                stale = [
+                    key for key, events in open_sessions.items() if events[-1]["ts"] < cutoff
+                ]
+                if stale:
+                    write_batch(conn, [summarize(open_sessions.pop(key)) for key in stale])
+
+
+def _rows(conn: sqlite3.Connection, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
+    return conn.execute(sql, tuple(params)).fetchall()
+
+
+def report_funnel(conn: sqlite3.Connection) -> list[str]:
+    total = _rows(conn, "SELECT COUNT(*) FROM sessions")[0][0]
+    lines = [
+        f"{'step':<14}{'sessions':>10}{'share':>9}",
+        f"{'started':<14}{total:>10}{_share(total, total):>9}",
+    ]
+    for stage, count in _rows(
+        conn,
+        "SELECT stage, COUNT(DISTINCT session_id) FROM turns WHERE stage IS NOT NULL "
+        "GROUP BY stage ORDER BY stage",
+    ):
+        lines.append(f"{stage:<14}{count:>10}{_share(count, total):>9}")
+    for label, where in (
+        ("finished", "completed = 1 AND timed_out = 0"),
+        ("timed out", "timed_out = 1"),
+        ("abandoned", "completed = 0"),
+    ):
+        count = _rows(conn, f"SELECT COUNT(*) FROM sessions WHERE {where}")[0][0]
+        lines.append(f"{label:<14}{count:>10}{_share(count, total):>9}")
+    return lines
+
+
+def report_branches(conn: sqlite3.Connection) -> list[str]:
+    lines = [f"{'stage':<10}{'branch':<8}{'hits':>8}{'rate':>9}{'affinity':>10}{'trust':>8}"]
+    for stage, branch, hits, stage_hits, affinity, trust in _rows(
+        conn,
+        "SELECT stage, COALESCE(branch, 'recovery'), COUNT(*), "
+        "SUM(COUNT(*)) OVER (PARTITION BY stage), AVG(affinity_delta), AVG(trust_delta) "
+        "FROM turns WHERE stage IS NOT NULL GROUP BY stage, branch ORDER BY stage, branch",
+    ):
+        lines.append(
+            f"{stage:<10}{branch:<8}{hits:>8}{_share(hits, stage_hits):>9}"
+            f"{affinity:>10.1f}{trust:>8.1f}"
+        )
+    return lines
+
+
+def report_timeouts(conn: sqlite3.Connection) -> list[str]:
+    lines = [f"{'stage':<10}{'timeouts':>10}{'share':>9}{'avg turns':>11}"]
+    total = _rows(conn, "SELECT COUNT(*) FROM sessions WHERE timed_out = 1")[0][0]
+    for stage, count, turns in _rows(
+        conn,
+        "SELECT COALESCE(timeout_stage, '?'), COUNT(*), AVG(turns) FROM sessions "
+        "WHERE timed_out = 1 GROUP BY timeout_stage ORDER BY timeout_stage",
+    ):
+        lines.append(f"{stage:<10}{count:>10}{_share(count, total):>9}{turns:>11.1f}")
+    return lines
+
+
+def report_ranks(conn: sqlite3.Connection) -> list[str]:
+    lines = [f"{'rank':<6}{'sessions':>10}{'affinity':>10}{'trust':>8}{'eval':>7}"]
+    for rank, count, affinity, trust, score in _rows(
+        conn,
+        "SELECT final_rank, COUNT(*), AVG(affinity), AVG(trust), AVG(eval_score) FROM sessions "
+        "WHERE final_rank IS NOT NULL GROUP BY final_rank ORDER BY MIN(rank_score) DESC",
+    ):
+        score_text = f"{score:.2f}" if score is not None else "-"
+        lines.append(f"{rank:<6}{count:>10}{affinity:>10.1f}{trust:>8.1f}{score_text:>7}")
+    for column in ("affinity", "trust"):
+        lines.append(f"corr(rank, {column}) = {_correlation(conn, 'rank_score', column)}")
+    return lines
+
+
+def report_histogram(conn: sqlite3.Connection, column: str, buckets: int) -> list[str]:
+    if column not in HISTOGRAM_COLUMNS:
+        raise SystemExit(
+            f"Histogram needs a numeric column, got {column!r}; "
+            f"choose one of: {', '.join(HISTOGRAM_COLUMNS)}"
+        )
+    low, high = _rows(conn, f"SELECT MIN({column}), MAX({column}) FROM sessions")[0]
+    if low is None:
+        return ["no data"]
+    width = (high - low) / buckets or 1
+    counts = dict(
+        _rows(
+            conn,
+            f"SELECT MIN(CAST(({column} - ?) / ? AS INTEGER), ?), COUNT(*) FROM sessions "
+            f"WHERE {column} IS NOT NULL GROUP BY 1",
+            (low, width, buckets - 1),
+        )
+    )
+    peak = max(counts.values())
+    lines = [f"{column} ({sum(counts.values())} sessions)"]
+    for index in range(buckets):
+        count = counts.get(index, 0)
+        start = low + index * width
+        lines.append(f"{start:>10.2f} | {'#' * round(40 * count / peak):<40} {count}")
+    return lines
+
+
+def _share(count: int, total: int) -> str:
+    return f"{100 * count / total:.1f}%" if total else "-"
+
+
+def _correlation(conn: sqlite3.Connection, x: str, y: str) -> str:
+    n, sx, sy, sxx, syy, sxy = _rows(
+        conn,
+        f"SELECT COUNT(*), SUM({x}), SUM({y}), SUM({x} * {x}), SUM({y} * {y}), SUM({x} * {y}) "
+        f"FROM sessions WHERE {x} IS NOT NULL AND {y} IS NOT NULL",
+    )[0]
+    if not n:
+        return "-"
+    denominator = ((n * sxx - sx * sx) * (n * syy - sy * sy)) ** 0.5
+    return f"{(n * sxy - sx * sy) / denominator:.3f}" if denominator else "-"
+
+
+REPORTS = {
+    "funnel": report_funnel,
+    "branches": report_branches,
+    "timeouts": report_timeouts,
+    "ranks": report_ranks,
+}
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Session analytics over a sqlite store.")
+    parser.add_argument(
+        "--db", type=Path, default=Path(os.getenv("ANALYTICS_DB") or DEFAULT_DB_PATH)
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest_parser = commands.add_parser("ingest", help="Load session logs into the store.")
+    ingest_parser.add_argument("paths", nargs="+", type=Path)
+    report_parser = commands.add_parser("report", help="Print a standard report.")
+    report_parser.add_argument("name", choices=(*REPORTS, "histogram"))
+    report_parser.add_argument(
+        "--column",
+        default="duration",
+        choices=HISTOGRAM_COLUMNS,
+        help="Numeric column for histogram.",
+    )
+    report_parser.add_argument("--buckets", type=int, default=10)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    conn = connect(args.db)
+    started = time.perf_counter()
+    if args.command == "ingest":
+        count = ingest(conn, args.paths)
+        print(f"Ingested {count} sessions into {args.db} in {time.perf_counter() - started:.2f}s")
+        return 0
+    if args.name == "histogram":
+        lines = report_histogram(conn, args.column, max(1, args.buckets))
+    else:
+        lines = REPORTS[args.name](conn)
+    print("\n".join(lines))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
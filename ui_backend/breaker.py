@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from curator_agent.env import load_env
+from ui_backend.metrics import REGISTRY
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_STATE = REGISTRY.callback_gauge(
+    "ui_breaker_state", "Circuit breaker state (0 closed, 1 half-open, 2 open).", ("name",)
+)
+BREAKER_TRANSITIONS = REGISTRY.counter(
+    "ui_breaker_transitions_total", "Circuit breaker state changes.", ("name", "state")
+)
+
+
+class CircuitBreaker:
+    """
+    연속 실패(타임아웃 포함)가 threshold번 쌓이면 열리고, cooldown이 지나면
+    시험 호출 하나만 통과시켜 성공하면 닫고 실패하면 다시 엽니다.
+    """
+
+    def __init__(self, name: str, threshold: int, cooldown_seconds: float) -> None:
+        self.name = name
+        self.threshold = max(1, threshold)
+        self.cooldown_seconds = max(0.0, cooldown_seconds)
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._cooled_down():
+                return HALF_OPEN
+            return self._state
+
+    def _cooled_down(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.cooldown_seconds
+
+    def _transition(self, state: str) -> None:
+        if state != self._state:
+            self._state = state
+            BREAKER_TRANSITIONS.labels(self.name, state).inc()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if not self._cooled_down():
+                    return False
+                self._transition(HALF_OPEN)
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def release(self) -> None:
+        """Gives back an allowed call that never reached the provider (e.g. shed by admission)."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+
+class BreakerSet:
+    """Lazily created breaker per key (one per evaluator provider)."""
+
+    def __init__(self, prefix: str, threshold: int, cooldown_seconds: float) -> None:
+        self.prefix = prefix
+        self.threshold = threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        BREAKER_STATE.add_callback(self._states)
+
+    @classmethod
+    def from_env(
+        cls, prefix: str, env_prefix: str, threshold: int, cooldown_seconds: float
+    ) -> "BreakerSet":
+        load_env()
+        return cls(
+            prefix,
+            int(os.getenv(f"{env_prefix}_BREAKER_FAILURES", threshold)),
+            float(os.getenv(f"{env_prefix}_BREAKER_COOLDOWN_SECONDS", cooldown_seconds)),
+        )
+
+    def get(self, key: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    f"{self.prefix}:{key}", self.threshold, self.cooldown_seconds
+                )
+                self._breakers[key] = breaker
+            return breaker
+
+    def _states(self) -> dict[tuple[str, ...], float]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {(breaker.name,): STATE_VALUES[breaker.state] for breaker in breakers}
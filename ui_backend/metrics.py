@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import itertools
+import math
+import threading
+import weakref
+from typing import Callable, Iterable
+
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+RATIO_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 4.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Every metric child keeps one cell per writing thread. A thread only ever
+# mutates its own cell, so the hot path takes no lock; the lock is only held
+# when a thread records into a child for the first time, while scraping
+# copies the cell list, and when a finished thread's cell is folded into the
+# child's retired total (ThreadingHTTPServer starts a thread per connection,
+# so cells must not outlive their threads).
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CellOwner:
+    """Lives in a thread-local slot; it is collected when its thread exits."""
+
+
+class _Sharded:
+    def __init__(self, width: int) -> None:
+        self._width = width
+        self._local = threading.local()
+        self._cells: dict[int, list[float]] = {}
+        self._retired = [0.0] * width
+        self._keys = itertools.count()
+        self._lock = threading.Lock()
+
+    def cell(self) -> list[float]:
+        try:
+            return self._local.cell
+        except AttributeError:
+            return self._new_cell()
+
+    def _new_cell(self) -> list[float]:
+        cell = [0.0] * self._width
+        owner = _CellOwner()
+        key = next(self._keys)
+        with self._lock:
+            self._cells[key] = cell
+        self._local.cell = cell
+        self._local.owner = owner
+        weakref.finalize(owner, self._retire, key)
+        return cell
+
+    def _retire(self, key: int) -> None:
+        with self._lock:
+            cell = self._cells.pop(key, None)
+            if cell is None:
+                return
+            for index, value in enumerate(cell):
+                self._retired[index] += value
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            cells = list(self._cells.values())
+            totals = list(self._retired)
+        for cell in cells:
+            for index, value in enumerate(cell):
+                totals[index] += value
+        return totals
+
+
+class CounterChild(_Sharded):
+    def __init__(self) -> None:
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.cell()[0] += amount
+
+    def value(self) -> float:
+        return self.totals()[0]
+
+
+class GaugeChild(CounterChild):
+    def dec(self, amount: float = 1.0) -> None:
+        self.cell()[0] -= amount
+
+
+class HistogramChild(_Sharded):
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        # Cell layout: one slot per bucket, then +Inf, sum.
+        super().__init__(len(buckets) + 2)
+        self._buckets = buckets
+
+    def observe(self, value: float) -> None:
+        cell = self.cell()
+        for index, bound in enumerate(self._buckets):
+            if value <= bound:
+                cell[index] += 1
+                break
+        else:
+            cell[len(self._buckets)] += 1
+        cell[-1] += value
+
+    def snapshot(self) -> tuple[list[float], float, float]:
+        totals = self.totals()
+        cumulative: list[float] = []
+        running = 0.0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-1], running
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str, **kwargs: str):
+        key = tuple(str(v) for v in values) or tuple(
+            str(kwargs[name]) for name in self.labelnames
+        )
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self) -> list[tuple[tuple[str, ...], object]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self._items():
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple[str, ...], child) -> list[str]:
+        labels = _format_labels(self.labelnames, values)
+        return [f"{self.name}{labels} {_format_value(child.value())}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose samples are computed at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        callback: Callable[[], dict[tuple[str, ...], float]] | None = None,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._callbacks: list[Callable[[], dict[tuple[str, ...], float]]] = []
+        if callback is not None:
+            self._callbacks.append(callback)
+
+    def add_callback(self, callback: Callable[[], dict[tuple[str, ...], float]]) -> None:
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            callbacks = list(self._callbacks)
+        samples: dict[tuple[str, ...], float] = {}
+        for callback in callbacks:
+            try:
+                samples.update(callback())
+            except Exception:
+                continue
+        for values, value in sorted(samples.items()):
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _render_child(self, values: tuple[str, ...], child) -> list[str]:
+        cumulative, total, count = child.snapshot()
+        lines = []
+        for bound, running in zip(self.buckets + (math.inf,), cumulative):
+            le = 'le="' + _format_value(bound) + '"'
+            labels = _format_labels(self.labelnames, values, le)
+            lines.append(f"{self.name}_bucket{labels} {_format_value(running)}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {_format_value(count)}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        if not metric.labelnames and not isinstance(metric, CallbackGauge):
+            metric.labels()
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def callback_gauge(
+        self, name: str, help_text: str, labelnames: Iterable[str] = ()
+    ) -> CallbackGauge:
+        return self.register(CallbackGauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from curator_agent.env import load_env
+
+
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_SAMPLE_INTERVAL_MS = 1.0
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                location = f"{Path(code.co_filename).name}:{code.co_firstlineno}"
+                stack.append(f"{code.co_name} ({location})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class RequestProfile:
+    def __init__(self, route: str, interval: float) -> None:
+        import cProfile
+
+        self.route = route
+        self.started = time.perf_counter()
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), interval)
+
+    def start(self) -> None:
+        self.sampler.start()
+        self.profile.enable()
+
+    def stop(self) -> float:
+        self.profile.disable()
+        self.sampler.stop()
+        return time.perf_counter() - self.started
+
+
+class Profiler:
+    """
+    요청 단위 CPU 프로파일러. 꺼져 있으면 요청마다 armed 속성 하나만 확인합니다.
+    켜지면 다음 N개 요청 또는 sample_rate 비율의 요청을 cProfile과 스택 샘플러로 기록하고,
+    요청마다 pstats 파일(.prof)과 플레임그래프용 collapsed 스택(.collapsed)을 남깁니다.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        sample_rate: float = 0.0,
+        remaining: int = 0,
+        routes: set[str] | None = None,
+        interval: float = DEFAULT_SAMPLE_INTERVAL_MS / 1000,
+    ) -> None:
+        self.directory = directory
+        self.sample_rate = max(0.0, min(sample_rate, 1.0))
+        self.remaining = max(0, remaining)
+        self.routes = routes or set()
+        self.interval = interval
+        self._lock = threading.Lock()
+        self.armed = self.sample_rate > 0 or self.remaining > 0
+
+    @classmethod
+    def from_env(cls) -> "Profiler":
+        load_env()
+        routes = {
+            route.strip() for route in os.getenv("PROFILE_ROUTES", "").split(",") if route.strip()
+        }
+        return cls(
+            Path(os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR)),
+            float(os.getenv("PROFILE_SAMPLE_RATE", "0") or 0),
+            int(os.getenv("PROFILE_NEXT_REQUESTS", "0") or 0),
+            routes,
+            float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", DEFAULT_SAMPLE_INTERVAL_MS)) / 1000,
+        )
+
+    def arm(self, requests: int, routes: set[str] | None = None) -> None:
+        with self._lock:
+            self.remaining = max(0, requests)
+            if routes is not None:
+                self.routes = routes
+            self.armed = self.sample_rate > 0 or self.remaining > 0
+
+    def status(self) -> dict:
+        return {
+            "armed": self.armed,
+            "remaining": self.remaining,
+            "sample_rate": self.sample_rate,
+            "routes": sorted(self.routes),
+            "directory": str(self.directory),
+        }
+
+    def start(self, route: str) -> RequestProfile | None:
+        if self.routes and route not in self.routes:
+            return None
+        with self._lock:
+            if self.remaining > 0:
+                self.remaining -= 1
+                self.armed = self.sample_rate > 0 or self.remaining > 0
+            elif random.random() >= self.sample_rate:
+                return None
+        profile = RequestProfile(route, self.interval)
+        try:
+            profile.start()
+        except ValueError:
+            # 다른 프로파일러가 이미 켜져 있는 경우 (Python 3.12+는 프로세스당 하나)
+            profile.sampler.stop()
+            return None
+        return profile
+
+    def finish(self, profile: RequestProfile, session_id: str | None, status: int) -> Path:
+        import pstats
+
+        seconds = profile.stop()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        route = _UNSAFE.sub("_", profile.route.strip("/")) or "root"
+        name = (
+            f"{stamp}-{route}-{_UNSAFE.sub('_', session_id or 'nosession')}"
+            f"-{status}-{seconds * 1000:.0f}ms-{threading.get_ident() % 100000:05d}"
+        )
+        pstats.Stats(profile.profile).dump_stats(self.directory / f"{name}.prof")
+        (self.directory / f"{name}.collapsed").write_text(
+            profile.sampler.collapsed(), encoding="utf-8"
+        )
+        return self.directory / name
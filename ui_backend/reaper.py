@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable
+
+from ui_backend.metrics import REGISTRY
+
+
+TIMEOUT = "timeout"
+EVICT = "evict"
+
+REAPER_PENDING = REGISTRY.callback_gauge(
+    "ui_reaper_pending", "Session deadlines waiting in the reaper heap."
+)
+
+
+class DeadlineReaper:
+    """
+    세션 마감 시각을 최소 힙에 모아 두고, 가장 이른 마감까지만 잠들었다가 때가 된 항목마다
+    callback(session_id, action)을 부르는 백그라운드 스레드입니다. 취소는 따로 하지 않으며,
+    callback이 세션 상태를 보고 이미 처리된 항목은 무시하거나 다시 예약합니다.
+    """
+
+    def __init__(self, callback: Callable[[str, str], None]) -> None:
+        self.callback = callback
+        self._heap: list[tuple[float, int, str, str]] = []
+        self._order = itertools.count()
+        self._wakeup = threading.Condition()
+        self._thread: threading.Thread | None = None
+        REAPER_PENDING.add_callback(lambda: {(): len(self._heap)})
+
+    def schedule(self, session_id: str, action: str, deadline: float) -> None:
+        """deadline은 time.monotonic() 기준 시각입니다."""
+        with self._wakeup:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="session-reaper", daemon=True
+                )
+                self._thread.start()
+            entry = (deadline, next(self._order), session_id, action)
+            heapq.heappush(self._heap, entry)
+            # 새 항목이 가장 이르면 잠든 스레드를 깨워 대기 시간을 다시 계산하게 함
+            if self._heap[0] is entry:
+                self._wakeup.notify()
+
+    def _due(self) -> list[tuple[str, str]]:
+        with self._wakeup:
+            while True:
+                now = time.monotonic()
+                if self._heap and self._heap[0][0] <= now:
+                    break
+                self._wakeup.wait(self._heap[0][0] - now if self._heap else None)
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                _, _, session_id, action = heapq.heappop(self._heap)
+                due.append((session_id, action))
+            return due
+
+    def _run(self) -> None:
+        while True:
+            for session_id, action in self._due():
+                try:
+                    self.callback(session_id, action)
+                except Exception:
+                    # 한 세션의 오류로 다른 세션의 마감 처리가 멈추지 않도록 함
+                    continue
+
+    def __len__(self) -> int:
+        return len(self._heap)
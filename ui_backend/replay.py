@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from curator_agent.engine import (
+    DEFAULT_TIME_LIMIT_SECONDS,
+    SessionState,
+    apply_turn,
+    expire_session,
+)
+from curator_agent.scenarios import get_scenario
+from ui_backend.session_log import group_sessions, read_events
+
+
+TURN_FIELDS = ("stage", "branch", "recovered", "affinity", "trust", "completed", "final_rank")
+
+
+def _init_worker(evaluator: str) -> None:
+    # 셸에서 물려받은 EVALUATOR_BACKEND가 --evaluator 선택을 덮지 않도록 매번 명시적으로 지정
+    os.environ["EVALUATOR_BACKEND"] = "stub" if evaluator == "stub" else "live"
+
+
+def _evaluate(session: SessionState) -> float:
+    from evaluator_agent.runner import run_evaluation
+    from evaluator_agent.scenarios import build_eval_prompt
+
+    prompt = build_eval_prompt("standup", session.transcript)
+    started = time.perf_counter()
+    asyncio.run(run_evaluation(prompt, provider=session.api_choice))
+    return time.perf_counter() - started
+
+
+def replay_session(
+    events: list[dict[str, Any]], evaluator: str = "none", speed: float = 0.0
+) -> dict[str, Any]:
+    """Re-drives one logged session through the engine and reports where it diverges."""
+    scenario = get_scenario()
+    start = next((event for event in events if event["event"] == "start"), {})
+    session = SessionState(
+        session_id=events[0]["session_id"],
+        scenario_key=start.get("scenario", scenario.key),
+        time_limit_seconds=start.get("time_limit", DEFAULT_TIME_LIMIT_SECONDS),
+        api_choice=start.get("api_choice", "gemini"),
+    )
+    mismatches: list[dict[str, Any]] = []
+    turns = 0
+    eval_seconds = None
+    last_t = 0.0
+    started = time.perf_counter()
+    for event in events:
+        kind = event["event"]
+        if speed > 0 and event.get("t") is not None:
+            time.sleep(max(0.0, event["t"] - last_t) / speed)
+            last_t = event["t"]
+        if kind == "turn":
+            turns += 1
+            turn = apply_turn(session, scenario, event.get("text", ""))
+            replayed = {
+                "stage": turn.stage_key,
+                "branch": turn.branch_key,
+                "recovered": turn.recovered,
+                "affinity": session.affinity,
+                "trust": session.trust,
+                "completed": session.completed,
+                "final_rank": session.final_rank,
+            }
+            for name in TURN_FIELDS:
+                if name in event and event[name] != replayed[name]:
+                    mismatches.append(
+                        {
+                            "turn": turns,
+                            "field": name,
+                            "logged": event[name],
+                            "replayed": replayed[name],
+                        }
+                    )
+        elif kind == "timeout":
+            expire_session(session, scenario)
+        elif kind == "end" and evaluator != "none":
+            eval_seconds = _evaluate(session)
+    return {
+        "session_id": session.session_id,
+        "turns": turns,
+        "logged_seconds": max((event.get("t") or 0.0) for event in events),
+        "replay_seconds": time.perf_counter() - started,
+        "eval_seconds": eval_seconds,
+        "mismatches": mismatches,
+    }
+
+
+def _replay(args: tuple[list[dict[str, Any]], str, float]) -> dict[str, Any]:
+    return replay_session(*args)
+
+
+def run(
+    paths: list[Path], workers: int, evaluator: str, speed: float, limit: int | None
+) -> dict[str, Any]:
+    sessions = list(group_sessions(read_events(paths)).values())
+    if limit:
+        sessions = sessions[:limit]
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(evaluator,)
+    ) as pool:
+        jobs = ((events, evaluator, speed) for events in sessions)
+        results = list(pool.map(_replay, jobs, chunksize=max(1, len(sessions) // (workers * 8))))
+    elapsed = time.perf_counter() - started
+    logged = sum(result["logged_seconds"] for result in results)
+    diverged = [result for result in results if result["mismatches"]]
+    return {
+        "sessions": len(results),
+        "turns": sum(result["turns"] for result in results),
+        "workers": workers,
+        "evaluator": evaluator,
+        "elapsed_seconds": round(elapsed, 3),
+        "sessions_per_second": round(len(results) / elapsed, 1) if elapsed else None,
+        "speedup_vs_logged": round(logged / elapsed, 1) if elapsed else None,
+        "diverged_sessions": len(diverged),
+        "divergences": [
+            {"session_id": result["session_id"], "mismatches": result["mismatches"]}
+            for result in diverged[:50]
+        ],
+    }
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay logged sessions through the engine.")
+    parser.add_argument("paths", nargs="+", type=Path, help="Session log files or directories.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--evaluator", choices=("none", "stub", "live"), default="none")
+    parser.add_argument(
+        "--speed", type=float, default=0.0, help="Replay at N x real time (0 = no waiting)."
+    )
+    parser.add_argument("--limit", type=int, help="Replay only the first N sessions.")
+    parser.add_argument("--output", help="Write the JSON report to this path.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    report = run(args.paths, max(1, args.workers), args.evaluator, args.speed, args.limit)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 1 if report["diverged_sessions"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
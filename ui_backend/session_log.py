@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+from curator_agent.env import load_env
+
+
+LOG_PREFIX = "sessions"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_BUFFER_SIZE = 50000
+FLUSH_INTERVAL_SECONDS = 1.0
+
+
+class SessionLog:
+    """Append-only JSONL log of session events, written and rotated off-thread."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=buffer_size)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SessionLog | None":
+        load_env()
+        directory = os.getenv("SESSION_LOG_DIR", "").strip()
+        if not directory:
+            return None
+        return cls(
+            Path(directory),
+            int(os.getenv("SESSION_LOG_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            int(os.getenv("SESSION_LOG_BUFFER_SIZE", DEFAULT_BUFFER_SIZE)),
+        )
+
+    @property
+    def active_path(self) -> Path:
+        return self.directory / f"{LOG_PREFIX}.jsonl"
+
+    def write(self, record: dict[str, Any]) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="session-log", daemon=True)
+            self._thread.start()
+
+    def _rotate(self) -> None:
+        # 파일 이름 순서가 곧 기록 순서가 되도록 같은 초 안에서는 일련번호를 붙임
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        suffix = 0
+        while True:
+            target = self.directory / f"{LOG_PREFIX}-{stamp}-{suffix:03d}.jsonl"
+            if not target.exists():
+                break
+            suffix += 1
+        self.active_path.rename(target)
+
+    def _run(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        handle = self.active_path.open("a", encoding="utf-8", buffering=1 << 16)
+        try:
+            while True:
+                try:
+                    batch = [self._queue.get(timeout=FLUSH_INTERVAL_SECONDS)]
+                except queue.Empty:
+                    continue
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                for record in batch:
+                    handle.write(json.dumps(record, default=str, separators=(",", ":")))
+                    handle.write("\n")
+                if self.dropped:
+                    handle.write(json.dumps({"event": "dropped", "count": self.dropped}) + "\n")
+                    self.dropped = 0
+                handle.flush()
+                if handle.tell() >= self.max_bytes:
+                    handle.close()
+                    self._rotate()
+                    handle = self.active_path.open("a", encoding="utf-8", buffering=1 << 16)
+        finally:
+            handle.close()
+
+
+def log_files(paths: list[Path]) -> list[Path]:
+    """Expands directories to their session logs, oldest rotation first."""
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            rotated = sorted(path.glob(f"{LOG_PREFIX}-*.jsonl"))
+            files.extend(rotated)
+            if (path / f"{LOG_PREFIX}.jsonl").exists():
+                files.append(path / f"{LOG_PREFIX}.jsonl")
+        else:
+            files.append(path)
+    return files
+
+
+def read_events(paths: list[Path]) -> Iterator[dict[str, Any]]:
+    for path in log_files(paths):
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 마지막 줄이 쓰는 도중에 잘린 경우
+                    continue
+                if record.get("session_id"):
+                    yield record
+
+
+def group_sessions(events: Iterator[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    sessions: dict[str, list[dict[str, Any]]] = {}
+    for record in events:
+        sessions.setdefault(record["session_id"], []).append(record)
+    return sessions
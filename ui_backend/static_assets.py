@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+HASHED_SUFFIXES = {".js", ".css"}
+MIN_COMPRESS_BYTES = 256
+ENCODING_PREFERENCE = ("br", "gzip")
+_REF_PATTERN = re.compile(r'(src|href)="([^"#?:]+)"')
+
+
+@dataclass(frozen=True)
+class Variant:
+    body: bytes
+    etag: str
+    encoding: str | None
+
+
+@dataclass(frozen=True)
+class Asset:
+    content_type: str
+    cache_control: str
+    variants: dict[str, Variant]
+
+    def select(self, accept_encoding: str | None) -> Variant:
+        accepted = _parse_accept_encoding(accept_encoding)
+        for encoding in ENCODING_PREFERENCE:
+            if encoding in accepted and encoding in self.variants:
+                return self.variants[encoding]
+        return self.variants["identity"]
+
+
+def _parse_accept_encoding(header: str | None) -> set[str]:
+    if not header:
+        return set()
+    accepted: set[str] = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def _brotli_compress(data: bytes) -> bytes | None:
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(data, quality=11)
+
+
+def _content_type(path: Path) -> str:
+    guessed, _ = mimetypes.guess_type(path.name)
+    content_type = guessed or "application/octet-stream"
+    if content_type.startswith("text/") or content_type == "application/javascript":
+        content_type += "; charset=utf-8"
+    return content_type
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.startswith("text/") or content_type.startswith(
+        ("application/javascript", "application/json", "image/svg+xml")
+    )
+
+
+def _build_asset(body: bytes, content_type: str, cache_control: str) -> Asset:
+    digest = hashlib.sha256(body).hexdigest()[:20]
+    variants = {"identity": Variant(body, f'"{digest}"', None)}
+    if _is_compressible(content_type) and len(body) >= MIN_COMPRESS_BYTES:
+        gz = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(gz) < len(body):
+            variants["gzip"] = Variant(gz, f'"{digest}-gz"', "gzip")
+        br = _brotli_compress(body)
+        if br is not None and len(br) < len(body):
+            variants["br"] = Variant(br, f'"{digest}-br"', "br")
+    return Asset(content_type=content_type, cache_control=cache_control, variants=variants)
+
+
+def _hashed_name(rel_path: str, body: bytes) -> str:
+    stem, dot, suffix = rel_path.rpartition(".")
+    digest = hashlib.sha256(body).hexdigest()[:10]
+    return f"{stem}.{digest}{dot}{suffix}"
+
+
+def _scan(root: Path) -> dict[str, Path]:
+    files: dict[str, Path] = {}
+    for path in sorted(root.rglob("*")):
+        if not path.is_file():
+            continue
+        rel = path.relative_to(root).as_posix()
+        if any(part.startswith(".") for part in rel.split("/")):
+            continue
+        files[rel] = path
+    return files
+
+
+def _snapshot(files: dict[str, Path]) -> dict[str, tuple[int, int]]:
+    stamps: dict[str, tuple[int, int]] = {}
+    for rel, path in files.items():
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        stamps[rel] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+def load_assets(root: Path) -> dict[str, Asset]:
+    files = _scan(root)
+    raw = {rel: path.read_bytes() for rel, path in files.items()}
+
+    hashed: dict[str, str] = {}
+    for rel, body in raw.items():
+        if Path(rel).suffix in HASHED_SUFFIXES:
+            hashed[rel] = _hashed_name(rel, body)
+
+    def rewrite(match: re.Match[str]) -> str:
+        # "./app.js"와 "/app.js"는 같은 파일. lstrip은 ".env", "../x"의 점까지 지우므로 쓰지 않음
+        target = match.group(2)
+        target = target[1:] if target.startswith("/") else target.removeprefix("./")
+        if target in hashed:
+            return f'{match.group(1)}="{hashed[target]}"'
+        return match.group(0)
+
+    assets: dict[str, Asset] = {}
+    for rel, body in raw.items():
+        path = files[rel]
+        content_type = _content_type(path)
+        if path.suffix == ".html":
+            body = _REF_PATTERN.sub(rewrite, body.decode("utf-8")).encode("utf-8")
+        asset = _build_asset(body, content_type, REVALIDATE_CACHE_CONTROL)
+        assets["/" + rel] = asset
+        if rel in hashed:
+            assets["/" + hashed[rel]] = _build_asset(
+                body, content_type, IMMUTABLE_CACHE_CONTROL
+            )
+    if "/index.html" in assets:
+        assets["/"] = assets["/index.html"]
+    return assets
+
+
+class StaticAssets:
+    """In-memory copy of the UI directory with precompressed variants."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._assets = load_assets(root)
+        self._stamps = _snapshot(_scan(root))
+        self._watcher: threading.Thread | None = None
+
+    def get(self, path: str) -> Asset | None:
+        return self._assets.get(path.split("?", 1)[0])
+
+    def reload(self) -> bool:
+        stamps = _snapshot(_scan(self.root))
+        if stamps == self._stamps:
+            return False
+        self._assets = load_assets(self.root)
+        self._stamps = stamps
+        return True
+
+    def start_watcher(self, interval_seconds: float = 1.0) -> None:
+        if self._watcher is not None:
+            return
+
+        def watch() -> None:
+            stop = threading.Event()
+            while not stop.wait(interval_seconds):
+                try:
+                    if self.reload():
+                        print("UI assets reloaded.")
+                except OSError:
+                    continue
+
+        self._watcher = threading.Thread(target=watch, name="ui-asset-watcher", daemon=True)
+        self._watcher.start()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def reload_enabled() -> bool:
+    return os.getenv("UI_STATIC_RELOAD", "").strip().lower() in {"1", "true", "yes", "y"}
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+from typing import Any, Iterator
+
+from curator_agent.env import load_env
+
+
+DEFAULT_TRACE_PATH = "traces.jsonl"
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_BUFFER_SIZE = 10000
+FLUSH_INTERVAL_SECONDS = 0.5
+
+
+class _DiscardAttrs(dict):
+    def __setitem__(self, key: str, value: Any) -> None:
+        return
+
+
+_NULL_SPAN = contextlib.nullcontext(_DiscardAttrs())
+
+
+class Trace:
+    __slots__ = ("trace_id", "name", "attrs", "spans", "_wall_start", "_start", "_exporter")
+
+    sampled = True
+
+    def __init__(self, name: str, exporter: "JsonlExporter", attrs: dict[str, Any]) -> None:
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attrs = attrs
+        self.spans: list[dict[str, Any]] = []
+        self._wall_start = time.time()
+        self._start = time.perf_counter()
+        self._exporter = exporter
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def event(self, name: str, **attrs: Any) -> None:
+        offset = time.perf_counter() - self._start
+        self.spans.append(
+            {"name": name, "offset_ms": round(offset * 1000, 3), "duration_ms": 0.0, **attrs}
+        )
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[dict[str, Any]]:
+        record: dict[str, Any] = {"name": name, **attrs}
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as exc:
+            record["error"] = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            ended = time.perf_counter()
+            record["offset_ms"] = round((started - self._start) * 1000, 3)
+            record["duration_ms"] = round((ended - started) * 1000, 3)
+            self.spans.append(record)
+
+    def record_exception(self, exc: BaseException, **attrs: Any) -> None:
+        self.event(
+            "exception",
+            error=f"{type(exc).__name__}: {exc}",
+            traceback="".join(traceback.format_exception(exc)),
+            **attrs,
+        )
+
+    def finish(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+        self._exporter.export(
+            {
+                "trace_id": self.trace_id,
+                "name": self.name,
+                "start": round(self._wall_start, 6),
+                "duration_ms": round((time.perf_counter() - self._start) * 1000, 3),
+                "attrs": self.attrs,
+                "spans": self.spans,
+            }
+        )
+
+
+class _NoopTrace:
+    __slots__ = ()
+
+    sampled = False
+    trace_id = None
+
+    def set(self, **attrs: Any) -> None:
+        return
+
+    def event(self, name: str, **attrs: Any) -> None:
+        return
+
+    def span(self, name: str, **attrs: Any) -> contextlib.nullcontext:
+        return _NULL_SPAN
+
+    def record_exception(self, exc: BaseException, **attrs: Any) -> None:
+        return
+
+    def finish(self, **attrs: Any) -> None:
+        return
+
+
+NOOP_TRACE = _NoopTrace()
+
+
+class JsonlExporter:
+    """Buffers finished traces and appends them to a JSONL file off-thread."""
+
+    def __init__(self, path: Path, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        self.path = path
+        self.dropped = 0
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=buffer_size)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def export(self, record: dict[str, Any]) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8", buffering=1 << 16) as handle:
+            while True:
+                try:
+                    batch = [self._queue.get(timeout=FLUSH_INTERVAL_SECONDS)]
+                except queue.Empty:
+                    continue
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                for record in batch:
+                    handle.write(json.dumps(record, default=str, separators=(",", ":")))
+                    handle.write("\n")
+                if self.dropped:
+                    handle.write(json.dumps({"dropped_traces": self.dropped}) + "\n")
+                    self.dropped = 0
+                handle.flush()
+
+
+class Tracer:
+    def __init__(self, mode: str, sample_rate: float, exporter: JsonlExporter | None) -> None:
+        self.mode = mode if exporter is not None else "off"
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        load_env()
+        mode = os.getenv("TRACE_MODE", "off").strip().lower()
+        if mode not in {"off", "sampled", "full"}:
+            mode = "off"
+        try:
+            sample_rate = float(os.getenv("TRACE_SAMPLE_RATE", DEFAULT_SAMPLE_RATE))
+        except ValueError:
+            sample_rate = DEFAULT_SAMPLE_RATE
+        exporter = None
+        if mode != "off":
+            exporter = JsonlExporter(
+                Path(os.getenv("TRACE_PATH", DEFAULT_TRACE_PATH)),
+                int(os.getenv("TRACE_BUFFER_SIZE", DEFAULT_BUFFER_SIZE)),
+            )
+        return cls(mode, max(0.0, min(sample_rate, 1.0)), exporter)
+
+    def start(self, name: str, **attrs: Any) -> Trace | _NoopTrace:
+        if self.mode == "off":
+            return NOOP_TRACE
+        if self.mode == "sampled" and random.random() >= self.sample_rate:
+            return NOOP_TRACE
+        return Trace(name, self.exporter, attrs)
+
+
+TRACER = Tracer.from_env()
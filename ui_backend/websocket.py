@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import select
+import socket
+import struct
+import threading
+from typing import Any
+
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_MESSAGE_BYTES = 8 * 1024 * 1024
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+CLOSE_NORMAL = 1000
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_TOO_BIG = 1009
+
+
+class WebSocketClosed(ConnectionError):
+    pass
+
+
+def accept_key(client_key: str) -> str:
+    digest = hashlib.sha1((client_key.strip() + GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def encode_frame(opcode: int, payload: bytes) -> bytes:
+    header = bytearray([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header.append(length)
+    elif length < 1 << 16:
+        header.append(126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(127)
+        header += struct.pack("!Q", length)
+    return bytes(header) + payload
+
+
+def _unmask(payload: bytes, mask: bytes) -> bytes:
+    if not payload:
+        return payload
+    repeated = (mask * (len(payload) // 4 + 1))[: len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(
+        len(payload), "big"
+    )
+
+
+class WebSocketConnection:
+    """Server side of one RFC 6455 connection on an upgraded HTTP socket."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.closed = False
+        self._buffer = bytearray()
+        self._send_lock = threading.Lock()
+
+    def _recv_exact(self, count: int) -> bytes:
+        while len(self._buffer) < count:
+            chunk = self.sock.recv(max(65536, count - len(self._buffer)))
+            if not chunk:
+                raise WebSocketClosed("Peer closed the connection.")
+            self._buffer += chunk
+        data = bytes(self._buffer[:count])
+        del self._buffer[:count]
+        return data
+
+    def _read_frame(self) -> tuple[bool, int, bytes]:
+        first, second = self._recv_exact(2)
+        fin = bool(first & 0x80)
+        opcode = first & 0x0F
+        masked = bool(second & 0x80)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", self._recv_exact(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", self._recv_exact(8))
+        if not masked:
+            self.close(CLOSE_PROTOCOL_ERROR)
+            raise WebSocketClosed("Client frames must be masked.")
+        if length > MAX_MESSAGE_BYTES:
+            self.close(CLOSE_TOO_BIG)
+            raise WebSocketClosed("Message too large.")
+        mask = self._recv_exact(4)
+        return fin, opcode, _unmask(self._recv_exact(length), mask)
+
+    def wait_readable(self, timeout: float) -> bool:
+        if self._buffer:
+            return True
+        ready, _, _ = select.select([self.sock], [], [], timeout)
+        return bool(ready)
+
+    def receive(self) -> tuple[int, bytes]:
+        """Returns the next complete text or binary message, answering pings."""
+        message_opcode = None
+        parts: list[bytes] = []
+        size = 0
+        while True:
+            fin, opcode, payload = self._read_frame()
+            if opcode == OP_PING:
+                self._send(OP_PONG, payload)
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                self.close(CLOSE_NORMAL)
+                raise WebSocketClosed("Peer sent close.")
+            if opcode in (OP_TEXT, OP_BINARY):
+                message_opcode = opcode
+                parts = []
+                size = 0
+            elif opcode != OP_CONTINUATION or message_opcode is None:
+                self.close(CLOSE_PROTOCOL_ERROR)
+                raise WebSocketClosed(f"Unexpected opcode {opcode}.")
+            parts.append(payload)
+            size += len(payload)
+            if size > MAX_MESSAGE_BYTES:
+                self.close(CLOSE_TOO_BIG)
+                raise WebSocketClosed("Message too large.")
+            if fin:
+                return message_opcode, b"".join(parts)
+
+    def _send(self, opcode: int, payload: bytes) -> None:
+        if self.closed and opcode != OP_CLOSE:
+            raise WebSocketClosed("Connection is closed.")
+        frame = encode_frame(opcode, payload)
+        with self._send_lock:
+            try:
+                self.sock.sendall(frame)
+            except OSError as exc:
+                self.closed = True
+                raise WebSocketClosed(str(exc)) from exc
+
+    def send_json(self, payload: dict[str, Any]) -> None:
+        self._send(OP_TEXT, json.dumps(payload).encode("utf-8"))
+
+    def send_binary(self, payload: bytes) -> None:
+        self._send(OP_BINARY, payload)
+
+    def close(self, code: int = CLOSE_NORMAL) -> None:
+        if self.closed:
+            return
+        try:
+            self._send(OP_CLOSE, struct.pack("!H", code))
+        except WebSocketClosed:
+            pass
+        self.closed = True
+
+
+class ChannelRegistry:
+    """Open channels by session id, so other threads can push to a player."""
+
+    def __init__(self) -> None:
+        self._channels: dict[str, WebSocketConnection] = {}
+        self._lock = threading.Lock()
+
+    def add(self, session_id: str, connection: WebSocketConnection) -> None:
+        with self._lock:
+            previous = self._channels.get(session_id)
+            self._channels[session_id] = connection
+        if previous is not None and previous is not connection:
+            previous.close()
+
+    def remove(self, session_id: str, connection: WebSocketConnection) -> None:
+        with self._lock:
+            if self._channels.get(session_id) is connection:
+                del self._channels[session_id]
+
+    def get(self, session_id: str) -> WebSocketConnection | None:
+        return self._channels.get(session_id)
+
+    def push(self, session_id: str, payload: dict[str, Any]) -> bool:
+        connection = self.get(session_id)
+        if connection is None:
+            return False
+        try:
+            connection.send_json(payload)
+        except WebSocketClosed:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._channels)
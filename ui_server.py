@@ -1,49 +1,300 @@
 from __future__ import annotations
 
-import asyncio
 import base64
+import hmac
 import json
 import os
 import re
+import threading
 import time
 import uuid
-from dataclasses import dataclass, field
-from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
 
+from curator_agent.engine import (
+    DEFAULT_TIME_LIMIT_SECONDS,
+    SessionState,
+    StandupScenario,
+    apply_turn,
+    build_stage_payload,
+    expire_session,
+    next_stage_payload,
+    remaining_seconds,
+    session_timed_out,
+)
+from curator_agent.env import load_env
+from curator_agent.npc import NpcReplies, npc_llm_enabled
 from curator_agent.scenarios import Branch, Stage, get_scenario
-from curator_agent.voice_input import transcribe_audio_bytes
-from evaluator_agent.agent_executor import build_message as build_eval_message
-from evaluator_agent.agent_executor import build_runtime as build_eval_runtime
+from curator_agent.speculation import PreparedReply, Speculation, speculate
+from curator_agent.stt_tier import TierSelector
+from curator_agent.voice_cache import VoiceCache, split_lines, voice_cache_dir
+from evaluator_agent.incremental import IncrementalEvaluation, incremental_enabled
+from evaluator_agent.runner import evaluator_backend, local_evaluation, run_evaluation
 from evaluator_agent.scenarios import build_eval_prompt
-from dotenv import load_dotenv
+from ui_backend.admission import AdmissionController, Overloaded
+from ui_backend.analytics import AnalyticsWriter
+from ui_backend.breaker import BreakerSet
+from ui_backend.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from ui_backend.metrics import RATIO_BUCKETS, REGISTRY
+from ui_backend.profiling import Profiler
+from ui_backend.reaper import EVICT, TIMEOUT, DeadlineReaper
+from ui_backend.session_log import SessionLog
+from ui_backend.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    StaticAssets,
+    etag_matches,
+    reload_enabled,
+)
+from ui_backend.tracing import NOOP_TRACE, TRACER, Trace
+from ui_backend.websocket import (
+    OP_TEXT,
+    ChannelRegistry,
+    WebSocketClosed,
+    WebSocketConnection,
+    accept_key,
+)
 
 
-DEFAULT_TIME_LIMIT_SECONDS = 240
+DEFAULT_SESSION_RETENTION_SECONDS = 900
 UI_DIR = Path(__file__).parent / "UI"
+WS_POLL_SECONDS = 1.0
+VOICE_ROUTES = {"/api/voice", "/api/voice_turn"}
 
-load_dotenv()
+load_env()
 
 
-@dataclass
-class SessionState:
-    session_id: str
-    scenario_key: str
-    stage_index: int = 0
-    affinity: int = 0
-    trust: int = 0
-    final_rank: str | None = None
-    completed: bool = False
-    recovery_pending: bool = False
-    last_branch: Branch | None = None
-    transcript: list[str] = field(default_factory=list)
-    start_time: float = field(default_factory=time.monotonic)
-    time_limit_seconds: int = DEFAULT_TIME_LIMIT_SECONDS
-    api_choice: str = "gemini"
+SESSIONS: dict[str, SessionState] = {}
+STATIC_ASSETS: StaticAssets | None = None
+VOICE_CACHE: VoiceCache | None = None
+CHANNELS = ChannelRegistry()
+SESSION_LOG = SessionLog.from_env()
+ANALYTICS = AnalyticsWriter.from_env()
+PROFILER = Profiler.from_env()
 
+REQUEST_LATENCY = REGISTRY.histogram(
+    "ui_request_duration_seconds", "API request latency by route.", ("route",)
+)
+REQUESTS_TOTAL = REGISTRY.counter(
+    "ui_requests_total", "API requests by route and response status.", ("route", "status")
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "ui_requests_in_flight", "API requests currently being handled.", ("route",)
+)
+WORK_IN_FLIGHT = REGISTRY.gauge(
+    "ui_work_in_flight", "STT decodes and evaluations currently running.", ("stage",)
+)
+EVALUATOR_LATENCY = REGISTRY.histogram(
+    "ui_evaluator_duration_seconds",
+    "Evaluator call latency by provider and outcome.",
+    ("provider", "outcome"),
+)
+STT_DECODE_SECONDS = REGISTRY.histogram(
+    "ui_stt_decode_seconds", "Speech-to-text decode time per clip."
+)
+STT_REAL_TIME_FACTOR = REGISTRY.histogram(
+    "ui_stt_real_time_factor", "STT decode time divided by clip duration.", buckets=RATIO_BUCKETS
+)
+EVALUATION_FALLBACKS = REGISTRY.counter(
+    "ui_evaluation_fallbacks_total",
+    "Evaluations answered with the provisional local score, by reason.",
+    ("reason",),
+)
+STT_TIER_TOTAL = REGISTRY.counter(
+    "ui_stt_tier_total",
+    "STT decodes by Whisper model tier and why it was chosen.",
+    ("tier", "reason"),
+)
+NPC_FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    "ui_npc_first_token_seconds", "Time to first streamed token of an LLM NPC reply."
+)
+NPC_REPLIES_TOTAL = REGISTRY.counter(
+    "ui_npc_replies_total", "NPC replies by source (llm, cache, script).", ("source",)
+)
+NPC_FALLBACKS = REGISTRY.counter(
+    "ui_npc_fallbacks_total", "LLM NPC replies replaced by the scripted line.", ("reason",)
+)
+SESSION_TIMEOUTS = REGISTRY.counter(
+    "ui_session_timeouts_total", "Sessions that ran out of time, by stage.", ("stage",)
+)
+SESSIONS_EVICTED = REGISTRY.counter(
+    "ui_sessions_evicted_total", "Sessions released from memory after going idle."
+)
+DUPLICATE_TURNS = REGISTRY.counter(
+    "ui_duplicate_turns_total",
+    "Turn submissions answered without replaying the turn.",
+    ("outcome",),
+)
+SPECULATIONS = REGISTRY.counter(
+    "ui_speculations_total",
+    "Branch predictions from partial transcripts by outcome.",
+    ("outcome",),
+)
+SESSION_COUNT = REGISTRY.callback_gauge(
+    "ui_sessions", "Sessions held in memory by state.", ("state",)
+)
+CHANNEL_COUNT = REGISTRY.callback_gauge(
+    "ui_websocket_channels", "Open WebSocket conversation channels."
+)
+CHANNEL_COUNT.add_callback(lambda: {(): len(CHANNELS)})
 
-SESSIONS: dict[str, SessionState] = {}
+
+def _session_counts() -> dict[tuple[str, ...], float]:
+    sessions = list(SESSIONS.values())
+    finished = sum(1 for session in sessions if session.completed)
+    return {("live",): len(sessions) - finished, ("finished",): finished}
+
+
+SESSION_COUNT.add_callback(_session_counts)
+
+REQUEST_ADMISSION = AdmissionController.from_env("request", "UI", limit=64, queue_timeout=2.0)
+STT_ADMISSION = AdmissionController.from_env("stt", "STT", limit=2, queue_timeout=5.0)
+EVAL_ADMISSION = AdmissionController.from_env("evaluation", "EVAL", limit=4, queue_timeout=5.0)
+SPECULATION_ADMISSION = AdmissionController.from_env(
+    "speculation", "SPEC", limit=4, queue_timeout=0.0
+)
+EVAL_BREAKERS = BreakerSet.from_env("evaluator", "EVAL", threshold=3, cooldown_seconds=30.0)
+DEFAULT_EVAL_DEADLINE_SECONDS = 20.0
+API_CHOICES = ("gemini", "openai")
+_TIMEOUT_LOCK = threading.Lock()
+STT_TIERS = TierSelector.from_env()
+NPC_REPLIES = NpcReplies.from_env() if npc_llm_enabled() else None
+
+
+def _session_retention_seconds() -> int:
+    return int(os.getenv("UI_SESSION_RETENTION_SECONDS", DEFAULT_SESSION_RETENTION_SECONDS))
+
+
+def _evict_idle(session_id: str) -> None:
+    session = SESSIONS.get(session_id)
+    if session is None:
+        return
+    retention = _session_retention_seconds()
+    idle_limit = retention if session.completed else retention + session.time_limit_seconds
+    idle_until = session.last_activity + idle_limit
+    if time.monotonic() < idle_until:
+        # 그 사이 활동이 있었으면 마지막 활동 기준으로 다시 예약
+        REAPER.schedule(session_id, EVICT, idle_until)
+        return
+    if SESSIONS.pop(session_id, None) is not None:
+        SESSIONS_EVICTED.inc()
+
+
+def _turn_seq(payload: dict[str, Any]) -> int | None:
+    value = payload.get("turn_seq")
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        turn_seq = int(value)
+    except (TypeError, ValueError):
+        return None
+    return turn_seq if turn_seq > 0 else None
+
+
+def _claim_timeout(session: SessionState) -> bool:
+    """타임아웃 마무리를 맡을 쪽(리퍼 또는 요청) 하나만 True를 받습니다."""
+    with _TIMEOUT_LOCK:
+        if session.completed or session.outcome is not None:
+            return False
+        session.outcome = Future()
+        return True
+
+
+def _log_session(event: str, session: SessionState, **fields: Any) -> None:
+    if SESSION_LOG is None and ANALYTICS is None:
+        return
+    record = {
+        "event": event,
+        "session_id": session.session_id,
+        "ts": round(time.time(), 3),
+        "t": round(time.monotonic() - session.start_time, 3),
+        **fields,
+    }
+    if SESSION_LOG is not None:
+        SESSION_LOG.write(record)
+    if ANALYTICS is not None:
+        ANALYTICS.observe(record)
+
+
+def _sarah_audio(text: str | None) -> list[str]:
+    if VOICE_CACHE is None or not text:
+        return []
+    hashes = VOICE_CACHE.hashes_for(text)
+    # LLM이 만든 대사처럼 미리 합성하지 않은 줄이 있으면 브라우저 음성으로 전체를 읽음
+    return hashes if len(hashes) == len(split_lines(text)) else []
+
+
+def _prefetch_audio(session: SessionState, scenario: StandupScenario) -> list[str]:
+    """다음에 들을 수 있는 사라의 대사 오디오 해시 (현재 단계의 모든 분기)."""
+    if VOICE_CACHE is None or session.completed:
+        return []
+    if session.stage_index >= len(scenario.stages):
+        return []
+    return VOICE_CACHE.prefetch_for(scenario.stages[session.stage_index].key)
+
+
+def _speculative_audio(scenario: StandupScenario, stage_index: int, branch: Branch) -> list[str]:
+    """
+    예측한 분기 다음에 들을 수 있는 사라의 대사 오디오 해시. 현재 단계의 대사는 지난 턴의
+    prefetch_audio로 이미 받았으므로, 분기가 다음 단계로 넘어가면 그 단계의 대사를 더합니다.
+    """
+    if VOICE_CACHE is None:
+        return []
+    hashes = VOICE_CACHE.hashes_for(branch.response)
+    recovery = scenario.stages[stage_index].recovery
+    offers_recovery = recovery is not None and recovery.should_offer(branch)
+    next_index = stage_index + 1
+    if not offers_recovery and not branch.ends_conversation and next_index < len(scenario.stages):
+        for digest in VOICE_CACHE.prefetch_for(scenario.stages[next_index].key):
+            if digest not in hashes:
+                hashes.append(digest)
+    return hashes
+
+
+def _prepare_reply(
+    session: SessionState,
+    scenario: StandupScenario,
+    stage: Stage,
+    branch: Branch,
+    partial_text: str,
+) -> PreparedReply | None:
+    """
+    예측한 분기의 사라 대사를 미리 만듭니다. NPC_LLM이 꺼져 있으면 대본 대사입니다.
+    LLM 호출은 SPECULATION_ADMISSION 슬롯 안에서만 하며, 슬롯이 없으면 기다리지 않고 None입니다.
+    """
+    prepared = PreparedReply()
+    if NPC_REPLIES is None:
+        prepared.finish(branch.response)
+        return prepared
+    try:
+        admitted_at = SPECULATION_ADMISSION.acquire()
+    except Overloaded:
+        return None
+
+    def run() -> None:
+        try:
+            result = NPC_REPLIES.reply(
+                scenario,
+                stage,
+                branch,
+                partial_text,
+                session.api_choice,
+                prepared.push,
+                prepared.cancelled,
+            )
+        except Exception:
+            prepared.finish(None)
+            return
+        finally:
+            SPECULATION_ADMISSION.release(admitted_at)
+        # 대본 대사로 대체됐으면 예측을 쓰지 않고 턴에서 평소대로 다시 시도
+        prepared.finish(result.text if result.source != "script" else None)
+
+    threading.Thread(target=run, name="npc-speculation", daemon=True).start()
+    return prepared
 
 
 def _get_time_limit(value: Any) -> int:
@@ -54,75 +305,76 @@ def _get_time_limit(value: Any) -> int:
     return max(30, min(limit, 600))
 
 
-def _build_stage_payload(stage: Stage, index: int, total: int) -> dict[str, Any]:
-    return {
-        "key": stage.key,
-        "title": stage.title,
-        "prompt": stage.prompt,
-        "index": index + 1,
-        "total": total,
-    }
+def _get_api_choice(value: Any) -> str:
+    """평가 제공자는 openai와 gemini만 받으며 그 외 값은 gemini로 처리합니다 (지표 라벨로도 쓰임)."""
+    choice = value.strip().lower() if isinstance(value, str) else ""
+    return choice if choice in API_CHOICES else "gemini"
+
+
+def _eval_prompt(session: SessionState) -> str:
+    """단계별 요약이 있으면 요약과 마지막 단계만, 없으면 전체 대화로 평가 프롬프트를 만듭니다."""
+    transcript = session.transcript
+    if session.incremental is not None:
+        return session.incremental.final_prompt(transcript)
+    return build_eval_prompt("standup", transcript)
 
 
-def _session_timeout(session: SessionState) -> bool:
-    return time.monotonic() - session.start_time >= session.time_limit_seconds
+def _evaluator_provider(api_choice: str) -> str:
+    """지표 라벨과 차단기 키로 쓰는 평가 제공자 이름입니다."""
+    return "stub" if evaluator_backend() == "stub" else api_choice
 
 
-async def _run_evaluator(transcript: list[str], api_choice: str = "gemini") -> str:
+async def _run_evaluator(eval_prompt: str, api_choice: str = "gemini") -> str:
     """
-    대화 기록을 평가하여 피드백 텍스트를 반환합니다.
+    평가 프롬프트를 실행하여 피드백 텍스트를 반환합니다.
     api_choice에 따라 Gemini 또는 OpenAI를 사용합니다.
     """
-    if api_choice == "openai":
-        # OpenAI 사용 (LiteLLM)
-        import litellm
-        import os
-        from dotenv import load_dotenv
-        from evaluator_agent.agent import EVALUATOR_PROMPT
-        
-        load_dotenv()
-        openai_key = os.getenv("OPENAI_API_KEY")
-        if not openai_key:
-            raise RuntimeError("Missing OPENAI_API_KEY environment variable.")
-        
-        # 평가 프롬프트 구성
-        eval_prompt_content = build_eval_prompt("standup", transcript)
-        
-        messages = [
-            {"role": "system", "content": EVALUATOR_PROMPT},
-            {"role": "user", "content": eval_prompt_content}
-        ]
-        
-        # LiteLLM으로 OpenAI 호출
-        response = await litellm.acompletion(
-            model="gpt-4",
-            messages=messages,
-            api_key=openai_key
-        )
-        
-        return response['choices'][0]['message']['content']
-    
-    else:
-        # Gemini 사용 (기존 ADK 로직)
-        eval_runner, eval_session = await build_eval_runtime(api_choice="gemini")
-        eval_prompt = build_eval_prompt("standup", transcript)
-        events = eval_runner.run_async(
-            user_id=eval_session.user_id,
-            session_id=eval_session.id,
-            new_message=build_eval_message(eval_prompt),
-        )
-        chunks: list[str] = []
-        async for event in events:
-            content = getattr(event, "content", None)
-            if not content or not getattr(content, "parts", None):
-                continue
-            if getattr(event, "author", "") == "user":
-                continue
-            text = "".join(part.text or "" for part in content.parts)
-            if text:
-                chunks.append(text)
-        await eval_runner.close()
-        return "".join(chunks)
+    provider = _evaluator_provider(api_choice)
+    in_flight = WORK_IN_FLIGHT.labels("evaluation")
+    in_flight.inc()
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        result = await run_evaluation(eval_prompt, provider=api_choice)
+        outcome = "ok"
+        return result
+    finally:
+        in_flight.dec()
+        EVALUATOR_LATENCY.labels(provider, outcome).observe(time.perf_counter() - started)
+
+
+def _eval_deadline() -> float:
+    return float(os.getenv("EVAL_DEADLINE_SECONDS", DEFAULT_EVAL_DEADLINE_SECONDS))
+
+
+def _start_evaluation(session: SessionState, deadline: float) -> Future:
+    """
+    평가를 별도 스레드에서 시작합니다. 호출자는 마감 시간까지만 기다리고,
+    마감을 넘긴 호출은 결과를 버린 채 백그라운드에서 정리됩니다.
+    """
+    future: Future = Future()
+    started = time.monotonic()
+
+    def run() -> None:
+        import asyncio
+
+        try:
+            # 진행 중인 단계 요약을 기다리는 동안 평가 슬롯을 잡고 있지 않도록 먼저 만듦
+            eval_prompt = _eval_prompt(session)
+            with EVAL_ADMISSION.slot():
+                remaining = max(0.0, deadline - (time.monotonic() - started))
+                eval_text = asyncio.run(
+                    asyncio.wait_for(
+                        _run_evaluator(eval_prompt, api_choice=session.api_choice), remaining
+                    )
+                )
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(eval_text)
+
+    threading.Thread(target=run, name="evaluator", daemon=True).start()
+    return future
 
 
 def _calculate_score(final_rank: str | None) -> str:
@@ -156,70 +408,374 @@ def _extract_score(text: str) -> tuple[int, int] | None:
     return int(match.group(1)), int(match.group(2))
 
 
-class UIRequestHandler(SimpleHTTPRequestHandler):
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, directory=str(UI_DIR), **kwargs)
+def _rank_from_evaluation(eval_text: str | None) -> str | None:
+    if not eval_text:
+        return None
+    score_data = _extract_score(eval_text)
+    if not score_data:
+        return None
+    score_value, score_max = score_data
+    if score_max == 25:
+        return _score_to_rank(score_value)
+    if score_max == 5:
+        return _score_to_rank(score_value * 5)
+    return None
+
+
+def _evaluate_session(
+    session: SessionState, reason: str, trace: Trace
+) -> tuple[str | None, str | None]:
+    """
+    평가를 실행하고 (평가 텍스트, 대체 사유)를 반환합니다.
+    EVAL_DEADLINE_SECONDS 안에 끝나지 않거나, 제공자의 차단기가 열려 있거나,
+    평가 슬롯을 얻지 못하거나, 호출이 실패하면 로컬 점수로 대체합니다 (잠정 평가).
+    """
+    if session.turn_count == 0:
+        # 한 마디도 하지 않고 떠난 세션에는 평가 모델을 부르지 않음
+        return _local_evaluation(session, "no_turns")
+    breaker = EVAL_BREAKERS.get(_evaluator_provider(session.api_choice))
+    deadline = _eval_deadline()
+    with trace.span(
+        "evaluator",
+        provider=session.api_choice,
+        reason=reason,
+        turns=session.turn_count,
+        deadline=deadline,
+    ) as span:
+        if not breaker.allow():
+            span["breaker"] = "open"
+            return _local_evaluation(session, "breaker_open")
+        try:
+            eval_text = _start_evaluation(session, deadline).result(timeout=deadline)
+        except Overloaded as exc:
+            breaker.release()
+            span["shed"] = exc.reason
+            return _local_evaluation(session, "shed")
+        except (FutureTimeout, TimeoutError):
+            breaker.record_failure()
+            span["error"] = "deadline exceeded"
+            return _local_evaluation(session, "deadline")
+        except Exception as exc:
+            breaker.record_failure()
+            span["error"] = f"{type(exc).__name__}: {exc}"
+            trace.record_exception(exc)
+            return _local_evaluation(session, "error")
+        breaker.record_success()
+        if session.incremental is not None:
+            span["summarized_stages"] = len(session.incremental.stages)
+        span["result_chars"] = len(eval_text or "")
+    rank_from_score = _rank_from_evaluation(eval_text)
+    if rank_from_score:
+        session.final_rank = rank_from_score
+    return eval_text, None
+
+
+def _local_evaluation(session: SessionState, fallback: str) -> tuple[str, str]:
+    EVALUATION_FALLBACKS.labels(fallback).inc()
+    eval_text = local_evaluation(session.final_rank, session.affinity, session.trust)
+    if session.final_rank is None:
+        session.final_rank = _rank_from_evaluation(eval_text)
+    return eval_text, fallback
+
+
+def _expire(session: SessionState, scenario: StandupScenario, trace: Trace) -> dict[str, Any]:
+    stage = expire_session(session, scenario)
+    SESSION_TIMEOUTS.labels(stage.key).inc()
+    _log_session("timeout", session, stage=stage.key)
+    trace.set(timed_out=True, timeout_stage=stage.key)
+    response = {
+        "completed": True,
+        "timed_out": True,
+        "sarah": scenario.fail_message,
+        "sarah_audio": _sarah_audio(scenario.fail_message),
+        "system": "Time ran out. Sarah leaves her seat to head to the next meeting.",
+        "final_rank": session.final_rank,
+        "score": _calculate_score(session.final_rank),
+        "evaluation": None,
+        "degraded": None,
+    }
+    return response
+
+
+def _finalize_timeout(session: SessionState, trace: Trace) -> None:
+    """
+    _claim_timeout을 얻은 쪽이 부릅니다. 타임아웃을 기록하고 평가까지 마친 응답으로
+    session.outcome을 채우며, WebSocket이 열려 있으면 timeout과 evaluation을 푸시합니다.
+    """
+    outcome = session.outcome
+    try:
+        response = _expire(session, get_scenario(), trace)
+        CHANNELS.push(
+            session.session_id, {"type": "timeout", **response, "evaluation_pending": True}
+        )
+        # 타임아웃 시에도 평가 실행
+        evaluation = _evaluation_payload(session, "timeout", trace)
+        CHANNELS.push(session.session_id, {"type": "evaluation", **evaluation})
+        response.update(evaluation)
+    except BaseException as exc:
+        outcome.set_exception(exc)
+        raise
+    outcome.set_result(response)
+
+
+def _store_evaluation(
+    session: SessionState, turn_seq: int | None, evaluation: dict[str, Any]
+) -> None:
+    """
+    평가를 따로 보낸 턴의 저장된 응답에 평가 결과를 합칩니다. 평가가 끝난 뒤 같은 turn_seq로
+    재전송하면(/api/message 포함) evaluation_pending 대신 평가까지 받게 됩니다.
+    """
+    if turn_seq is None:
+        return
+    with session.lock:
+        last = session.last_turn
+        if last is not None and last[0] == turn_seq:
+            response = {**last[2], **evaluation}
+            response.pop("evaluation_pending", None)
+            session.last_turn = (turn_seq, last[1], response)
+
+
+def _evaluation_payload(session: SessionState, reason: str, trace: Trace) -> dict[str, Any]:
+    started = time.perf_counter()
+    eval_text, fallback = _evaluate_session(session, reason, trace)
+    # 끝난 세션은 단계별 요약 상태를 더 들고 있을 필요가 없음
+    session.incremental = None
+    degraded = "local_score" if fallback else None
+    if session.final_rank is None:
+        session.final_rank = "B"
+    score = _extract_score(eval_text or "")
+    _log_session(
+        "end",
+        session,
+        reason=reason,
+        final_rank=session.final_rank,
+        affinity=session.affinity,
+        trust=session.trust,
+        eval_score=f"{score[0]}/{score[1]}" if score else None,
+        eval_seconds=round(time.perf_counter() - started, 3),
+        degraded=degraded,
+        fallback=fallback,
+        evaluation=eval_text,
+    )
+    return {
+        "evaluation": eval_text,
+        "evaluation_provisional": fallback is not None,
+        "fallback_reason": fallback,
+        "degraded": degraded,
+        "final_rank": session.final_rank,
+        "score": _calculate_score(session.final_rank),
+    }
+
+
+class UIRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    GET_ROUTES = {
+        "/api/config": "_handle_config",
+        "/api/metrics": "_handle_metrics",
+    }
+    POST_ROUTES = {
+        "/api/start": "_handle_start",
+        "/api/message": "_handle_message",
+        "/api/voice": "_handle_voice",
+        "/api/voice_turn": "_handle_voice_turn",
+        "/api/admin/profile": "_handle_admin_profile",
+    }
+
+    _trace = NOOP_TRACE
+    _session_id: str | None = None
+    # 마지막 _play_turn이 타임아웃 마무리(푸시 포함)를 직접 했는지
+    _finalized_timeout = False
 
     def log_message(self, format: str, *args: Any) -> None:
         return
 
-    def _json_response(self, payload: dict[str, Any], status: int = 200) -> None:
-        data = json.dumps(payload).encode("utf-8")
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(data)))
-        self.end_headers()
+    def send_response(self, code: int, message: str | None = None) -> None:
+        self._status = code
+        super().send_response(code, message)
+
+    def _dispatch(
+        self,
+        route: str,
+        handler: Callable[[], None],
+        admission: AdmissionController | None = None,
+    ) -> None:
+        self._status = 0
+        self._session_id = None
+        self._trace = TRACER.start(route)
+        profile = PROFILER.start(route) if PROFILER.armed else None
+        in_flight = REQUESTS_IN_FLIGHT.labels(route)
+        in_flight.inc()
+        started = time.perf_counter()
+        admitted_at = None
         try:
-            self.wfile.write(data)
-        except (BrokenPipeError, ConnectionResetError):
-            return
+            if admission is not None:
+                try:
+                    admitted_at = admission.acquire()
+                except Overloaded as exc:
+                    # The request body was never read, so the connection
+                    # cannot be reused for another request.
+                    self.close_connection = True
+                    self._overloaded_response(
+                        exc, status=429, degraded="chat" if route in VOICE_ROUTES else None
+                    )
+                    return
+            handler()
+        except Exception as exc:
+            self._trace.record_exception(exc)
+            raise
+        finally:
+            if admitted_at is not None:
+                admission.release(admitted_at)
+            in_flight.dec()
+            REQUEST_LATENCY.labels(route).observe(time.perf_counter() - started)
+            REQUESTS_TOTAL.labels(route, str(self._status)).inc()
+            self._trace.finish(status=self._status)
+            self._trace = NOOP_TRACE
+            if profile is not None:
+                PROFILER.finish(profile, self._session_id, self._status)
+
+    def _json_response(
+        self,
+        payload: dict[str, Any],
+        status: int = 200,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        with self._trace.span("response.write", status=status):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            if self._trace.trace_id:
+                self.send_header("X-Trace-Id", self._trace.trace_id)
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                return
 
     def _read_body(self) -> dict[str, Any]:
-        length = int(self.headers.get("Content-Length", "0"))
-        if length <= 0:
-            return {}
-        raw = self.rfile.read(length)
-        try:
-            return json.loads(raw.decode("utf-8"))
-        except json.JSONDecodeError:
-            return {}
+        with self._trace.span("request.parse") as span:
+            length = int(self.headers.get("Content-Length", "0"))
+            span["bytes"] = length
+            if length <= 0:
+                return {}
+            raw = self.rfile.read(length)
+            try:
+                payload = json.loads(raw.decode("utf-8"))
+            except json.JSONDecodeError:
+                span["error"] = "invalid json"
+                return {}
+            if isinstance(payload, dict) and isinstance(payload.get("session_id"), str):
+                self._session_id = payload["session_id"]
+            return payload
+
+    def _overloaded_response(
+        self, exc: Overloaded, status: int, degraded: str | None
+    ) -> None:
+        self._trace.set(shed=exc.resource, shed_reason=exc.reason)
+        self._json_response(
+            {
+                "error": "The server is busy. Please try again shortly.",
+                "overloaded": exc.resource,
+                "retry_after": exc.retry_after,
+                "degraded": degraded,
+            },
+            status=status,
+            headers={"Retry-After": str(exc.retry_after)},
+        )
 
     def do_GET(self) -> None:
-        if self.path == "/api/config":
-            self._handle_config()
+        route = urlsplit(self.path).path
+        if route == "/api/ws":
+            self._handle_ws()
+            return
+        handler = self.GET_ROUTES.get(route)
+        if handler:
+            self._dispatch(route, getattr(self, handler))
+            return
+        if route.startswith("/api/tts/"):
+            self._dispatch("/api/tts", self._handle_tts)
             return
         if self.path.startswith("/api/"):
             self._json_response({"error": "Not found"}, status=404)
             return
-        super().do_GET()
+        self._serve_static()
 
-    def do_POST(self) -> None:
-        if self.path == "/api/start":
-            self._handle_start()
+    def do_HEAD(self) -> None:
+        if self.path.startswith("/api/"):
+            self.send_error(405)
             return
-        if self.path == "/api/message":
-            self._handle_message()
+        self._serve_static(head_only=True)
+
+    def _serve_static(self, head_only: bool = False) -> None:
+        asset = STATIC_ASSETS.get(self.path) if STATIC_ASSETS else None
+        if asset is None:
+            self.send_error(404)
             return
-        if self.path == "/api/voice":
-            self._handle_voice()
+        variant = asset.select(self.headers.get("Accept-Encoding"))
+        not_modified = etag_matches(self.headers.get("If-None-Match"), variant.etag)
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", variant.etag)
+        self.send_header("Cache-Control", asset.cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", asset.content_type)
+        if variant.encoding:
+            self.send_header("Content-Encoding", variant.encoding)
+        self.send_header("Content-Length", str(len(variant.body)))
+        self.end_headers()
+        if head_only:
+            return
+        try:
+            self.wfile.write(variant.body)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def do_POST(self) -> None:
+        route = urlsplit(self.path).path
+        handler = self.POST_ROUTES.get(route)
+        if handler:
+            self._dispatch(route, getattr(self, handler), admission=REQUEST_ADMISSION)
             return
+        self.close_connection = True
         self._json_response({"error": "Not found"}, status=404)
 
     def _handle_start(self) -> None:
         try:
             payload = self._read_body()
-            print(f"DEBUG: Start request payload: {payload}")
             scenario = get_scenario()
-            print(f"DEBUG: Scenario loaded: {scenario.title}")
             session_id = uuid.uuid4().hex
+            self._session_id = session_id
             time_limit = _get_time_limit(payload.get("timeout_seconds"))
             session = SessionState(
                 session_id=session_id,
                 scenario_key=scenario.key,
                 time_limit_seconds=time_limit,
-                api_choice=payload.get("api_choice", "gemini"),
+                api_choice=_get_api_choice(payload.get("api_choice")),
             )
+            if incremental_enabled():
+                session.incremental = IncrementalEvaluation(
+                    provider=session.api_choice,
+                    breaker=EVAL_BREAKERS.get(_evaluator_provider(session.api_choice)),
+                    deadline_seconds=_eval_deadline(),
+                )
             SESSIONS[session_id] = session
+            REAPER.schedule(session_id, TIMEOUT, session.start_time + time_limit)
+            REAPER.schedule(
+                session_id, EVICT, session.last_activity + time_limit + _session_retention_seconds()
+            )
+            _log_session(
+                "start",
+                session,
+                scenario=scenario.key,
+                time_limit=time_limit,
+                api_choice=session.api_choice,
+            )
+            self._trace.set(session_id=session_id, api_choice=session.api_choice)
             stage = scenario.stages[0]
             self._json_response(
                 {
@@ -230,238 +786,682 @@ class UIRequestHandler(SimpleHTTPRequestHandler):
                         "npc_state": scenario.npc_state,
                         "items": scenario.items,
                     },
-                    "stage": _build_stage_payload(stage, 0, len(scenario.stages)),
+                    "stage": build_stage_payload(stage, 0, len(scenario.stages)),
+                    "prefetch_audio": _prefetch_audio(session, scenario),
                     "record_seconds_default": int(os.getenv("UI_RECORD_SECONDS", "5")),
                 }
             )
         except Exception as e:
-            print(f"DEBUG: Failed to start session: {e}")
-            import traceback
-            traceback.print_exc()
+            self._trace.record_exception(e)
             self._json_response({"error": str(e)}, status=500)
 
     def _handle_message(self) -> None:
         payload = self._read_body()
         session_id = payload.get("session_id")
         text = str(payload.get("text", "")).strip()
-        if not session_id or session_id not in SESSIONS:
+        session = SESSIONS.get(session_id) if session_id else None
+        if session is None:
             self._json_response({"error": "Invalid session"}, status=400)
             return
-        session = SESSIONS[session_id]
+        response, status = self._submit_turn(
+            session, _turn_seq(payload), lambda: self._play_turn(session, text)
+        )
+        self._json_response(response, status=status)
+
+    def _submit_turn(
+        self,
+        session: SessionState,
+        turn_seq: int | None,
+        run: Callable[[], tuple[dict[str, Any], int] | None],
+    ) -> tuple[dict[str, Any], int] | None:
+        """
+        세션 잠금 안에서 run()으로 턴을 진행해 같은 세션의 턴이 순서대로 하나씩 적용되게 합니다.
+        turn_seq가 마지막으로 처리한 번호와 같으면(재전송) 다시 계산하지 않고 저장해 둔 응답을,
+        더 작으면 409를 반환합니다. run이 None을 반환하면 응답을 이미 보낸 것입니다.
+        """
+        waited = time.perf_counter()
+        with session.lock:
+            self._trace.set(lock_wait_ms=round((time.perf_counter() - waited) * 1000, 1))
+            if turn_seq is not None and turn_seq <= session.turn_seq:
+                self._trace.set(turn_seq=turn_seq, last_turn_seq=session.turn_seq)
+                last = session.last_turn
+                if last is not None and last[0] == turn_seq:
+                    DUPLICATE_TURNS.labels("replayed").inc()
+                    return {**last[2], "duplicate": True}, last[1]
+                DUPLICATE_TURNS.labels("stale").inc()
+                return {"error": "Stale turn", "turn_seq": session.turn_seq}, 409
+            result = run()
+            if turn_seq is not None and result is not None and result[1] < 500:
+                session.turn_seq = turn_seq
+                session.last_turn = (turn_seq, result[1], result[0])
+            return result
+
+    def _npc_reply(
+        self,
+        session: SessionState,
+        scenario: StandupScenario,
+        on_token: Callable[[str], None] | None,
+    ) -> Callable[[Any, Any, str], str]:
+        def reply(stage: Any, branch: Any, text: str) -> str:
+            with self._trace.span("npc.reply", branch=branch.key) as span:
+                result = NPC_REPLIES.reply(
+                    scenario, stage, branch, text, session.api_choice, on_token
+                )
+                span["source"] = result.source
+                if result.first_token_seconds is not None:
+                    span["first_token_seconds"] = round(result.first_token_seconds, 3)
+                    NPC_FIRST_TOKEN_SECONDS.observe(result.first_token_seconds)
+                if result.fallback_reason:
+                    span["fallback"] = result.fallback_reason
+                    NPC_FALLBACKS.labels(result.fallback_reason).inc()
+            NPC_REPLIES_TOTAL.labels(result.source).inc()
+            self._trace.set(npc_source=result.source)
+            return result.text
+
+        return reply
+
+    def _speculative_reply(
+        self,
+        speculation: Speculation,
+        fallback: Callable[[Any, Any, str], str] | None,
+        on_token: Callable[[str], None] | None,
+    ) -> Callable[[Any, Any, str], str]:
+        """
+        최종 분기가 예측과 같으면 미리 만들고 있는 대사를 토큰 단위로 이어서 보내고, 다르거나
+        첫 토큰이 NPC_FIRST_TOKEN_SECONDS 안에 오지 않으면 평소대로 만듭니다.
+        """
+        first_wait = reply_wait = 0.0
+        if NPC_REPLIES is not None:
+            first_wait, reply_wait = NPC_REPLIES.first_token_seconds, NPC_REPLIES.reply_seconds
+
+        def reply(stage: Any, branch: Any, text: str) -> str:
+            sarah = speculation.resolve(stage, branch, on_token, first_wait, reply_wait)
+            if sarah is None:
+                return fallback(stage, branch, text) if fallback else branch.response
+            return sarah
+
+        return reply
+
+    def _play_turn(
+        self,
+        session: SessionState,
+        text: str,
+        defer_evaluation: bool = False,
+        on_token: Callable[[str], None] | None = None,
+    ) -> tuple[dict[str, Any], int]:
+        """
+        한 턴을 진행하고 (응답 payload, HTTP 상태)를 반환합니다.
+        defer_evaluation이면 평가는 호출자가 _evaluation_payload로 따로 보냅니다.
+        on_token은 NPC_LLM 모드에서 사라의 대사가 스트리밍될 때 토큰마다 호출됩니다.
+        이 요청이 타임아웃을 직접 마무리했으면 self._finalized_timeout이 True가 됩니다.
+        """
+        session.last_activity = time.monotonic()
         scenario = get_scenario()
+        self._trace.set(session_id=session.session_id, stage_index=session.stage_index)
+
+        self._finalized_timeout = False
+        if session.outcome is None and session_timed_out(session) and _claim_timeout(session):
+            # 리퍼보다 요청이 먼저 도착했으면 이 요청에서 마무리
+            _finalize_timeout(session, self._trace)
+            self._finalized_timeout = True
+        if session.outcome is not None:
+            self._trace.set(timed_out=True, outcome_ready=session.outcome.done())
+            try:
+                return dict(session.outcome.result(timeout=_eval_deadline())), 200
+            except Exception as exc:
+                self._trace.record_exception(exc)
 
         if session.completed:
-            self._json_response(
+            return (
                 {
                     "completed": True,
                     "final_rank": session.final_rank,
                     "score": _calculate_score(session.final_rank),
                     "system": "The session has already ended.",
-                }
+                },
+                200,
+            )
+
+        if not text:
+            return {"error": "Empty input"}, 400
+
+        self._trace.set(recovery_pending=session.recovery_pending)
+        stage_index = session.stage_index
+        reply = None
+        if NPC_REPLIES is not None:
+            reply = self._npc_reply(session, scenario, on_token)
+        speculation = session.speculation
+        session.speculation = None
+        if speculation is not None:
+            if speculation.valid_for(session):
+                reply = self._speculative_reply(speculation, reply, on_token)
+            else:
+                speculation.reply.cancel()
+                SPECULATIONS.labels("stale").inc()
+                speculation = None
+        with self._trace.span("branch.match") as span:
+            turn = apply_turn(session, scenario, text, reply=reply)
+            span["stage"] = turn.stage_key
+            span["branch"] = turn.branch_key
+            span["recovered"] = turn.recovered
+            if turn.match is not None:
+                span["match"] = turn.match.method
+                span["keyword"] = turn.match.keyword
+                span["distance"] = turn.match.distance
+        if speculation is not None:
+            if not speculation.committed:
+                speculation.reply.cancel()
+            outcome = "committed" if speculation.committed else "discarded"
+            SPECULATIONS.labels(outcome).inc()
+            self._trace.set(
+                speculation=outcome,
+                speculation_lead_ms=round((time.monotonic() - speculation.started) * 1000, 1),
             )
+        _log_session(
+            "turn",
+            session,
+            text=text,
+            stage=turn.stage_key,
+            branch=turn.branch_key,
+            recovered=turn.recovered,
+            match=turn.match.method if turn.match else None,
+            keyword=turn.match.keyword if turn.match else None,
+            distance=turn.match.distance if turn.match else None,
+            affinity=session.affinity,
+            trust=session.trust,
+            completed=session.completed,
+            final_rank=session.final_rank,
+        )
+
+        if (
+            session.incremental is not None
+            and session.stage_index > stage_index
+            and not session.completed
+        ):
+            session.incremental.stage_completed(turn.stage_key, session.transcript)
+
+        response = {
+            "sarah": turn.sarah,
+            "coach_prompt": turn.coach_prompt,
+            "success_message": turn.success_message,
+            "completed": session.completed,
+            "final_rank": session.final_rank,
+            "score": _calculate_score(session.final_rank),
+            "evaluation": None,
+            "degraded": None,
+            "stage": next_stage_payload(session, scenario),
+            "sarah_audio": _sarah_audio(turn.sarah),
+            "prefetch_audio": _prefetch_audio(session, scenario),
+        }
+        if session.completed:
+            if defer_evaluation:
+                response["evaluation_pending"] = True
+            else:
+                response.update(_evaluation_payload(session, "completed", self._trace))
+        return response, 200
+
+    def _handle_ws(self) -> None:
+        query = parse_qs(urlsplit(self.path).query)
+        session_id = (query.get("session_id") or [""])[0]
+        session = SESSIONS.get(session_id)
+        if session is None:
+            self._json_response({"error": "Invalid session"}, status=400)
+            return
+        client_key = self.headers.get("Sec-WebSocket-Key")
+        if self.headers.get("Upgrade", "").lower() != "websocket" or not client_key:
+            self._json_response({"error": "Expected a WebSocket upgrade"}, status=426)
             return
 
-        if _session_timeout(session):
-            print(f"DEBUG: Session timeout detected")
-            session.completed = True
-            session.final_rank = session.final_rank or "F"
-            
-            # 타임아웃 시에도 평가 실행
-            eval_text = None
-            try:
-                print(f"DEBUG: Running evaluator for timeout case...")
-                eval_text = asyncio.run(_run_evaluator(session.transcript, api_choice=session.api_choice))
-                print(f"DEBUG: Timeout evaluator succeeded. Result length: {len(eval_text) if eval_text else 0}")
-            except Exception as e:
-                print(f"DEBUG: Timeout evaluator failed: {type(e).__name__}: {e}")
-                eval_text = None
-            
-            # 평가 결과에서 점수 추출
-            if eval_text:
-                score_data = _extract_score(eval_text)
-                score_25 = None
-                if score_data:
-                    score_value, score_max = score_data
-                    if score_max == 25:
-                        score_25 = score_value
-                    elif score_max == 5:
-                        score_25 = score_value * 5
-                rank_from_score = (
-                    _score_to_rank(score_25) if score_25 is not None else None
-                )
-                if rank_from_score:
-                    session.final_rank = rank_from_score
-            
-            self._json_response(
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept_key(client_key))
+        self.end_headers()
+        self.close_connection = True
+
+        channel = WebSocketConnection(self.connection)
+        CHANNELS.add(session_id, channel)
+        try:
+            channel.send_json(
                 {
-                    "completed": True,
-                    "sarah": scenario.fail_message,
-                    "system": "Time ran out. Sarah leaves her seat to head to the next meeting.",
-                    "final_rank": session.final_rank,
-                    "score": _calculate_score(session.final_rank),
-                    "evaluation": eval_text,
+                    "type": "ready",
+                    "session_id": session_id,
+                    "remaining_seconds": max(0, int(remaining_seconds(session))),
+                    "stage": next_stage_payload(session, get_scenario()),
                 }
             )
-            return
+            while not channel.closed:
+                if not channel.wait_readable(WS_POLL_SECONDS):
+                    continue
+                opcode, data = channel.receive()
+                if opcode != OP_TEXT:
+                    channel.send_json({"type": "error", "error": "Unsupported frame"})
+                    continue
+                try:
+                    message = json.loads(data.decode("utf-8"))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    channel.send_json({"type": "error", "error": "Invalid JSON"})
+                    continue
+                if message.get("type") == "turn":
+                    self._ws_turn(
+                        channel, session, str(message.get("text", "")).strip(), _turn_seq(message)
+                    )
+                elif message.get("type") == "partial":
+                    self._ws_partial(channel, session, str(message.get("text", "")).strip())
+                elif message.get("type") == "ping":
+                    channel.send_json({"type": "pong"})
+                else:
+                    channel.send_json({"type": "error", "error": "Unknown message type"})
+        except (WebSocketClosed, OSError):
+            pass
+        finally:
+            CHANNELS.remove(session_id, channel)
+            channel.close()
 
-        if not text:
-            self._json_response({"error": "Empty input"}, status=400)
-            return
+    def _ws_exchange(
+        self, route: str, session: SessionState, work: Callable[[], None]
+    ) -> None:
+        self._status = 200
+        self._trace = TRACER.start(route, session_id=session.session_id)
+        started = time.perf_counter()
+        try:
+            work()
+        except Exception as exc:
+            self._trace.record_exception(exc)
+            raise
+        finally:
+            REQUEST_LATENCY.labels(route).observe(time.perf_counter() - started)
+            REQUESTS_TOTAL.labels(route, str(self._status)).inc()
+            self._trace.finish(status=self._status)
+            self._trace = NOOP_TRACE
 
-        session.transcript.append(f"You: {text}")
-        print(f"DEBUG: User message - Stage index: {session.stage_index}, Recovery pending: {session.recovery_pending}")
-
-        sarah_response = None
-        coach_prompt = None
-        success_message = None
-        ended_with_stage4_response = False
-
-        if session.recovery_pending and session.stage_index < len(scenario.stages):
-            stage = scenario.stages[session.stage_index]
-            recovery = stage.recovery.match(text) if stage.recovery else None
-            if recovery:
-                session.affinity += recovery.affinity_delta
-                session.trust += recovery.trust_delta
-                sarah_response = recovery.response
-                session.transcript.append(f"Sarah: {sarah_response}")
-                session.recovery_pending = False
-                session.stage_index += 1
-            else:
-                if session.last_branch and session.last_branch.ends_conversation:
-                    session.completed = True
-                    session.final_rank = "F"
-                    sarah_response = "The conversation has ended."
-                else:
-                    sarah_response = "Understood."
-                    session.recovery_pending = False
-                    session.stage_index += 1
-        else:
-            if session.stage_index >= len(scenario.stages):
-                session.completed = True
-            else:
-                stage = scenario.stages[session.stage_index]
-                branch = stage.match(text)
-                print(f"DEBUG: Matched branch {branch.key} ({branch.intent}) at {stage.key}")
-                session.last_branch = branch
-                session.affinity += branch.affinity_delta
-                session.trust += branch.trust_delta
-                sarah_response = branch.response
-                session.transcript.append(f"Sarah: {sarah_response}")
-
-                if stage.recovery and stage.recovery.should_offer(branch):
-                    session.recovery_pending = True
-                    coach_prompt = "Sarah looks cold. How do you respond?"
-                elif branch.ends_conversation:
-                    print(f"DEBUG: Conversation ended by branch {branch.key}")
-                    session.completed = True
-                    session.final_rank = "F"
-                else:
-                    session.stage_index += 1
-
-                if stage.key == "STAGE_4" and not session.recovery_pending:
-                    session.final_rank = branch.final_rank or "B"
-                    session.completed = True
-                    ended_with_stage4_response = True
-
-        if session.completed and not session.recovery_pending and not ended_with_stage4_response:
-            if scenario.success_message and scenario.success_message != sarah_response:
-                success_message = scenario.success_message
-                # 사라의 대사가 비어있을 경우 성공 메시지로 채움
-                if not sarah_response:
-                    sarah_response = success_message
-                else:
-                    sarah_response = f"{sarah_response}\n\n{success_message}"
-
-        next_stage = None
-        if not session.completed and session.stage_index < len(scenario.stages):
-            next_stage = _build_stage_payload(
-                scenario.stages[session.stage_index],
-                session.stage_index,
-                len(scenario.stages),
-            )
+    def _ws_send(self, channel: WebSocketConnection, payload: dict[str, Any]) -> None:
+        with self._trace.span("response.write", type=payload.get("type")):
+            channel.send_json(payload)
 
-        eval_text = None
-        if session.completed:
-            print(f"DEBUG: Session completed. Running evaluator... (transcript length: {len(session.transcript)})")
+    def _ws_turn(
+        self,
+        channel: WebSocketConnection,
+        session: SessionState,
+        text: str,
+        turn_seq: int | None = None,
+    ) -> None:
+        def work() -> None:
             try:
-                eval_text = asyncio.run(_run_evaluator(session.transcript, api_choice=session.api_choice))
-                print(f"DEBUG: Evaluator succeeded. Result length: {len(eval_text) if eval_text else 0}")
-            except Exception as e:
-                print(f"DEBUG: Evaluator failed with exception: {type(e).__name__}: {e}")
-                import traceback
-                traceback.print_exc()
-                eval_text = None
-            if eval_text:
-                score_data = _extract_score(eval_text)
-                score_25 = None
-                if score_data:
-                    score_value, score_max = score_data
-                    if score_max == 25:
-                        score_25 = score_value
-                    elif score_max == 5:
-                        score_25 = score_value * 5
-                rank_from_score = (
-                    _score_to_rank(score_25) if score_25 is not None else None
+                admitted_at = REQUEST_ADMISSION.acquire()
+            except Overloaded as exc:
+                self._status = 429
+                self._ws_send(
+                    channel,
+                    {
+                        "type": "error",
+                        "error": "The server is busy. Please try again shortly.",
+                        "overloaded": exc.resource,
+                        "retry_after": exc.retry_after,
+                    },
                 )
-                if rank_from_score:
-                    session.final_rank = rank_from_score
-            if session.final_rank is None:
-                session.final_rank = "B"
+                return
+            try:
+                self._finalized_timeout = False
+                response, self._status = self._submit_turn(
+                    session,
+                    turn_seq,
+                    lambda: self._play_turn(
+                        session,
+                        text,
+                        defer_evaluation=True,
+                        on_token=lambda token: channel.send_json({"type": "token", "text": token}),
+                    ),
+                )
+                if self._finalized_timeout and CHANNELS.get(session.session_id) is channel:
+                    # 이 턴이 타임아웃을 마무리하며 결과를 이 채널로 이미 푸시함. 리퍼가 먼저
+                    # 마무리했거나(연결 전일 수 있음) 재전송된 턴이면 저장된 결과를 보냄
+                    return
+                message_type = "timeout" if response.get("timed_out") else "turn"
+                if self._status >= 400:
+                    message_type = "error"
+                self._ws_send(channel, {"type": message_type, **response})
+                # 재전송된 턴이면 평가는 처음 요청에서 이미 시작됨
+                if response.get("evaluation_pending") and not response.get("duplicate"):
+                    reason = "timeout" if response.get("timed_out") else "completed"
+                    evaluation = _evaluation_payload(session, reason, self._trace)
+                    _store_evaluation(session, turn_seq, evaluation)
+                    self._ws_send(channel, {"type": "evaluation", **evaluation})
+                    # 평가 중에 다시 연결해 턴을 재전송했으면 새 채널에도 보냄
+                    if CHANNELS.get(session.session_id) not in (None, channel):
+                        CHANNELS.push(session.session_id, {"type": "evaluation", **evaluation})
+            finally:
+                REQUEST_ADMISSION.release(admitted_at)
 
-        self._json_response(
-            {
-                "sarah": sarah_response,
-                "coach_prompt": coach_prompt,
-                "success_message": success_message,
-                "completed": session.completed,
-                "final_rank": session.final_rank,
-                "score": _calculate_score(session.final_rank),
-                "evaluation": eval_text,
-                "stage": next_stage,
+        self._ws_exchange("ws:turn", session, work)
+
+    def _ws_partial(
+        self, channel: WebSocketConnection, session: SessionState, text: str
+    ) -> None:
+        """
+        말하는 도중의 부분 인식 결과로 분기를 예측해 사라의 대사를 미리 준비하고, 그 분기 뒤에
+        들을 대사 오디오를 prefetch 메시지로 보내 브라우저가 미리 받게 합니다.
+        같은 세션의 턴을 처리하는 중이면 무시합니다.
+        """
+        if not text or not session.lock.acquire(blocking=False):
+            return
+        try:
+            previous = session.speculation
+            scenario = get_scenario()
+            speculation = speculate(
+                session,
+                scenario,
+                text,
+                lambda stage, branch, partial: _prepare_reply(
+                    session, scenario, stage, branch, partial
+                ),
+            )
+        finally:
+            session.lock.release()
+        if previous is not None and session.speculation is not previous:
+            SPECULATIONS.labels("discarded").inc()
+        if speculation is not None:
+            SPECULATIONS.labels("started").inc()
+            audio = _speculative_audio(scenario, speculation.stage_index, speculation.branch)
+            if audio:
+                channel.send_json({"type": "prefetch", "audio": audio})
+
+    def _read_voice_body(self) -> dict[str, Any] | None:
+        """
+        음성 요청 본문을 읽어 audio(bytes), session_id, sample_rate, language_code를 담은
+        dict를 반환합니다. JSON(audio_base64)과 원본 WAV 본문(Content-Type: audio/*,
+        나머지 값은 쿼리 문자열)을 모두 받으며, 잘못된 요청이면 응답을 보내고 None을 반환합니다.
+        """
+        content_type = self.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        if content_type.startswith("audio/") or content_type == "application/octet-stream":
+            with self._trace.span("request.parse") as span:
+                length = int(self.headers.get("Content-Length", "0"))
+                span["bytes"] = length
+                audio_bytes = self.rfile.read(length) if length > 0 else b""
+            payload: dict[str, Any] = {
+                key: values[0] for key, values in parse_qs(urlsplit(self.path).query).items()
             }
+            if isinstance(payload.get("session_id"), str):
+                self._session_id = payload["session_id"]
+        else:
+            payload = self._read_body()
+            audio_b64 = payload.get("audio_base64")
+            if not audio_b64:
+                self._json_response({"error": "Missing audio"}, status=400)
+                return None
+            try:
+                audio_bytes = base64.b64decode(audio_b64)
+            except (ValueError, TypeError):
+                self._json_response({"error": "Invalid audio encoding"}, status=400)
+                return None
+        if not audio_bytes:
+            self._json_response({"error": "Missing audio"}, status=400)
+            return None
+        try:
+            sample_rate = int(payload.get("sample_rate", 16000))
+        except (TypeError, ValueError):
+            self._json_response({"error": "Invalid sample_rate"}, status=400)
+            return None
+        return {
+            "audio": audio_bytes,
+            "session_id": payload.get("session_id") or "",
+            "sample_rate": sample_rate,
+            "language_code": str(payload.get("language_code", "en-US")),
+            "turn_seq": _turn_seq(payload),
+        }
+
+    def _transcribe(
+        self,
+        session: SessionState | None,
+        audio_bytes: bytes,
+        sample_rate: int,
+        language_code: str,
+    ) -> tuple[str, str] | None:
+        """
+        모델 단계를 골라 음성을 인식하고 (인식 결과, 단계)를 반환합니다.
+        STT가 과부하이거나 실패하면 응답을 보내고 None을 반환합니다.
+        """
+        from curator_agent.voice_input import (
+            audio_duration_seconds,
+            load_model,
+            model_loaded,
+            transcribe_audio_bytes,
         )
 
+        clip_seconds = audio_duration_seconds(audio_bytes, sample_rate)
+        _, waiting = STT_ADMISSION.depth()
+        choice = STT_TIERS.choose(
+            clip_seconds,
+            waiting=waiting,
+            limit=STT_ADMISSION.limit,
+            remaining_seconds=remaining_seconds(session) if session is not None else None,
+        )
+        STT_TIER_TOTAL.labels(choice.tier, choice.reason).inc()
+        in_flight = WORK_IN_FLIGHT.labels("stt")
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            with STT_ADMISSION.slot(), self._trace.span(
+                "stt.decode",
+                audio_bytes=len(audio_bytes),
+                tier=choice.tier,
+                tier_reason=choice.reason,
+                estimate_seconds=round(choice.estimate_seconds, 3),
+                budget_seconds=round(choice.budget_seconds, 3),
+            ) as span:
+                if not model_loaded(choice.tier):
+                    # 단계별 첫 요청의 모델 로드 시간이 실시간 배율 추정에 섞이지 않도록 따로 로드
+                    load_started = time.perf_counter()
+                    load_model(choice.tier)
+                    span["model_load_seconds"] = round(time.perf_counter() - load_started, 3)
+                decode_started = time.perf_counter()
+                transcript = transcribe_audio_bytes(
+                    audio_bytes=audio_bytes,
+                    sample_rate=sample_rate,
+                    language_code=language_code,
+                    model_name=choice.tier,
+                )
+                STT_TIERS.observe(choice.tier, clip_seconds, time.perf_counter() - decode_started)
+        except Overloaded as exc:
+            self._overloaded_response(exc, status=503, degraded="chat")
+            return None
+        except Exception as exc:
+            self._trace.record_exception(exc)
+            self._json_response({"error": f"STT failed: {exc}"}, status=500)
+            return None
+        finally:
+            in_flight.dec()
+        decode_seconds = time.perf_counter() - started
+        STT_DECODE_SECONDS.observe(decode_seconds)
+        if clip_seconds > 0:
+            STT_REAL_TIME_FACTOR.observe(decode_seconds / clip_seconds)
+        self._trace.set(clip_seconds=round(clip_seconds, 3))
+        if session is not None:
+            _log_session(
+                "stt",
+                session,
+                clip_seconds=round(clip_seconds, 3),
+                decode_seconds=round(decode_seconds, 3),
+                tier=choice.tier,
+            )
+        return transcript, choice.tier
 
     def _handle_voice(self) -> None:
+        voice = self._read_voice_body()
+        if voice is None:
+            return
+        session = SESSIONS.get(voice["session_id"])
+        result = self._transcribe(
+            session, voice["audio"], voice["sample_rate"], voice["language_code"]
+        )
+        if result is None:
+            return
+        transcript, tier = result
+        self._json_response({"transcript": transcript, "stt_tier": tier})
+
+    def _handle_voice_turn(self) -> None:
+        """
+        음성 인식과 턴 진행을 한 번의 왕복으로 처리합니다. 응답은 /api/message와 같고
+        화면에 보여줄 transcript와 stt_tier가 더해집니다.
+        """
+        voice = self._read_voice_body()
+        if voice is None:
+            return
+        session = SESSIONS.get(voice["session_id"])
+        if session is None:
+            self._json_response({"error": "Invalid session"}, status=400)
+            return
+
+        def run() -> tuple[dict[str, Any], int] | None:
+            result = self._transcribe(
+                session, voice["audio"], voice["sample_rate"], voice["language_code"]
+            )
+            if result is None:
+                return None
+            transcript, tier = result
+            text = transcript.strip()
+            if not text and not session.completed and not session_timed_out(session):
+                # 아무 말도 인식되지 않았으면 턴을 소비하지 않고 다시 녹음하게 함
+                return {"transcript": "", "stt_tier": tier}, 200
+            response, status = self._play_turn(session, text)
+            response["transcript"] = text
+            response["stt_tier"] = tier
+            return response, status
+
+        # 재전송이면 음성 인식도 다시 하지 않음
+        result = self._submit_turn(session, voice["turn_seq"], run)
+        if result is not None:
+            self._json_response(result[0], status=result[1])
+
+    def _handle_admin_profile(self) -> None:
+        """
+        다음 N개 요청을 프로파일합니다. ADMIN_TOKEN이 설정되어 있고 X-Admin-Token 헤더가
+        일치할 때만 동작하며, 설정되지 않았으면 없는 경로처럼 404를 반환합니다.
+        """
+        token = os.getenv("ADMIN_TOKEN", "")
         payload = self._read_body()
-        audio_b64 = payload.get("audio_base64")
-        if not audio_b64:
-            self._json_response({"error": "Missing audio"}, status=400)
+        if not token:
+            self._json_response({"error": "Not found"}, status=404)
             return
-        try:
-            audio_bytes = base64.b64decode(audio_b64)
-        except (ValueError, TypeError):
-            self._json_response({"error": "Invalid audio encoding"}, status=400)
+        if not hmac.compare_digest(self.headers.get("X-Admin-Token", ""), token):
+            self._json_response({"error": "Forbidden"}, status=403)
             return
+        if "requests" in payload:
+            try:
+                requests = int(payload.get("requests") or 0)
+            except (TypeError, ValueError):
+                self._json_response({"error": "Invalid requests"}, status=400)
+                return
+            routes = payload.get("routes")
+            PROFILER.arm(
+                requests, {str(route) for route in routes} if isinstance(routes, list) else None
+            )
+        self._json_response(PROFILER.status())
 
-        sample_rate = payload.get("sample_rate", 16000)
-        language_code = payload.get("language_code", "en-US")
+    def _handle_metrics(self) -> None:
+        data = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
         try:
-            transcript = transcribe_audio_bytes(
-                audio_bytes=audio_bytes,
-                sample_rate=int(sample_rate),
-                language_code=str(language_code),
-            )
-        except Exception as exc:
-            self._json_response({"error": f"STT failed: {exc}"}, status=500)
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
             return
 
-        self._json_response({"transcript": transcript})
+    def _handle_tts(self) -> None:
+        digest = urlsplit(self.path).path.rsplit("/", 1)[-1]
+        audio = VOICE_CACHE.get(digest) if VOICE_CACHE else None
+        if audio is None:
+            self._json_response({"error": "Not found"}, status=404)
+            return
+        not_modified = etag_matches(self.headers.get("If-None-Match"), audio.etag)
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", audio.etag)
+        self.send_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+        if not_modified:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_header("Content-Type", audio.content_type)
+        self.send_header("Content-Length", str(len(audio.body)))
+        self.end_headers()
+        try:
+            self.wfile.write(audio.body)
+        except (BrokenPipeError, ConnectionResetError):
+            return
 
     def _handle_config(self) -> None:
         self._json_response(
             {
                 "record_seconds_default": int(os.getenv("UI_RECORD_SECONDS", "5")),
+                "browser_partials": os.getenv("UI_BROWSER_PARTIALS", "false").strip().lower()
+                in {"1", "true", "yes", "y"},
             }
         )
 
 
+def _finalize_in_background(session: SessionState) -> None:
+    with session.lock:
+        if not _claim_timeout(session):
+            return
+        trace = TRACER.start("reaper:timeout", session_id=session.session_id)
+        try:
+            _finalize_timeout(session, trace)
+        except Exception as exc:
+            trace.record_exception(exc)
+            raise
+        finally:
+            trace.finish()
+
+
+def _reap(session_id: str, action: str) -> None:
+    if action == EVICT:
+        _evict_idle(session_id)
+        return
+    session = SESSIONS.get(session_id)
+    if session is None or session.completed or not session_timed_out(session):
+        return
+    # 진행 중인 턴을 기다리거나 평가가 오래 걸려도 다른 세션의 마감 처리가 밀리지 않도록
+    # 세션마다 별도 스레드에서 실행
+    threading.Thread(
+        target=_finalize_in_background, args=(session,), name="session-timeout", daemon=True
+    ).start()
+
+
+REAPER = DeadlineReaper(_reap)
+
+
+def _prewarm_enabled() -> bool:
+    return os.getenv("UI_PREWARM", "true").strip().lower() in {"1", "true", "yes", "y"}
+
+
+def _prewarm() -> None:
+    """서버가 요청을 받기 시작한 뒤 무거운 SDK(평가, STT)를 백그라운드에서 import합니다."""
+    from curator_agent import voice_input
+    from evaluator_agent import runner
+
+    started = time.perf_counter()
+    runner.prewarm()
+    voice_input.prewarm()
+    print(f"Prewarmed evaluator and STT modules in {time.perf_counter() - started:.2f}s")
+
+
 def main() -> None:
     if not UI_DIR.exists():
         raise SystemExit(f"UI directory not found: {UI_DIR}")
+    global STATIC_ASSETS, VOICE_CACHE
+    STATIC_ASSETS = StaticAssets(UI_DIR)
+    VOICE_CACHE = VoiceCache.load(voice_cache_dir(), get_scenario())
+    if VOICE_CACHE:
+        print(f"Loaded {len(VOICE_CACHE)} cached voice lines")
+    if reload_enabled():
+        STATIC_ASSETS.start_watcher()
     port = int(os.getenv("UI_PORT", "8000"))
     server = ThreadingHTTPServer(("0.0.0.0", port), UIRequestHandler)
     print(f"UI server running at http://localhost:{port}")
+    if _prewarm_enabled():
+        threading.Thread(target=_prewarm, name="prewarm", daemon=True).start()
     server.serve_forever()
 
 